@@ -0,0 +1,109 @@
+"""Bonding-curve math benchmark.
+
+    python -m benchmarks.bench_curve_math [--curves N] [--sizes M] [--checks K]
+
+Measures how far the old float path strays from the exact quotes over
+``--checks`` random trades, then times the float path, the exact scalar
+path and the NumPy batch path pricing a sizes x curves grid. That the
+exact quotes match the program's formula is tested in
+tests/test_curve_math.py.
+"""
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from solana_bots.utils import curve_math
+from solana_bots.utils.constants import (
+    INITIAL_REAL_TOKEN_RESERVES,
+    INITIAL_VIRTUAL_SOL_RESERVES,
+    INITIAL_VIRTUAL_TOKEN_RESERVES,
+)
+
+
+def float_tokens_for_sol(sol_in, virtual_sol, virtual_token):
+    """The former Coin.sol_for_tokens path: SOL and tokens as scaled floats, no fee."""
+    sol, token = virtual_sol / 1e9, virtual_token / 1e6
+    new_sol = sol + sol_in / 1e9
+    return int((token - sol * token / new_sol) * 1e6)
+
+
+def random_curve(rng: random.Random):
+    """Reserves somewhere along the curve's life, from launch to near completion."""
+    bought = rng.randrange(0, INITIAL_REAL_TOKEN_RESERVES - 1_000_000)
+    virtual_sol, virtual_token = curve_math.apply_buy(bought, INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES) \
+        if bought else (INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES)
+    return virtual_sol, virtual_token, INITIAL_REAL_TOKEN_RESERVES - bought
+
+
+def float_error(checks: int, seed: int = 7) -> dict:
+    """How far the old float path strays from the exact quote. Exactness
+    itself is covered by tests/test_curve_math.py."""
+    rng = random.Random(seed)
+    errors = []
+    for _ in range(checks):
+        virtual_sol, virtual_token, _ = random_curve(rng)
+        sol_in = rng.randrange(1, 50 * 10 ** 9)
+        amount = curve_math.tokens_for_sol(sol_in, virtual_sol, virtual_token)
+        if amount > 0:
+            errors.append(abs(float_tokens_for_sol(sol_in, virtual_sol, virtual_token) - amount))
+    return {
+        "checked": len(errors),
+        "float_path_max_error_base_units": max(errors),
+        "float_path_mean_error_base_units": round(sum(errors) / len(errors)),
+        "float_path_mismatches": sum(1 for e in errors if e),
+    }
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def bench(curves: int, sizes: int, seed: int = 11) -> dict:
+    rng = random.Random(seed)
+    reserves = [random_curve(rng) for _ in range(curves)]
+    size_grid = [int(x) for x in np.geomspace(10 ** 6, 10 ** 11, sizes)]
+    virtual_sol, virtual_token, real_token = (np.array(c) for c in zip(*reserves))
+
+    def scalar_float():
+        for vs, vt, _ in reserves:
+            for size in size_grid:
+                float_tokens_for_sol(size, vs, vt)
+
+    def scalar_exact():
+        for vs, vt, rt in reserves:
+            for size in size_grid:
+                amount = curve_math.tokens_for_sol(size, vs, vt, rt)
+                curve_math.buy_cost(amount, vs, vt)
+
+    def batch():
+        curve_math.quote_grid(size_grid, virtual_sol, virtual_token, real_token)
+
+    tokens, _ = curve_math.quote_grid(size_grid, virtual_sol, virtual_token, real_token)
+    for i in range(0, curves, max(1, curves // 16)):
+        vs, vt, rt = reserves[i]
+        assert [curve_math.tokens_for_sol(size, vs, vt, rt) for size in size_grid] == tokens[i].tolist()
+
+    quotes = curves * sizes
+    results = {"quotes": quotes}
+    for name, fn in (("scalar_float", scalar_float), ("scalar_exact", scalar_exact), ("numpy_batch", batch)):
+        seconds = min(_timed(fn) for _ in range(3))
+        results[name] = {"seconds": round(seconds, 5), "quotes_per_sec": round(quotes / seconds)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--curves", type=int, default=1_000)
+    parser.add_argument("--sizes", type=int, default=64)
+    parser.add_argument("--checks", type=int, default=20_000)
+    args = parser.parse_args()
+    print(json.dumps({"float_error": float_error(args.checks), "grid": bench(args.curves, args.sizes)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""End-to-end benchmark: the real Streamer -> Coin -> TokenTrader path
+against local RPC and websocket stand-ins, under several network profiles.
+
+    python -m benchmarks.bench_e2e [--frames N] [--rate R] [--create-ratio F]
+                                   [--scenarios a,b] [--output FILE] [--baseline FILE]
+
+A ``WebsocketStandIn`` streams ``--frames`` synthetic logsSubscribe frames
+(``--create-ratio`` of them launches, the rest trades on other mints) at
+``--rate`` per second, as fast as possible by default. A ``DryRunRpc``
+accepts every transaction and serves funded wallets and fresh bonding
+curves, so every launch is bought and, after ``--hold`` seconds, sold.
+
+Each scenario runs in a fresh interpreter, so metrics and peak memory are
+its own:
+
+- ``local``: no RPC latency and no failures;
+- ``wan``: lognormal RPC latency (25 ms median) and websocket jitter;
+- ``faults``: 10 ms RPC latency, 5% JSON-RPC errors, 2% HTTP 503s and a
+  websocket that drops the connection every third of the stream.
+
+Reports the frames per second sustained through decode and dispatch,
+detection-to-send latency percentiles, RPC calls per position and peak
+RSS. Unthrottled, the stream saturates the process and latency includes
+queueing behind decode; ``--rate`` measures it at a given load. Results
+are written to ``--output`` (default
+``benchmarks/results/e2e-<commit>.json``). ``--baseline`` compares against
+an earlier results file.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+from solders.keypair import Keypair  # type: ignore
+
+from solana_bots.utils.standins import WebsocketStandIn, lognormal
+
+from .corpus import build_frames
+
+SCENARIOS = {
+    "local": dict(rpc=dict(), websocket=dict()),
+    "wan": dict(rpc=dict(latency=lognormal(0.025, 0.5)), websocket=dict(delay=0.002, jitter=0.004)),
+    "faults": dict(
+        rpc=dict(latency=0.010, error_rate=0.05, http_error_rate=0.02),
+        websocket=dict(disconnect_after=3),
+    ),
+}
+
+# Metrics compared by --baseline, and whether higher is better
+TRACKED = {
+    "frames_per_sec": True,
+    "detection_to_send_ms.p50": False,
+    "detection_to_send_ms.p99": False,
+    "rpc_calls_per_position": False,
+    "peak_rss_mb": False,
+}
+
+
+async def _until(predicate, timeout: float, interval: float = 0.01) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(interval)
+    return True
+
+
+async def run_scenario(name: str, args) -> dict:
+    from solana_bots.utils.dryrun import DryRunRpc
+    from solana_bots.utils.metrics import STAGES, registry
+    from solana_bots.utils.rpc import close_transports
+    from solana_bots.utils.settings import Settings, configure
+    from solana_bots.utils.streamer import Streamer
+
+    profile = SCENARIOS[name]
+    frames = build_frames(args.frames, create_ratio=args.create_ratio)
+    websocket_options = dict(profile["websocket"])
+    if "disconnect_after" in websocket_options:
+        websocket_options["disconnect_after"] = max(1, len(frames) // websocket_options["disconnect_after"])
+
+    wallets = [Keypair() for _ in range(args.wallets)]
+    rpc = await DryRunRpc(wallets, **profile["rpc"]).start()
+    websocket = await WebsocketStandIn(frames, rate=args.rate, **websocket_options).start()
+    configure(Settings(
+        rpc_url=rpc.url,
+        wss_urls=[websocket.url],
+        key_pair=str(wallets[0]),
+        extra_key_pairs=[str(keypair) for keypair in wallets[1:]],
+        log_level="error",
+        max_hold=args.hold,
+    ))
+    streamer = Streamer(rpc.url)
+    scheduler = streamer.scheduler
+
+    started = time.monotonic()
+    task = asyncio.create_task(streamer.stream_transactions())
+    try:
+        streamed = await _until(websocket.finished.is_set, args.timeout)
+        # Frames still queued are decoded by the workers; wait for them to drain
+        await _until(lambda: streamer.prefilter.seen >= websocket.cursor, args.timeout)
+        ingest_seconds = time.monotonic() - started
+        # Let every position go through its hold and sell
+        await _until(lambda: not scheduler.positions, args.hold + args.timeout)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await websocket.close()
+        await rpc.close()
+        await close_transports()
+
+    sent = registry.histogram("trace.sent")
+    positions = scheduler.opened.value + scheduler.failed_buys.value + scheduler.stale.value
+    calls = sum(rpc.requests.values())
+    return {
+        "scenario": name,
+        "streamed": streamed,
+        "frames": streamer.prefilter.seen,
+        "frames_per_sec": streamer.prefilter.seen / ingest_seconds if ingest_seconds else 0.0,
+        "ingest": {k: v for k, v in streamer.ingest_stats().items() if k not in ("lag", "endpoints")},
+        "connections": websocket.connections,
+        "detection_to_send_ms": {k: (v * 1e3 if k != "count" else v) for k, v in sent.summary().items()},
+        # Median time from the launch frame to each stage, to see where the latency goes
+        "stage_p50_ms": {
+            stage: registry.metrics[f"trace.{stage}"].percentile(50) * 1e3
+            for stage in STAGES if f"trace.{stage}" in registry.metrics
+        },
+        "positions": scheduler.stats(),
+        "rpc_calls": calls,
+        "rpc_posts": rpc.posts,
+        "rpc_calls_per_position": calls / positions if positions else None,
+        "rpc_requests": dict(sorted(rpc.requests.items())),
+        "transactions": rpc.sends,
+        "injected_failures": rpc.injected,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def _commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _lookup(result: dict, path: str):
+    for key in path.split("."):
+        result = result.get(key) if isinstance(result, dict) else None
+    return result
+
+
+def compare(results: dict, baseline: dict) -> list:
+    rows = []
+    old = {r["scenario"]: r for r in baseline.get("scenarios", [])}
+    for result in results["scenarios"]:
+        before = old.get(result["scenario"])
+        if before is None:
+            continue
+        for metric, higher_is_better in TRACKED.items():
+            new_value, old_value = _lookup(result, metric), _lookup(before, metric)
+            if not new_value or not old_value:
+                continue
+            change = new_value / old_value - 1
+            regressed = change < -0.1 if higher_is_better else change > 0.1
+            rows.append({
+                "scenario": result["scenario"], "metric": metric, "baseline": old_value, "current": new_value,
+                "change": round(change, 3), "regressed": regressed,
+            })
+    return rows
+
+
+def run_child(name: str, args) -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    command = [
+        sys.executable, "-m", "benchmarks.bench_e2e", "--child", name,
+        "--frames", str(args.frames), "--create-ratio", str(args.create_ratio), "--wallets", str(args.wallets),
+        "--hold", str(args.hold), "--timeout", str(args.timeout),
+    ]
+    if args.rate:
+        command += ["--rate", str(args.rate)]
+    out = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=20_000)
+    parser.add_argument("--rate", type=float, default=None, help="frames per second; as fast as possible when unset")
+    parser.add_argument("--create-ratio", type=float, default=0.005)
+    parser.add_argument("--wallets", type=int, default=4)
+    parser.add_argument("--hold", type=int, default=1, help="seconds each position is held before selling")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(run_scenario(args.child, args))))
+        return
+
+    commit = _commit()
+    results = {
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {k: getattr(args, k) for k in ("frames", "rate", "create_ratio", "wallets", "hold")},
+        "scenarios": [run_child(name, args) for name in args.scenarios.split(",")],
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            results["comparison"] = compare(results, json.load(f))
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", f"e2e-{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    for result in results["scenarios"]:
+        latency = result["detection_to_send_ms"]
+        print(
+            f"{result['scenario']:>8}  {result['frames_per_sec']:9.0f} frames/s  "
+            f"detect->send p50 {latency['p50']:6.2f} ms  p99 {latency['p99']:6.2f} ms  "
+            f"rpc/position {result['rpc_calls_per_position'] or 0:5.1f}  peak {result['peak_rss_mb']:6.1f} MB"
+        )
+    for row in results.get("comparison", []):
+        flag = "REGRESSED" if row["regressed"] else ""
+        print(f"{row['scenario']:>8}  {row['metric']:<26} {row['baseline']:>12.3f} -> {row['current']:>12.3f}  "
+              f"{row['change']:+.1%} {flag}")
+    print(f"wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Event store benchmark: append cost on the event loop, background write
+throughput, and index query latency.
+
+    python -m benchmarks.bench_event_store [--launches N] [--trades M] [--capacity C]
+
+Appends synthetic launches from a pool of creators and trades on their
+curves, waits for the writer thread to drain, checks the segments against
+what was appended, then times the dispatch-time queries and a reload.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+from solders.pubkey import Pubkey  # type: ignore
+
+from solana_bots.utils.event_store import LAUNCHES, TRADES, EventStore, load_segments, segment_paths
+from solana_bots.utils.events import CreateEvent, TradeEvent
+from solana_bots.utils.metrics import Histogram
+
+
+def _pubkey() -> Pubkey:
+    return Pubkey(os.urandom(32))
+
+
+def _timed_queries(store, fn, keys, name) -> dict:
+    histogram = Histogram(name)
+    for key in keys:
+        started = time.perf_counter()
+        fn(key)
+        histogram.record(time.perf_counter() - started)
+    return {k: v * 1e6 if isinstance(v, float) else v for k, v in histogram.summary().items()}
+
+
+def run(args) -> dict:
+    rng = random.Random(3)
+    creators = [_pubkey() for _ in range(max(1, args.launches // 5))]
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EventStore(tmp, capacity=args.capacity)
+        launches = [
+            (CreateEvent(f"T{i}", "T", "", _pubkey(), _pubkey(), rng.choice(creators)), now - rng.uniform(0, 7200))
+            for i in range(args.launches)
+        ]
+        trades = []
+        slot = 300_000_000
+        for i in range(args.trades):
+            slot += rng.random() < 0.05
+            trades.append((slot, TradeEvent(
+                rng.choice(launches)[0].mint, rng.randrange(10**9), rng.randrange(10**12), rng.random() < 0.6,
+                _pubkey(), int(now), 30 * 10**9, 1_073 * 10**12,
+            )))
+
+        started = time.perf_counter()
+        for i, (event, timestamp) in enumerate(launches):
+            store.append_launch(event, slot=300_000_000 + i, timestamp=timestamp)
+        for slot, trade in trades:
+            store.append_trade(trade, slot=slot, timestamp=now)
+        appended = time.perf_counter() - started
+
+        started = time.perf_counter()
+        store.close()
+        drained = time.perf_counter() - started
+        total = args.launches + args.trades
+        assert store.written.value == total, store.stats()
+        assert len(load_segments(tmp, LAUNCHES)) == args.launches
+        assert len(load_segments(tmp, TRADES)) == args.trades
+
+        sample = [rng.choice(creators) for _ in range(10_000)]
+        creator_query = _timed_queries(store, lambda c: store.creator_launches(c, 3600.0, now), sample, "creator")
+        mints = [rng.choice(launches)[0].mint for _ in range(10_000)]
+        volume_query = _timed_queries(store, lambda m: store.curve_volume(m, 150), mints, "volume")
+        rows = load_segments(tmp, TRADES)
+        for mint in mints[:20]:
+            mine = rows[rows["mint"] == np.void(bytes(mint))]
+            if len(mine):
+                window = mine[mine["slot"] > int(mine["slot"].max()) - 150]
+                assert store.curve_volume(mint, 150) == int(window["sol_amount"].sum())
+
+        started = time.perf_counter()
+        reloaded = EventStore(tmp, capacity=args.capacity)
+        reload_seconds = time.perf_counter() - started
+        probe = sample[0]
+        assert reloaded.creator_launches(probe, 3600.0, now) == store.creator_launches(probe, 3600.0, now)
+        reloaded.close()
+
+        return {
+            "events": total,
+            "append_us_per_event": appended / total * 1e6,
+            "drain_after_append_seconds": drained,
+            "segments": {kind: len(segment_paths(tmp, kind)) for kind in (LAUNCHES, TRADES)},
+            "creator_launches_last_hour_us": creator_query,
+            "curve_volume_last_150_slots_us": volume_query,
+            "reload_seconds": reload_seconds,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, default=20_000)
+    parser.add_argument("--trades", type=int, default=500_000)
+    parser.add_argument("--capacity", type=int, default=1 << 16)
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Exit engine benchmark: one vectorized pass over every open position vs.
+evaluating each position on its own.
+
+    python -m benchmarks.bench_exits [--positions 10,100,1000,10000] [--updates N]
+
+Opens ``--positions`` synthetic positions on their own curves, then applies
+``--updates`` rounds of random curve moves. Each round is timed as one
+``ExitEngine.step`` pass and as a per-position scalar loop doing the
+same take-profit/stop/trailing checks with ``curve_math.sell_proceeds``,
+which is the work one polling coroutine per mint would do on each update
+(before any RPC). The two must agree on every exit.
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+from solders.pubkey import Pubkey  # type: ignore
+
+from solana_bots.utils import curve_math
+from solana_bots.utils.constants import INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES
+from solana_bots.utils.curve_cache import launch_state
+from solana_bots.utils.exits import STOP_LOSS, TAKE_PROFIT, TRAILING_STOP, ExitEngine, ExitPolicy
+from solana_bots.utils.metrics import Histogram
+
+POLICY = ExitPolicy(take_profit=((50, 50), (150, 100)), stop_loss=30, trailing_stop=25, trailing_activation=20)
+
+
+class ScalarExits:
+    """The same checks, one position at a time."""
+
+    def __init__(self, policy: ExitPolicy):
+        self.policy = policy
+        self.positions = {}
+
+    def open(self, mint, tokens, cost):
+        self.positions[mint] = [tokens, cost, 0, 0]
+
+    def evaluate(self, reserves):
+        policy = self.policy
+        exits = []
+        for mint, position in self.positions.items():
+            tokens, cost, peak, tier = position
+            virtual_sol, virtual_token = reserves[mint]
+            value = curve_math.sell_proceeds(tokens, virtual_sol, virtual_token)
+            peak = position[2] = max(peak, value)
+            if policy.stop_loss is not None and value * 100 <= cost * (100 - policy.stop_loss):
+                exits.append((mint, 100, STOP_LOSS))
+            elif (policy.trailing_stop is not None and peak * 100 >= cost * (100 + policy.trailing_activation)
+                  and value * 100 <= peak * (100 - policy.trailing_stop)):
+                exits.append((mint, 100, TRAILING_STOP))
+            elif tier < len(policy.take_profit) and value * 100 >= cost * (100 + policy.take_profit[tier][0]):
+                exits.append((mint, policy.take_profit[tier][1], TAKE_PROFIT))
+        return exits
+
+
+def run_size(count: int, updates: int, rng: random.Random) -> dict:
+    # Every exit is accepted, as if each sell confirmed at once
+    engine = ExitEngine(POLICY, on_exit=lambda mint, percentage: True)
+    scalar = ScalarExits(POLICY)
+    curves = {}
+    for i in range(count):
+        mint, bonding_curve = f"mint{i}", Pubkey(os.urandom(32))
+        sol_in = rng.randrange(10**7, 10**9)
+        state = launch_state()
+        tokens = curve_math.tokens_for_sol(sol_in, state.virtual_sol_reserves, state.virtual_token_reserves)
+        cost = curve_math.buy_cost(tokens, state.virtual_sol_reserves, state.virtual_token_reserves)
+        state.virtual_sol_reserves, state.virtual_token_reserves = curve_math.apply_buy(
+            tokens, state.virtual_sol_reserves, state.virtual_token_reserves
+        )
+        engine.open(mint, bonding_curve, tokens, cost, state)
+        scalar.open(mint, tokens, cost)
+        curves[mint] = (bonding_curve, state)
+
+    vector_pass, scalar_pass = Histogram("vector"), Histogram("scalar")
+    fired = 0
+    for _ in range(updates):
+        reserves = {}
+        for mint, (bonding_curve, state) in curves.items():
+            # Random walk in price via SOL flowing in or out of the curve
+            flow = int(state.virtual_sol_reserves * rng.uniform(-0.02, 0.022))
+            virtual_sol = max(INITIAL_VIRTUAL_SOL_RESERVES // 2, state.virtual_sol_reserves + flow)
+            k = INITIAL_VIRTUAL_SOL_RESERVES * INITIAL_VIRTUAL_TOKEN_RESERVES
+            state.virtual_sol_reserves, state.virtual_token_reserves = virtual_sol, k // virtual_sol
+            engine.update(bonding_curve, state)
+            reserves[mint] = (state.virtual_sol_reserves, state.virtual_token_reserves)
+
+        started = time.perf_counter()
+        vector = engine.step()
+        vector_pass.record(time.perf_counter() - started)
+        started = time.perf_counter()
+        reference = scalar.evaluate(reserves)
+        scalar_pass.record(time.perf_counter() - started)
+        assert sorted(vector) == sorted(reference), (sorted(vector)[:3], sorted(reference)[:3])
+
+        # step already closed full exits and advanced take-profit tiers
+        for mint, percentage, reason in vector:
+            fired += 1
+            if percentage >= 100:
+                del scalar.positions[mint]
+                del curves[mint]
+            else:
+                position = scalar.positions[mint]
+                sold = position[0] * percentage // 100
+                position[1] -= position[1] * sold // position[0]
+                position[2] = position[2] * (position[0] - sold) // position[0]
+                position[0] -= sold
+                position[3] += 1
+                engine.sold(mint, position[0], position[1])
+
+    def micros(histogram):
+        summary = histogram.summary()
+        return {k: round(v * 1e6, 1) for k, v in summary.items() if k != "count"}
+
+    return {
+        "positions": count,
+        "exits": fired,
+        "open_at_end": len(engine),
+        "vector_pass_us": micros(vector_pass),
+        "scalar_pass_us": micros(scalar_pass),
+        "speedup_p50": round(scalar_pass.percentile(50) / max(vector_pass.percentile(50), 1e-6), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--positions", default="10,100,1000,10000")
+    parser.add_argument("--updates", type=int, default=50)
+    args = parser.parse_args()
+    rng = random.Random(11)
+    results = [run_size(int(count), args.updates, rng) for count in args.positions.split(",")]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Fan-in benchmark: the same frame stream from several local websocket
+stand-ins with injected delays, jitter and disconnects.
+
+    python -m benchmarks.bench_fanin [--frames N] [--rate R]
+
+Reports which endpoint won each transaction and how far behind the others were.
+"""
+import argparse
+import asyncio
+import json
+import os
+
+from solders.keypair import Keypair  # type: ignore
+
+from solana_bots.utils.standins import WebsocketStandIn
+
+from .corpus import build_frames
+
+os.environ.setdefault("KEY_PAIR", str(Keypair()))
+
+
+async def run(args):
+    from solana_bots.utils.streamer import Streamer
+
+    frames = build_frames(args.frames, create_ratio=0.02)
+    profiles = [
+        dict(delay=0.004, jitter=0.004),
+        dict(delay=0.0, jitter=0.010),
+        dict(delay=0.020, jitter=0.002),
+        dict(delay=0.001, jitter=0.002, disconnect_after=args.frames // 4),
+    ]
+    standins = [await WebsocketStandIn(frames, rate=args.rate, **p).start() for p in profiles]
+
+    streamer = Streamer("http://127.0.0.1:1")
+    dispatched = []
+
+    def open_position(mint):
+        dispatched.append(mint)
+        return True
+
+    streamer.scheduler.open = open_position
+    task = asyncio.create_task(streamer.stream_transactions([s.url for s in standins]))
+    try:
+        await asyncio.wait_for(asyncio.gather(*(s.finished.wait() for s in standins)), args.timeout)
+    except asyncio.TimeoutError:
+        print("timed out waiting for stand-ins to finish")
+    await asyncio.sleep(0.2)
+    task.cancel()
+    for standin in standins:
+        await standin.close()
+
+    stats = streamer.ingest_stats()
+    endpoints = stats.pop("endpoints")
+    print(json.dumps({"frames": len(frames), "enqueued": stats["enqueued"], "dispatched": len(dispatched)}))
+    for label, summary in sorted(endpoints.items(), key=lambda kv: -kv[1]["wins"]):
+        behind = summary["behind_winner"]
+        print(
+            f"{label:>22}  wins {summary['wins']:6d} ({summary['win_rate']:6.1%})  "
+            f"dups {summary['duplicates']:6d}  behind p50 {behind['p50'] * 1e3:6.2f} ms  "
+            f"p99 {behind['p99'] * 1e3:6.2f} ms  reconnects {summary['reconnects']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=2_000)
+    parser.add_argument("--rate", type=float, default=500.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
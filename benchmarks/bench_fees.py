@@ -0,0 +1,117 @@
+"""Fee oracle benchmark: static compute-budget pricing vs. the oracle's
+urgency tiers over a quiet -> congested -> quiet fee regime.
+
+    python -m benchmarks.bench_fees [--slots N] [--orders-per-slot K]
+
+A JSON-RPC stand-in serves ``getRecentPrioritizationFees`` from a
+synthetic per-slot fee series and ``getTransaction`` meta with simulated
+compute usage. An order "lands" in a slot if its price reaches that slot's
+fee. Reports landing rate and mean priority fee paid per order for
+the static UNIT_BUDGET/UNIT_PRICE pair and for each tier, plus the compute
+limits the oracle learned.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+
+from solders.keypair import Keypair  # type: ignore
+from solders.signature import Signature  # type: ignore
+
+from solana_bots.utils.standins import JsonRpcStandIn
+
+os.environ.setdefault("KEY_PAIR", str(Keypair()))
+
+# Typical compute usage of each order kind, with some spread
+USAGE = {"buy": (62_000, 4_000), "sell": (48_000, 3_000), "sell_and_close": (53_000, 3_000)}
+
+
+def fee_series(slots: int, rng: random.Random):
+    """Lognormal per-slot fees whose median rises 40x through the middle (congested) third."""
+    fees = []
+    for slot in range(slots):
+        congested = slots // 3 <= slot < 2 * slots // 3
+        median = 400_000 if congested else 10_000
+        fees.append(0 if rng.random() < 0.2 else int(median * rng.lognormvariate(0, 0.8)))
+    return fees
+
+
+async def run(args) -> dict:
+    from solana_bots.utils.config import MAX_UNIT_PRICE, MIN_UNIT_PRICE, UNIT_BUDGET, UNIT_PRICE
+    from solana_bots.utils.fees import TIER_PERCENTILES, FeeOracle
+    from solana_bots.utils.rpc import close_transports, get_transport
+
+    rng = random.Random(9)
+    fees = fee_series(args.slots, rng)
+    clock = {"slot": 0}
+    usage = {}
+
+    def recent(params):
+        # Like the real RPC: the last 150 slots up to the current one
+        end = clock["slot"] + 1
+        return [{"slot": slot, "prioritizationFee": fees[slot]} for slot in range(max(0, end - 150), end)]
+
+    def transaction(params):
+        kind = usage.get(params[0])
+        if kind is None:
+            return None
+        mean, spread = USAGE[kind]
+        return {"slot": clock["slot"], "meta": {"err": None, "computeUnitsConsumed": int(rng.gauss(mean, spread))}}
+
+    standin = await JsonRpcStandIn({"getRecentPrioritizationFees": recent, "getTransaction": transaction}).start()
+    oracle = FeeOracle(get_transport(standin.url), UNIT_BUDGET, UNIT_PRICE, MIN_UNIT_PRICE, MAX_UNIT_PRICE)
+    strategies = ["static"] + list(TIER_PERCENTILES)
+    phases = ("quiet", "congested")
+    landed = {(phase, name): 0 for phase in phases for name in strategies}
+    paid = {(phase, name): 0 for phase in phases for name in strategies}
+    orders = {phase: 0 for phase in phases}
+    try:
+        for slot in range(args.slots):
+            clock["slot"] = slot
+            if slot % args.sample_every == 0:
+                await oracle.sample()
+            phase = "congested" if args.slots // 3 <= slot < 2 * args.slots // 3 else "quiet"
+            for _ in range(args.orders_per_slot):
+                orders[phase] += 1
+                kind = rng.choice(list(USAGE))
+                for name in strategies:
+                    limit, price = (UNIT_BUDGET, UNIT_PRICE) if name == "static" else oracle.quote(kind, name)
+                    # Priority fee in lamports: price is micro-lamports per requested CU
+                    paid[phase, name] += limit * price // 1_000_000
+                    landed[phase, name] += price >= fees[slot]
+                signature = Signature.new_unique()
+                usage[str(signature)] = kind
+                oracle.learn(kind, signature)
+            await asyncio.sleep(0)
+        await asyncio.gather(*oracle._learning)
+    finally:
+        await close_transports()
+        await standin.close()
+
+    return {
+        "orders": orders,
+        **{
+            phase: {
+                name: {
+                    "landing_rate": landed[phase, name] / orders[phase],
+                    "mean_priority_fee_lamports": paid[phase, name] / orders[phase],
+                }
+                for name in strategies
+            }
+            for phase in phases
+        },
+        "oracle": oracle.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slots", type=int, default=3_000)
+    parser.add_argument("--orders-per-slot", type=int, default=2)
+    parser.add_argument("--sample-every", type=int, default=5, help="slots between fee samples (~2 s)")
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
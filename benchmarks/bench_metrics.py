@@ -0,0 +1,117 @@
+"""Instrumentation overhead: log sink vs inline cprint, tracer marks, and a
+/metrics scrape.
+
+    python -m benchmarks.bench_metrics [--lines N] [--trades M]
+
+Logging is timed against /dev/null, which flatters cprint: on a real
+terminal its blocking write lands on the event loop, while the sink's
+batched write happens in a worker thread.
+The scrape is checked to parse as the Prometheus text format.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import re
+import time
+
+from termcolor import cprint
+
+from solana_bots.utils.logsink import DEBUG, INFO, LogSink
+from solana_bots.utils.metrics import STAGES, MetricsServer, Registry, Tracer, render_prometheus
+
+_SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{quantile="[0-9.]+"\})? -?[0-9.e+-]+$')
+
+
+def check_exposition(text: str) -> int:
+    samples = 0
+    for line in text.splitlines():
+        if not line or line.startswith("# TYPE "):
+            continue
+        assert _SAMPLE.match(line), line
+        samples += 1
+    return samples
+
+
+async def time_logging(lines: int) -> dict:
+    with open(os.devnull, "w") as devnull:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(devnull):
+            for i in range(lines):
+                cprint(f"Amount: {i}, Max Sol Cost: {i * 2}", "green")
+        inline = time.perf_counter() - started
+
+        sink = LogSink(stream=devnull)
+        writer = asyncio.create_task(sink.run())
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        for i in range(lines):
+            sink.info(f"Amount: {i}, Max Sol Cost: {i * 2}", "green")
+        queued = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for i in range(lines):
+            sink.log(DEBUG, "Calculating transaction amounts...", "green")
+        filtered = time.perf_counter() - started
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+        assert not sink.buffer and sink.level == INFO
+    return {
+        "cprint_us_per_line": inline / lines * 1e6,
+        "sink_us_per_line": queued / lines * 1e6,
+        "sink_filtered_us_per_line": filtered / lines * 1e6,
+        "dropped": sink.dropped,
+    }
+
+
+def time_tracing(trades: int, registry: Registry) -> dict:
+    tracer = Tracer(registry)
+    started = time.perf_counter()
+    for i in range(trades):
+        key = f"mint{i}"
+        at = time.monotonic()
+        tracer.begin(key, at)
+        for step, stage in enumerate(STAGES[1:], 1):
+            tracer.mark(key, stage, at + step * 1e-3)
+        tracer.end(key)
+    elapsed = time.perf_counter() - started
+    assert not tracer.traces
+    return {
+        "mark_us": elapsed / (trades * (len(STAGES) - 1)) * 1e6,
+        "sold_p50_ms": registry.histogram("trace.sold").percentile(50) * 1e3,
+    }
+
+
+async def run(args) -> dict:
+    from aiohttp import ClientSession
+
+    registry = Registry()
+    results = {"logging": await time_logging(args.lines), "tracing": time_tracing(args.trades, registry)}
+    registry.counter("rpc.local.calls").inc(3)
+    registry.gauge("ingest.queue-depth").set(7)
+
+    server = await MetricsServer(registry, port=0).start()
+    try:
+        async with ClientSession() as session:
+            started = time.perf_counter()
+            async with session.get(f"http://127.0.0.1:{server.port}/metrics") as response:
+                text = await response.text()
+            scrape = time.perf_counter() - started
+    finally:
+        await server.close()
+    assert text == render_prometheus(registry)
+    assert "solana_bots_rpc_local_calls_total 3" in text
+    results["scrape"] = {"seconds": scrape, "bytes": len(text), "samples": check_exposition(text)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=50_000)
+    parser.add_argument("--trades", type=int, default=20_000)
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
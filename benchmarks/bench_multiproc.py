@@ -0,0 +1,215 @@
+"""Sharded pipeline benchmark: trading work inline on the ingestion loop vs.
+handed to K processes over binary launch records.
+
+    python -m benchmarks.bench_multiproc [--frames N] [--processes 1,2,4] [--polls P]
+
+A burst of corpus frames goes through ``FrameIngest.process_frame``. For
+every launch the trading side does the CPU part of a trade: it registers
+the mint's accounts, compiles and signs a buy, base64-encodes it as for
+``sendTransaction``, precompiles the sells and parses ``--polls``
+``getSignatureStatuses`` replies. Inline mode does that on the ingestion
+loop. Sharded mode sends ``encode_launch`` records over the
+``HashRing``/pipe path of utils/multiproc.py to spawned processes.
+
+Reports the burst's wall time, the ingestion loop's scheduling lag (how
+late a 1 ms ticker wakes) and detection-to-signed latency per launch.
+Also reports record size and codec cost against pickle, and how evenly
+the ring spreads mints.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import pickle
+import time
+import timeit
+
+from solders.hash import Hash  # type: ignore
+from solders.keypair import Keypair  # type: ignore
+
+os.environ.setdefault("KEY_PAIR", str(Keypair()))
+
+from solana_bots.utils.metrics import Histogram  # noqa: E402
+
+from .corpus import build_frames  # noqa: E402
+
+STATUS_REPLY = json.dumps({
+    "jsonrpc": "2.0", "id": 1,
+    "result": {"context": {"slot": 300000000}, "value": [
+        {"slot": 300000000, "confirmations": None, "err": None, "status": {"Ok": None}, "confirmationStatus": "processed"}
+    ]},
+})
+
+
+class Trading:
+    """The CPU side of trading one launch."""
+
+    def __init__(self, polls: int):
+        from solana_bots.utils.accounts import AccountRegistry
+        from solana_bots.utils.instructions import InstructionFactory
+
+        self.polls = polls
+        self.payer = Keypair()
+        self.accounts = AccountRegistry()
+        self.instructions = InstructionFactory()
+        self.blockhash = Hash.default()
+
+    def trade(self, event) -> bytes:
+        accounts = self.accounts.register(event.mint, event.bonding_curve)
+        user = self.payer.pubkey()
+        txn = self.instructions.buy_template(accounts, user).transaction(10**9, 10**6, self.blockhash, self.payer)
+        wire = base64.b64encode(bytes(txn))
+        self.instructions.prepare(accounts, user)
+        for _ in range(self.polls):
+            json.loads(STATUS_REPLY)
+        return wire
+
+
+def _trader(receiver, results, polls: int):
+    from solana_bots.utils.multiproc import decode_launch, read_records
+
+    async def run():
+        trading = Trading(polls)
+        latencies = []
+        results.send("ready")
+        async for record in read_records(receiver):
+            event, received_at, _, _ = decode_launch(record)
+            trading.trade(event)
+            latencies.append(time.monotonic() - received_at)
+        results.send(latencies)
+
+    asyncio.run(run())
+
+
+async def ticker(lag: Histogram, interval: float = 0.001):
+    while True:
+        due = time.monotonic() + interval
+        await asyncio.sleep(interval)
+        lag.record(max(0.0, time.monotonic() - due))
+
+
+async def burst(ingest, frames) -> float:
+    started = time.perf_counter()
+    for frame in frames:
+        ingest.process_frame(frame, time.monotonic())
+        await asyncio.sleep(0)
+    return time.perf_counter() - started
+
+
+async def measure(processes: int, frames, polls: int) -> dict:
+    from solana_bots.utils.multiproc import HashRing, encode_launch, open_writer, write_record
+    from solana_bots.utils.streamer import FrameIngest
+
+    latency = Histogram("detect_to_signed")
+    lag = Histogram("loop_lag")
+
+    if processes == 0:
+        trading = Trading(polls)
+
+        class Ingest(FrameIngest):
+            def dispatch(self, event, received_at, slot=0, dev_trade=None):
+                trading.trade(event)
+                latency.record(time.monotonic() - received_at)
+    else:
+        context = multiprocessing.get_context("spawn")
+        ring = HashRing(range(processes))
+        writers, workers = [], []
+        for _ in range(processes):
+            receiver, sender = context.Pipe(duplex=False)
+            results, reply = context.Pipe(duplex=False)
+            process = context.Process(target=_trader, args=(receiver, reply, polls), daemon=True)
+            process.start()
+            receiver.close()
+            writers.append(await open_writer(sender))
+            workers.append((process, results))
+        for _, results in workers:
+            await asyncio.get_running_loop().run_in_executor(None, results.recv)
+
+        class Ingest(FrameIngest):
+            def dispatch(self, event, received_at, slot=0, dev_trade=None):
+                write_record(writers[ring.node_for(bytes(event.mint))], encode_launch(event, received_at, slot, dev_trade))
+
+    ingest = Ingest()
+    tick = asyncio.create_task(ticker(lag))
+    elapsed = await burst(ingest, frames)
+    tick.cancel()
+    if processes:
+        for writer in writers:
+            writer.close()
+        for process, results in workers:
+            for value in await asyncio.get_running_loop().run_in_executor(None, results.recv):
+                latency.record(value)
+            process.join()
+    return {
+        "processes": processes,
+        "burst_seconds": elapsed,
+        "frames_per_sec": len(frames) / elapsed,
+        "loop_lag": lag.summary(),
+        "detect_to_signed": latency.summary(),
+    }
+
+
+def codec(count: int) -> dict:
+    from solana_bots.utils.events import CreateEvent, TradeEvent
+    from solana_bots.utils.multiproc import decode_launch, encode_launch
+
+    event = CreateEvent("Some Token", "SOME", "https://ipfs.io/ipfs/" + "Q" * 46, *(Keypair().pubkey() for _ in range(3)))
+    trade = TradeEvent(event.mint, 10**9, 3 * 10**13, True, event.user, 1_700_000_000, 31 * 10**9, 10**15)
+    record = encode_launch(event, time.monotonic(), 300_000_000, trade)
+    pickled = pickle.dumps((
+        {s: getattr(event, s) for s in CreateEvent.__slots__}, time.monotonic(), 300_000_000,
+        {s: getattr(trade, s) for s in TradeEvent.__slots__},
+    ))
+    return {
+        "record_bytes": len(record),
+        "pickle_bytes": len(pickled),
+        "encode_us": timeit.timeit(lambda: encode_launch(event, 0.0, 1, trade), number=count) / count * 1e6,
+        "decode_us": timeit.timeit(lambda: decode_launch(record), number=count) / count * 1e6,
+        "pickle_roundtrip_us": timeit.timeit(lambda: pickle.loads(pickle.dumps(pickled)), number=count) / count * 1e6,
+    }
+
+
+def ring_balance(nodes: int, keys: int) -> dict:
+    from solana_bots.utils.multiproc import HashRing
+
+    ring = HashRing(range(nodes))
+    mints = [bytes(Keypair().pubkey()) for _ in range(keys)]
+    owners = [ring.node_for(mint) for mint in mints]
+    ring.remove(nodes - 1)
+    moved = sum(owner != ring.node_for(mint) for mint, owner in zip(mints, owners))
+    counts = [owners.count(node) for node in range(nodes)]
+    return {
+        "nodes": nodes,
+        "share_min": min(counts) / keys,
+        "share_max": max(counts) / keys,
+        "moved_on_removal": moved / keys,
+    }
+
+
+async def run(args) -> dict:
+    from solana_bots.utils.logsink import ERROR, log
+
+    log.level = ERROR
+    frames = build_frames(args.frames, create_ratio=args.create_ratio)
+    counts = [0] + [int(count) for count in args.processes.split(",")]
+    return {
+        "launches": sum('"Program data: ' in frame and "InitializeMint2" in frame for frame in frames),
+        "modes": [await measure(count, frames, args.polls) for count in counts],
+        "codec": codec(20_000),
+        "ring": [ring_balance(count, 20_000) for count in counts if count > 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=20_000)
+    parser.add_argument("--create-ratio", type=float, default=0.05)
+    parser.add_argument("--processes", default="1,2,4", help="process counts to compare with inline (0)")
+    parser.add_argument("--polls", type=int, default=20, help="status replies parsed per launch")
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
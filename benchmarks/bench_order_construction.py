@@ -0,0 +1,122 @@
+"""Microbenchmark: per-order transaction construction, legacy vs. InstructionFactory.
+
+    python -m benchmarks.bench_order_construction [--orders N]
+
+Both paths produce the same signed VersionedTransaction; the legacy path is
+the pre-factory body of TokenTrader.buy/sell.
+"""
+import argparse
+import os
+import struct
+import timeit
+
+from solders.hash import Hash  # type: ignore
+from solders.keypair import Keypair  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+
+os.environ.setdefault("KEY_PAIR", str(Keypair()))
+
+from solana.transaction import AccountMeta  # noqa: E402
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price  # type: ignore # noqa: E402
+from solders.instruction import Instruction  # type: ignore # noqa: E402
+from solders.message import MessageV0  # type: ignore # noqa: E402
+from solders.transaction import VersionedTransaction  # type: ignore # noqa: E402
+from spl.token.instructions import CloseAccountParams, close_account, create_associated_token_account, get_associated_token_address  # noqa: E402
+
+from solana_bots.utils.accounts import AccountRegistry, derive_bonding_curve  # noqa: E402
+from solana_bots.utils.config import UNIT_BUDGET, UNIT_PRICE  # noqa: E402
+from solana_bots.utils.constants import (  # noqa: E402
+    ASSOC_TOKEN_ACC_PROG, EVENT_AUTHORITY, FEE_RECIPIENT, GLOBAL, PUMP_FUN_PROGRAM, RENT, SYSTEM_PROGRAM, TOKEN_PROGRAM,
+)
+from solana_bots.utils.instructions import InstructionFactory  # noqa: E402
+
+
+def legacy_buy(payer, mint, bonding_curve, associated_bonding_curve, amount, max_sol_cost, blockhash):
+    user = payer.pubkey()
+    associated_user = get_associated_token_address(user, mint)
+    token_account_instruction = create_associated_token_account(user, user, mint)
+    keys = [
+        AccountMeta(pubkey=GLOBAL, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=FEE_RECIPIENT, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=mint, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=bonding_curve, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=associated_bonding_curve, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=associated_user, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=user, is_signer=True, is_writable=True),
+        AccountMeta(pubkey=SYSTEM_PROGRAM, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=TOKEN_PROGRAM, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=RENT, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=EVENT_AUTHORITY, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=PUMP_FUN_PROGRAM, is_signer=False, is_writable=False),
+    ]
+    data = bytearray()
+    data.extend(bytes.fromhex("66063d1201daebea"))
+    data.extend(struct.pack('<Q', amount))
+    data.extend(struct.pack('<Q', max_sol_cost))
+    swap_instruction = Instruction(PUMP_FUN_PROGRAM, bytes(data), keys)
+    instructions = [set_compute_unit_limit(UNIT_BUDGET), set_compute_unit_price(UNIT_PRICE), token_account_instruction, swap_instruction]
+    message = MessageV0.try_compile(user, instructions, [], blockhash)
+    return VersionedTransaction(message, [payer])
+
+
+def legacy_sell(payer, mint, bonding_curve, associated_bonding_curve, amount, min_sol_output, blockhash):
+    user = payer.pubkey()
+    associated_user = get_associated_token_address(user, mint)
+    keys = [
+        AccountMeta(pubkey=GLOBAL, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=FEE_RECIPIENT, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=mint, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=bonding_curve, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=associated_bonding_curve, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=associated_user, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=user, is_signer=True, is_writable=True),
+        AccountMeta(pubkey=SYSTEM_PROGRAM, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=ASSOC_TOKEN_ACC_PROG, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=TOKEN_PROGRAM, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=EVENT_AUTHORITY, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=PUMP_FUN_PROGRAM, is_signer=False, is_writable=False),
+    ]
+    data = bytearray()
+    data.extend(bytes.fromhex("33e685a4017f83ad"))
+    data.extend(struct.pack('<Q', amount))
+    data.extend(struct.pack('<Q', min_sol_output))
+    swap_instruction = Instruction(PUMP_FUN_PROGRAM, bytes(data), keys)
+    instructions = [set_compute_unit_limit(UNIT_BUDGET), set_compute_unit_price(UNIT_PRICE), swap_instruction]
+    instructions.append(close_account(CloseAccountParams(TOKEN_PROGRAM, associated_user, user, user)))
+    message = MessageV0.try_compile(user, instructions, [], blockhash)
+    return VersionedTransaction(message, [payer])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payer = Keypair()
+    user = payer.pubkey()
+    blockhash = Hash.new_unique()
+    mint = Pubkey(os.urandom(32))
+    bonding_curve = derive_bonding_curve(mint)
+    accounts = AccountRegistry().register(mint, bonding_curve)
+    factory = InstructionFactory()
+
+    # Same sell message either way; the buy differs only in the idempotent ATA create
+    sell_legacy = legacy_sell(payer, mint, bonding_curve, accounts.associated_bonding_curve, 123, 456, blockhash)
+    sell_factory = factory.sell_template(accounts, user).transaction(123, 456, blockhash, payer)
+    assert bytes(sell_legacy) == bytes(sell_factory)
+
+    def run(label, fn):
+        best = min(timeit.repeat(fn, number=args.orders, repeat=args.repeat))
+        print(f"{label:>16}: {best / args.orders * 1e6:8.1f} us/order")
+
+    run("legacy buy", lambda: legacy_buy(payer, mint, bonding_curve, accounts.associated_bonding_curve, 123, 456, blockhash))
+    run("factory buy", lambda: factory.buy_template(accounts, user).transaction(123, 456, blockhash, payer))
+    run("legacy sell", lambda: legacy_sell(payer, mint, bonding_curve, accounts.associated_bonding_curve, 123, 456, blockhash))
+    run("factory sell", lambda: factory.sell_template(accounts, user).transaction(123, 456, blockhash, payer))
+    template = factory.buy_template(accounts, user)
+    run("unsigned message", lambda: template.message(123, 456, blockhash))
+
+
+if __name__ == "__main__":
+    main()
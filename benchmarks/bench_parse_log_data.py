@@ -0,0 +1,86 @@
+"""Microbenchmark: legacy parse_log_data vs. the discriminator-first decoder.
+
+    python -m benchmarks.bench_parse_log_data [--lines N] [--create-ratio R]
+"""
+import argparse
+import base64
+import os
+import random
+import timeit
+
+from solders.pubkey import Pubkey  # type: ignore
+
+from solana_bots.utils.events import decode_create_log, encode_create_event, encode_trade_event
+
+
+def legacy_parse_log_data(log_data: str):
+    # Verbatim copy of the pre-decoder Streamer.parse_log_data
+    try:
+        decoded = base64.b64decode(log_data.replace("Program data: ", ""))
+        length = len(decoded)
+        if length >= 180:
+            user_bytes = decoded[length-32:length]
+            bc_bytes = decoded[length-64:length-32]
+            mint_bytes = decoded[length-96:length-64]
+            user = str(Pubkey(user_bytes))
+            bc_pk = str(Pubkey(bc_bytes))
+            mint = str(Pubkey(mint_bytes))
+            if "pump" in mint.lower():
+                return mint, bc_pk, user
+    except Exception as e:
+        print(f"Error parsing log data: {e}")
+    return None, None, None
+
+
+def decoder_parse_log_data(log_data: str):
+    event = decode_create_log(log_data)
+    if event is not None and "pump" in str(event.mint).lower():
+        return event
+    return None
+
+
+def _pubkey() -> Pubkey:
+    return Pubkey(os.urandom(32))
+
+
+def build_corpus(lines: int, create_ratio: float, seed: int = 7):
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(lines):
+        if rng.random() < create_ratio:
+            raw = encode_create_event(
+                f"Token {i}", f"TK{i % 1000}", f"https://ipfs.io/ipfs/{os.urandom(23).hex()}",
+                _pubkey(), _pubkey(), _pubkey(),
+            )
+        else:
+            raw = encode_trade_event(
+                _pubkey(), rng.randrange(10**9), rng.randrange(10**12), rng.random() < 0.5,
+                _pubkey(), 1_700_000_000 + i, 30 * 10**9, 1_073 * 10**12,
+            )
+        corpus.append("Program data: " + base64.b64encode(raw).decode())
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=20_000)
+    parser.add_argument("--create-ratio", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.lines, args.create_ratio)
+
+    def run(fn):
+        def loop():
+            for line in corpus:
+                fn(line)
+        best = min(timeit.repeat(loop, number=1, repeat=args.repeat))
+        return best, args.lines / best
+
+    for label, fn in (("legacy", legacy_parse_log_data), ("decoder", decoder_parse_log_data)):
+        best, rate = run(fn)
+        print(f"{label:>8}: {best * 1e3:8.2f} ms  {rate:12,.0f} lines/s  {best / args.lines * 1e9:8.0f} ns/line")
+
+
+if __name__ == "__main__":
+    main()
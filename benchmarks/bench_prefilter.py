@@ -0,0 +1,83 @@
+"""Replay benchmark: json.loads every frame vs. FramePrefilter.
+
+    python -m benchmarks.bench_prefilter [--corpus frames.jsonl] [--frames N]
+
+``--corpus`` takes one raw websocket frame per line; without it a synthetic
+corpus is generated (and can be kept with ``--save``).
+"""
+import argparse
+import json
+import time
+
+from solana_bots.utils.prefilter import JSON_BACKEND, FramePrefilter, extract_logs
+
+from .corpus import build_frames, load_frames, save_frames
+
+
+def is_valid_stream(logs):
+    for msg in logs:
+        if "InitializeMint2" in msg or "Create Metadata Accounts v3" in msg:
+            return True
+    return False
+
+
+def baseline(frames):
+    hits = 0
+    for message in frames:
+        parsed = json.loads(message)
+        logs = parsed.get("params", {}).get("result", {}).get("value", {}).get("logs", [])
+        if logs and is_valid_stream(logs):
+            hits += 1
+    return hits
+
+
+def prefiltered(frames, prefilter):
+    hits = 0
+    for message in frames:
+        parsed = prefilter(message)
+        if parsed is None:
+            continue
+        logs = extract_logs(parsed)
+        if logs and is_valid_stream(logs):
+            hits += 1
+    return hits
+
+
+def _rate(fn, frames, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(frames)
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus")
+    parser.add_argument("--frames", type=int, default=20_000)
+    parser.add_argument("--create-ratio", type=float, default=0.02)
+    parser.add_argument("--save")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = load_frames(args.corpus) if args.corpus else build_frames(args.frames, args.create_ratio)
+    if args.save:
+        save_frames(args.save, frames)
+
+    before, hits_before = _rate(baseline, frames, args.repeat)
+    prefilter = FramePrefilter()
+    after, hits_after = _rate(lambda f: prefiltered(f, prefilter), frames, args.repeat)
+    assert hits_before == hits_after, (hits_before, hits_after)
+
+    print(f"frames: {len(frames)}  launches: {hits_after}  json backend: {JSON_BACKEND}")
+    print(f"  before: {before:12,.0f} msg/s")
+    print(f"   after: {after:12,.0f} msg/s  ({after / before:.1f}x)")
+    counted = FramePrefilter()
+    prefiltered(frames, counted)
+    print(f"  counters: {counted.stats()}")
+
+
+if __name__ == "__main__":
+    main()
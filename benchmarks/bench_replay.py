@@ -0,0 +1,72 @@
+"""Record/replay benchmark over a synthetic logsSubscribe session.
+
+    python -m benchmarks.bench_replay [--launches N] [--speed S] [--zstd]
+
+Writes a timestamped session with ``FrameRecorder``, then replays it
+through ``Streamer.process_frame`` with the simulated executor. Reports
+recording size and write/read throughput, events/sec, decode latency
+percentiles and simulated PnL for the fixed-hold strategy.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from solders.keypair import Keypair  # type: ignore
+
+from .corpus import build_session
+
+os.environ.setdefault("KEY_PAIR", str(Keypair()))
+
+
+def record(path: str, session, compress: bool) -> dict:
+    from solana_bots.utils.recorder import FrameRecorder, iter_frames
+
+    started = time.perf_counter()
+    with FrameRecorder(path, compress=compress) as recorder:
+        for at, frame in session:
+            recorder.write(frame, at)
+        raw = recorder.bytes
+    written = time.perf_counter() - started
+
+    started = time.perf_counter()
+    count = sum(1 for _ in iter_frames(path))
+    read = time.perf_counter() - started
+    assert count == len(session)
+    return {
+        "frames": count,
+        "payload_bytes": raw,
+        "file_bytes": os.path.getsize(path),
+        "write_frames_per_sec": round(count / written),
+        "read_frames_per_sec": round(count / read),
+    }
+
+
+async def run(args):
+    from solana_bots.utils.replay import replay
+
+    session = build_session(args.launches, args.trades, args.noise, args.duration)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.zst" if args.zstd else "session.bin")
+        recording = record(path, session, args.zstd)
+        results = await replay(path, args.speed or None, args.hold)
+    results["recording"] = recording
+    print(json.dumps(results, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, default=50)
+    parser.add_argument("--trades", type=int, default=200, help="trades per launch")
+    parser.add_argument("--noise", type=int, default=20_000, help="trades on unrelated mints")
+    parser.add_argument("--duration", type=float, default=120.0, help="recorded seconds")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, N = N times faster, 0 = max")
+    parser.add_argument("--hold", type=float, default=30.0)
+    parser.add_argument("--zstd", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
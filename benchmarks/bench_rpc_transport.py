@@ -0,0 +1,80 @@
+"""RPC transport benchmark against a local JSON-RPC stand-in.
+
+    python -m benchmarks.bench_rpc_transport [--callers N] [--rounds R] [--latency S]
+
+Each round, ``callers`` concurrent tasks issue the reads the bot makes
+around a trade (latest blockhash, signature statuses, token balances).
+The baseline gives each caller its own ``AsyncClient`` as ``BaseClass``
+used to; the shared transport coalesces and deduplicates them. Reports
+HTTP round trips, round trips saved and wall time for both.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from solana.rpc.async_api import AsyncClient
+from solders.keypair import Keypair  # type: ignore
+from solders.signature import Signature  # type: ignore
+
+from solana_bots.utils.rpc import PooledClient, RpcTransport
+from solana_bots.utils.standins import JsonRpcStandIn
+
+os.environ.setdefault("KEY_PAIR", str(Keypair()))
+
+
+async def _round(clients, signatures, accounts):
+    calls = []
+    for i, client in enumerate(clients):
+        calls.append(client.get_latest_blockhash())
+        calls.append(client.get_signature_statuses(signatures[i % len(signatures):][:4]))
+        calls.append(client.get_multiple_accounts(accounts[i % len(accounts):][:8], encoding="base64"))
+    await asyncio.gather(*calls)
+    return len(calls)
+
+
+async def _measure(standin, clients, args, signatures, accounts) -> dict:
+    standin.posts = 0
+    calls = 0
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        calls += await _round(clients, signatures, accounts)
+    elapsed = time.perf_counter() - started
+    return {
+        "calls": calls,
+        "round_trips": standin.posts,
+        "saved": calls - standin.posts,
+        "seconds": round(elapsed, 4),
+    }
+
+
+async def run(args):
+    signatures = [Signature.new_unique() for _ in range(16)]
+    accounts = [Keypair().pubkey() for _ in range(32)]
+    async with JsonRpcStandIn(latency=args.latency) as standin:
+        baseline_clients = [AsyncClient(standin.url) for _ in range(args.callers)]
+        baseline = await _measure(standin, baseline_clients, args, signatures, accounts)
+        for client in baseline_clients:
+            await client.close()
+
+        transport = RpcTransport(standin.url, method_limits={})
+        shared = PooledClient(transport)
+        pooled = await _measure(standin, [shared] * args.callers, args, signatures, accounts)
+        pooled["deduplicated"] = transport.deduplicated.value
+        pooled["batched"] = transport.batched.value
+        await transport.close()
+
+    print(json.dumps({"per_instance_clients": baseline, "shared_transport": pooled}, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--callers", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.002)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
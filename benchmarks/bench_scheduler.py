@@ -0,0 +1,93 @@
+"""Position scheduler benchmark: many concurrent positions on a fixed set of
+tasks.
+
+    python -m benchmarks.bench_scheduler [--positions N] [--hold S] [--fail-rate F]
+
+Launches arrive at ``--rate`` per second; buys and sells are simulated
+with fixed latency and sells fail at ``--fail-rate`` to exercise retries.
+Reports peak open positions, task count, traced memory per open position
+and how late deadlines fire.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+
+from solana_bots.utils.metrics import Histogram
+from solana_bots.utils.scheduler import PositionScheduler
+
+
+async def run(args) -> dict:
+    rng = random.Random(5)
+    lateness = Histogram("lateness")
+    due = {}
+    peak = {"open": 0, "tasks": 0}
+
+    async def buy(mint: str) -> bool:
+        await asyncio.sleep(args.latency)
+        return True
+
+    async def sell(mint: str, percentage: int = 100) -> bool:
+        if mint in due:
+            lateness.record(time.monotonic() - due.pop(mint))
+        await asyncio.sleep(args.latency)
+        return rng.random() >= args.fail_rate
+
+    scheduler = PositionScheduler(
+        buy, sell, hold=args.hold, max_open=args.positions, max_pending_buys=args.positions,
+        buy_concurrency=args.buy_concurrency, sell_concurrency=args.sell_concurrency, buy_timeout=60.0,
+    )
+    original = scheduler._schedule
+
+    def schedule(position, at):
+        if position.attempts == 0:
+            due[position.mint] = at
+        original(position, at)
+
+    scheduler._schedule = schedule
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    worker = asyncio.create_task(scheduler.run())
+    started = time.monotonic()
+    for i in range(args.positions):
+        scheduler.open(f"mint{i}")
+        if i % 100 == 99:
+            await asyncio.sleep(100 / args.rate)
+        peak["open"] = max(peak["open"], len(scheduler))
+    peak["tasks"] = len(asyncio.all_tasks())
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    open_at_peak = len(scheduler)
+    while len(scheduler):
+        await asyncio.sleep(0.05)
+    elapsed = time.monotonic() - started
+    worker.cancel()
+    tracemalloc.stop()
+    stats = scheduler.stats()
+    assert stats["sold"] + stats["abandoned"] == stats["opened"] == args.positions, stats
+    return {
+        "positions": args.positions,
+        "seconds": elapsed,
+        "peak_open": peak["open"],
+        "tasks": peak["tasks"],
+        "bytes_per_open_position": memory / max(1, open_at_peak),
+        "deadline_lateness_ms": {k: v * 1e3 if isinstance(v, float) else v for k, v in lateness.summary().items()},
+        "stats": stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--positions", type=int, default=2_000)
+    parser.add_argument("--rate", type=float, default=2_000.0, help="launches per second")
+    parser.add_argument("--hold", type=float, default=2.0)
+    parser.add_argument("--latency", type=float, default=0.002, help="simulated buy/sell round trip")
+    parser.add_argument("--fail-rate", type=float, default=0.1)
+    parser.add_argument("--buy-concurrency", type=int, default=8)
+    parser.add_argument("--sell-concurrency", type=int, default=8)
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
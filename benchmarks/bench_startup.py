@@ -0,0 +1,82 @@
+"""Cold-start benchmark: import time, construction time and dry-run time
+to first transaction, each measured in fresh interpreters.
+
+    python -m benchmarks.bench_startup [--runs N]
+
+Every run starts a new ``python`` with no KEY_PAIR in its environment, so
+it also checks that importing the bot needs no secrets. Reports the median
+over ``--runs`` of:
+
+- the time to import ``solana_bots.utils.main``, and whether that pulled
+  in NumPy;
+- the time to construct a ``Streamer`` (with a throwaway wallet);
+- ``python -m solana_bots --dry-run``'s time from ``main()`` to the first
+  ``sendTransaction`` at the stand-in, and the whole process's wall time.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT = """
+import json, sys, time
+started = time.perf_counter()
+import solana_bots.utils.main
+imported = time.perf_counter()
+from solders.keypair import Keypair
+from solana_bots.utils.streamer import Streamer
+streamer = Streamer("http://127.0.0.1:1", keypairs=[Keypair()])
+print(json.dumps({
+    "import_ms": (imported - started) * 1e3,
+    "construct_ms": (time.perf_counter() - imported) * 1e3,
+    "numpy_loaded": "numpy" in sys.modules,
+}))
+"""
+
+
+def environment() -> dict:
+    env = {key: value for key, value in os.environ.items() if key not in ("KEY_PAIR", "EXTRA_KEY_PAIRS")}
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    return env
+
+
+def run_import(env: dict) -> dict:
+    out = subprocess.run([sys.executable, "-c", IMPORT], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def run_dry(env: dict) -> dict:
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-m", "solana_bots", "--dry-run", "--launches", "1", "--duration", "0.5", "--log-level", "error"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout)
+    result["process_ms"] = (time.perf_counter() - started) * 1e3
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    env = environment()
+
+    imports = [run_import(env) for _ in range(args.runs)]
+    dry = [run_dry(env) for _ in range(args.runs)]
+    print(json.dumps({
+        "runs": args.runs,
+        "import_ms": statistics.median(r["import_ms"] for r in imports),
+        "construct_ms": statistics.median(r["construct_ms"] for r in imports),
+        "numpy_loaded": any(r["numpy_loaded"] for r in imports),
+        "dry_run_first_send_ms": statistics.median(r["first_send_ms"] for r in dry),
+        "dry_run_process_ms": statistics.median(r["process_ms"] for r in dry),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Send-racing benchmark against local JSON-RPC stand-ins.
+
+    python -m benchmarks.bench_submitter [--orders N] [--concurrency C]
+
+Each stand-in accepts ``sendTransaction`` with its own latency and jitter,
+forwards the transaction to a shared simulated leader with its own drop
+rate, and may reject sends outright. A transaction lands once any
+forwarded copy reaches the leader, and reads as confirmed on
+``getSignatureStatuses`` 400 ms later. Compares racing all endpoints
+with sending through each endpoint alone, and reports the endpoint
+ranking the submitter learned.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import time
+from typing import Dict, List
+
+from solders.hash import Hash  # type: ignore
+from solders.keypair import Keypair  # type: ignore
+from solders.message import MessageV0  # type: ignore
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from solana_bots.utils.metrics import Histogram
+from solana_bots.utils.standins import JsonRpcStandIn
+
+os.environ.setdefault("KEY_PAIR", str(Keypair()))
+
+CONFIRM_AFTER = 0.4
+PROFILES = [
+    dict(latency=0.030, jitter=0.020, drop=0.60, reject=0.0),
+    dict(latency=0.005, jitter=0.005, drop=0.20, reject=0.0),
+    dict(latency=0.010, jitter=0.040, drop=0.10, reject=0.2),
+]
+
+
+class Leader:
+    """Records when each signature first reached the simulated leader."""
+
+    def __init__(self, seed: int = 11):
+        self.rng = random.Random(seed)
+        self.landed: Dict[str, float] = {}
+
+    def forward(self, txn: VersionedTransaction, drop: float):
+        if self.rng.random() >= drop:
+            self.landed.setdefault(str(txn.signatures[0]), time.monotonic())
+
+    def status(self, signature: str):
+        landed = self.landed.get(signature)
+        if landed is None or time.monotonic() - landed < CONFIRM_AFTER:
+            return None
+        return {"slot": 1, "confirmations": None, "err": None, "status": {"Ok": None}, "confirmationStatus": "confirmed"}
+
+
+def sender(leader: Leader, drop: float, reject: float, rng: random.Random):
+    def send(params):
+        if rng.random() < reject:
+            raise RuntimeError("Node is behind")
+        txn = VersionedTransaction.from_bytes(base64.b64decode(params[0]))
+        leader.forward(txn, drop)
+        return str(txn.signatures[0])
+    return send
+
+
+def transactions(count: int) -> List[VersionedTransaction]:
+    payer = Keypair()
+    to = Keypair().pubkey()
+    txns = []
+    for i in range(count):
+        ix = transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=to, lamports=i + 1))
+        message = MessageV0.try_compile(payer.pubkey(), [ix], [], Hash.default())
+        txns.append(VersionedTransaction(message, [payer]))
+    return txns
+
+
+async def measure(urls: List[str], status_url: str, txns, concurrency: int, timeout: float) -> dict:
+    from solana_bots.utils.confirmation import ConfirmationEngine
+    from solana_bots.utils.rpc import shared_client
+    from solana_bots.utils.subscriptions import SubscriptionClient
+    from solana_bots.utils.submitter import Submitter
+
+    confirmations = ConfirmationEngine(shared_client(status_url), SubscriptionClient(), poll_after=0.0, poll_interval=0.02)
+    submitter = Submitter(urls, confirmations, interval=0.2)
+    poller = asyncio.create_task(confirmations.run())
+    rounds = submitter.rounds.value
+    latency = Histogram("landed")
+    outcomes = {"confirmed": 0, "expired": 0, "rejected": 0}
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(txn):
+        async with limit:
+            started = time.monotonic()
+            try:
+                _, confirmed = await submitter.submit(txn, timeout=timeout)
+            except Exception:
+                outcomes["rejected"] += 1
+                return
+            if confirmed:
+                outcomes["confirmed"] += 1
+                latency.record(time.monotonic() - started)
+            else:
+                outcomes["expired"] += 1
+
+    await asyncio.gather(*(one(txn) for txn in txns))
+    poller.cancel()
+    return {
+        **outcomes,
+        "landing_rate": outcomes["confirmed"] / len(txns),
+        "time_to_confirmed": latency.summary(),
+        "rounds_per_order": (submitter.rounds.value - rounds) / len(txns),
+        "ranking": [endpoint.label for endpoint in submitter.ranking()],
+        "endpoints": {endpoint.label: endpoint.summary() for endpoint in submitter.endpoints},
+    }
+
+
+async def run(args) -> dict:
+    from solana_bots.utils.rpc import close_transports
+
+    leader = Leader()
+    rng = random.Random(7)
+    standins = []
+    for profile in PROFILES:
+        handlers = {"sendTransaction": sender(leader, profile["drop"], profile["reject"], rng)}
+        standins.append(await JsonRpcStandIn(handlers, latency=profile["latency"], jitter=profile["jitter"]).start())
+    status = await JsonRpcStandIn({
+        "getSignatureStatuses": lambda params: status.context([leader.status(s) for s in params[0]]),
+    }).start()
+    urls = [standin.url for standin in standins]
+    results = {}
+    try:
+        for label, targets in [("race_all", urls)] + [(f"only_{i}", [url]) for i, url in enumerate(urls)]:
+            results[label] = await measure(targets, status.url, transactions(args.orders), args.concurrency, args.timeout)
+    finally:
+        await close_transports()
+        for standin in standins + [status]:
+            await standin.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Wallet sharding benchmark: buy/sell throughput with 1..N payer wallets.
+
+    python -m benchmarks.bench_wallets [--positions N] [--wallets 1,4,8] [--policy least_loaded]
+
+Runs ``TokenTrader.buy`` then ``sell`` for every position against a
+JSON-RPC stand-in. The simulated leader write-locks each fee payer, so at
+most one transaction per payer lands per ``--slot`` seconds. Launches are
+seeded with ``Coin.register_launch``, so the only RPC traffic is the
+blockhash, sends, status polls and balance refreshes. Reports time to
+close every position and how transactions spread across wallets.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import time
+from typing import Dict
+
+from solders.keypair import Keypair  # type: ignore
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from solana_bots.utils.standins import JsonRpcStandIn
+
+os.environ.setdefault("KEY_PAIR", str(Keypair()))
+
+
+class Leader:
+    """Lands transactions one per fee payer per slot."""
+
+    def __init__(self, slot: float):
+        self.slot = slot
+        self.free_at: Dict[str, float] = {}
+        self.landed: Dict[str, float] = {}
+        self.per_payer: Dict[str, int] = {}
+
+    def send(self, params):
+        txn = VersionedTransaction.from_bytes(base64.b64decode(params[0]))
+        signature = str(txn.signatures[0])
+        if signature not in self.landed:
+            payer = str(txn.message.account_keys[0])
+            at = max(time.monotonic(), self.free_at.get(payer, 0.0)) + self.slot
+            self.free_at[payer] = self.landed[signature] = at
+            self.per_payer[payer] = self.per_payer.get(payer, 0) + 1
+        return signature
+
+    def statuses(self, params):
+        now = time.monotonic()
+        return [
+            {"slot": 1, "confirmations": None, "err": None, "status": {"Ok": None}, "confirmationStatus": "confirmed"}
+            if self.landed.get(signature, float("inf")) <= now else None
+            for signature in params[0]
+        ]
+
+
+async def measure(wallets: int, args) -> dict:
+    from solana_bots.utils.coin import Coin
+    from solana_bots.utils.events import CreateEvent
+    from solana_bots.utils.rpc import close_transports
+    from solana_bots.utils.trader import TokenTrader
+    from solana_bots.utils.wallets import POLICIES
+
+    leader = Leader(args.slot)
+    standin = JsonRpcStandIn({
+        "sendTransaction": leader.send,
+        "getSignatureStatuses": lambda params: standin.context(leader.statuses(params)),
+        "getMultipleAccounts": lambda params: standin.context([
+            {"lamports": 10 * 10**9, "owner": "11111111111111111111111111111111", "data": ["", "base64"],
+             "executable": False, "rentEpoch": 0, "space": 0}
+            for _ in params[0]
+        ]),
+    })
+    await standin.start()
+    coin = Coin(standin.url)
+    trader = TokenTrader(standin.url, coin, keypairs=[Keypair() for _ in range(wallets)])
+    trader.wallets.policy = POLICIES[args.policy]
+    trader.confirmations.poll_after = 0.0
+    trader.confirmations.poll_interval = args.slot / 4
+    workers = [asyncio.create_task(trader.confirmations.run()), asyncio.create_task(trader.blockhashes.run())]
+    await trader.wallets.refresh()
+
+    mints = []
+    for i in range(args.positions):
+        event = CreateEvent(f"T{i}", "T", "", Keypair().pubkey(), Keypair().pubkey(), Keypair().pubkey())
+        coin.register_launch(event, slot=1)
+        mints.append(str(event.mint))
+
+    limit = asyncio.Semaphore(args.concurrency)
+    outcomes = {"bought": 0, "sold": 0}
+
+    async def cycle(mint: str):
+        async with limit:
+            if not await trader.buy(mint):
+                return
+            outcomes["bought"] += 1
+        async with limit:
+            if await trader.sell(mint):
+                outcomes["sold"] += 1
+            trader.wallets.release(mint)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(cycle(mint) for mint in mints))
+        elapsed = time.perf_counter() - started
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await close_transports()
+        await standin.close()
+    return {
+        "wallets": wallets,
+        **outcomes,
+        "seconds": elapsed,
+        "positions_per_sec": args.positions / elapsed,
+        "transactions_per_wallet": sorted(leader.per_payer.values(), reverse=True),
+    }
+
+
+async def run(args) -> list:
+    from solana_bots.utils.logsink import ERROR, log
+
+    log.level = ERROR
+    return [await measure(int(count), args) for count in args.wallets.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--positions", type=int, default=64)
+    parser.add_argument("--wallets", default="1,4,8")
+    parser.add_argument("--policy", default="least_loaded")
+    parser.add_argument("--slot", type=float, default=0.05, help="simulated slot time in seconds")
+    parser.add_argument("--concurrency", type=int, default=32)
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
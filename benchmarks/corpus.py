@@ -0,0 +1,154 @@
+"""Synthetic logsSubscribe frames shaped like live pump.fun traffic."""
+import base64
+import json
+import os
+import random
+from typing import List, Tuple
+
+from solders.pubkey import Pubkey  # type: ignore
+
+from solana_bots.utils import curve_math
+from solana_bots.utils.constants import INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES
+from solana_bots.utils.events import encode_create_event, encode_trade_event
+
+PUMP = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+
+
+def _pubkey() -> Pubkey:
+    return Pubkey(os.urandom(32))
+
+
+def _pump_pubkey() -> Pubkey:
+    # Launch mints are ground to end in "pump"; splice the suffix onto a
+    # random key and keep the first spelling that still fits in 32 bytes.
+    while True:
+        candidate = str(_pubkey())[:-4] + "pump"
+        try:
+            key = Pubkey.from_string(candidate)
+        except ValueError:
+            continue
+        if str(key) == candidate:
+            return key
+
+
+def _signature() -> str:
+    return base64.b32encode(os.urandom(40)).decode().rstrip("=")[:88]
+
+
+def _frame(slot: int, logs: List[str], signature: str = None) -> str:
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "method": "logsNotification",
+        "params": {
+            "result": {
+                "context": {"slot": slot},
+                "value": {"signature": signature or _signature(), "err": None, "logs": logs},
+            },
+            "subscription": 1,
+        },
+    })
+
+
+def trade_frame(
+    slot: int,
+    rng: random.Random,
+    mint: Pubkey = None,
+    virtual_sol_reserves: int = 30 * 10**9,
+    virtual_token_reserves: int = 1_073 * 10**12,
+) -> str:
+    raw = encode_trade_event(
+        mint or _pubkey(), rng.randrange(10**9), rng.randrange(10**12), rng.random() < 0.5,
+        _pubkey(), 1_700_000_000 + slot, virtual_sol_reserves, virtual_token_reserves,
+    )
+    return _frame(slot, [
+        "Program ComputeBudget111111111111111111111111111111 invoke [1]",
+        "Program ComputeBudget111111111111111111111111111111 success",
+        f"Program {PUMP} invoke [1]",
+        "Program log: Instruction: Buy",
+        "Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA invoke [2]",
+        "Program log: Instruction: Transfer",
+        "Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA consumed 4645 of 64338 compute units",
+        "Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA success",
+        "Program data: " + base64.b64encode(raw).decode(),
+        f"Program {PUMP} consumed 33432 of 99850 compute units",
+        f"Program {PUMP} success",
+    ])
+
+
+def create_frame(slot: int, index: int = 0, mint: Pubkey = None, signature: str = None) -> str:
+    raw = encode_create_event(
+        f"Token {index}", f"TK{index % 1000}", f"https://ipfs.io/ipfs/{os.urandom(23).hex()}",
+        mint or _pump_pubkey(), _pubkey(), _pubkey(),
+    )
+    return _frame(slot, [
+        f"Program {PUMP} invoke [1]",
+        "Program log: Instruction: Create",
+        "Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA invoke [2]",
+        "Program log: Instruction: InitializeMint2",
+        "Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA success",
+        "Program metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s invoke [2]",
+        "Program log: IX: Create Metadata Accounts v3",
+        "Program metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s success",
+        "Program data: " + base64.b64encode(raw).decode(),
+        f"Program {PUMP} consumed 119373 of 200000 compute units",
+        f"Program {PUMP} success",
+    ], signature)
+
+
+def build_frames(count: int, create_ratio: float = 0.02, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    frames = []
+    for i in range(count):
+        slot = 300_000_000 + i // 20
+        if rng.random() < create_ratio:
+            frames.append(create_frame(slot, i))
+        else:
+            frames.append(trade_frame(slot, rng))
+    return frames
+
+
+def build_session(
+    launches: int,
+    trades_per_launch: int = 200,
+    noise_frames: int = 5_000,
+    duration: float = 120.0,
+    seed: int = 7,
+) -> List[Tuple[float, str]]:
+    """Timestamped frames: launches spread over ``duration`` seconds, each
+    followed by a random walk of buys and sells on its curve, mixed with
+    trades on unrelated mints."""
+    rng = random.Random(seed)
+    events = []
+    for i in range(launches):
+        mint = _pump_pubkey()
+        at = rng.uniform(0, duration * 0.75)
+        events.append((at, create_frame(0, i, mint)))
+        virtual_sol, virtual_token = INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES
+        # Each launch gets its own drift: some pump, most bleed out
+        bias = rng.uniform(0.35, 0.65)
+        for _ in range(trades_per_launch):
+            at += rng.expovariate(trades_per_launch / 60.0)
+            if rng.random() < bias:
+                tokens = curve_math.tokens_for_sol(rng.randrange(10**7, 2 * 10**9), virtual_sol, virtual_token)
+                virtual_sol, virtual_token = curve_math.apply_buy(tokens, virtual_sol, virtual_token)
+            else:
+                sold = INITIAL_VIRTUAL_TOKEN_RESERVES - virtual_token
+                tokens = rng.randrange(sold // 4 + 1)
+                virtual_sol, virtual_token = curve_math.apply_sell(tokens, virtual_sol, virtual_token)
+            events.append((at, trade_frame(0, rng, mint, virtual_sol, virtual_token)))
+    for _ in range(noise_frames):
+        events.append((rng.uniform(0, duration), trade_frame(0, rng)))
+    events.sort(key=lambda event: event[0])
+    return [(at, frame.replace('"slot": 0', f'"slot": {300_000_000 + int(at / 0.4)}')) for at, frame in events]
+
+
+def save_frames(path: str, frames: List[str]):
+    with open(path, "w") as f:
+        for frame in frames:
+            f.write(frame)
+            f.write("\n")
+
+
+def load_frames(path: str) -> List[str]:
+    with open(path) as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+import contextlib
+import json
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="solana_bots")
+    parser.add_argument("--dry-run", action="store_true", help="trade synthetic launches against local stand-ins")
+    parser.add_argument("--launches", type=int, default=5, help="dry run: launches to stream")
+    parser.add_argument("--rate", type=float, default=2.0, help="dry run: launches per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="dry run: seconds to run before stopping")
+    parser.add_argument("--processes", type=int, default=0, help="dry run: trader processes (0 = single process)")
+    parser.add_argument("--log-level", default="info", help="dry run: debug, info, warning or error")
+    args = parser.parse_args()
+
+    # utils.main.shutdown cancels every task, this one included, on SIGINT/SIGTERM/SIGHUP
+    with contextlib.suppress(asyncio.CancelledError):
+        run(args)
+
+
+def run(args):
+    if args.dry_run:
+        from .utils.dryrun import dry_run
+
+        result = asyncio.run(dry_run(args.launches, args.rate, args.duration, args.processes, args.log_level))
+        print(json.dumps(result, indent=2))
+    else:
+        from .utils.main import main
+
+        asyncio.run(main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from solders.instruction import AccountMeta, Instruction  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from spl.token.instructions import get_associated_token_address
+
+from .constants import ASSOC_TOKEN_ACC_PROG, PUMP_FUN_PROGRAM, SYSTEM_PROGRAM, TOKEN_PROGRAM
+
+# Associated token program instruction index for CreateIdempotent
+_CREATE_IDEMPOTENT = bytes([1])
+
+
+class MintAccounts:
+    __slots__ = ("mint", "bonding_curve", "associated_bonding_curve", "_user_atas")
+
+    def __init__(self, mint: Pubkey, bonding_curve: Pubkey, associated_bonding_curve: Pubkey):
+        self.mint = mint
+        self.bonding_curve = bonding_curve
+        self.associated_bonding_curve = associated_bonding_curve
+        self._user_atas: Dict[Pubkey, Pubkey] = {}
+
+    def user_ata(self, owner: Pubkey) -> Pubkey:
+        ata = self._user_atas.get(owner)
+        if ata is None:
+            ata = self._user_atas[owner] = get_associated_token_address(owner, self.mint)
+        return ata
+
+
+def derive_bonding_curve(mint: Pubkey) -> Pubkey:
+    bonding_curve, _ = Pubkey.find_program_address([b"bonding-curve", bytes(mint)], PUMP_FUN_PROGRAM)
+    return bonding_curve
+
+
+class AccountRegistry:
+    """LRU of the pump.fun accounts for each mint, keyed by mint string.
+
+    Launches seen on the stream are registered with the bonding curve from
+    their create event, so no PDA search is needed for them; anything else
+    is derived once on first use.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._accounts: "OrderedDict[str, MintAccounts]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def _put(self, mint_str: str, accounts: MintAccounts) -> MintAccounts:
+        self._accounts[mint_str] = accounts
+        self._accounts.move_to_end(mint_str)
+        while len(self._accounts) > self.maxsize:
+            self._accounts.popitem(last=False)
+        return accounts
+
+    def register(
+        self,
+        mint: Pubkey,
+        bonding_curve: Pubkey,
+        associated_bonding_curve: Optional[Pubkey] = None,
+    ) -> MintAccounts:
+        mint_str = str(mint)
+        accounts = self._accounts.get(mint_str)
+        if accounts is not None and accounts.bonding_curve == bonding_curve:
+            self._accounts.move_to_end(mint_str)
+            return accounts
+        if associated_bonding_curve is None:
+            associated_bonding_curve = get_associated_token_address(bonding_curve, mint)
+        return self._put(mint_str, MintAccounts(mint, bonding_curve, associated_bonding_curve))
+
+    def get(self, mint_str: str) -> MintAccounts:
+        accounts = self._accounts.get(mint_str)
+        if accounts is not None:
+            self._accounts.move_to_end(mint_str)
+            return accounts
+        mint = Pubkey.from_string(mint_str)
+        bonding_curve = derive_bonding_curve(mint)
+        return self._put(mint_str, MintAccounts(mint, bonding_curve, get_associated_token_address(bonding_curve, mint)))
+
+    def discard(self, mint_str: str):
+        self._accounts.pop(mint_str, None)
+
+
+def create_ata_idempotent(payer: Pubkey, owner: Pubkey, mint: Pubkey, ata: Pubkey) -> Instruction:
+    """CreateIdempotent for an already derived ATA; a no-op if it exists."""
+    return Instruction(
+        ASSOC_TOKEN_ACC_PROG,
+        _CREATE_IDEMPOTENT,
+        [
+            AccountMeta(pubkey=payer, is_signer=True, is_writable=True),
+            AccountMeta(pubkey=ata, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=owner, is_signer=False, is_writable=False),
+            AccountMeta(pubkey=mint, is_signer=False, is_writable=False),
+            AccountMeta(pubkey=SYSTEM_PROGRAM, is_signer=False, is_writable=False),
+            AccountMeta(pubkey=TOKEN_PROGRAM, is_signer=False, is_writable=False),
+        ],
+    )
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import Optional
+
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
+from solders.hash import Hash  # type: ignore
+
+from .logsink import log
+from .metrics import registry
+
+BLOCKHASH_NOT_FOUND = "Blockhash not found"
+
+
+class BlockhashProvider:
+    """Keeps a recent blockhash warm so orders never wait on the network for one.
+
+    ``run`` refreshes it every ``interval`` seconds. ``get`` returns the
+    cached value unless it is older than ``max_age`` (well inside the ~150
+    block validity window), in which case it refreshes inline.
+    ``force_refresh`` starts a new generation: fetches issued before it may
+    return the hash that was just rejected, so their results are dropped.
+    """
+
+    def __init__(self, client: AsyncClient, interval: float = 2.0, max_age: float = 30.0):
+        self.client = client
+        self.interval = interval
+        self.max_age = max_age
+        self.blockhash: Optional[Hash] = None
+        self.last_valid_block_height = 0
+        self.slot = 0
+        self.fetched_at = 0.0
+        self._wakeup = asyncio.Event()
+        self._inflight: Optional[asyncio.Task] = None
+        self._generation = 0
+        self.refreshes = registry.counter("blockhash.refreshes")
+        self.failures = registry.counter("blockhash.failures")
+        self.forced = registry.counter("blockhash.forced")
+        self.inline = registry.counter("blockhash.inline_fetches")
+        self.age_at_use = registry.histogram("blockhash.age_at_use")
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at if self.blockhash else float("inf")
+
+    def is_stale(self) -> bool:
+        return self.age > self.max_age
+
+    async def _fetch(self) -> Hash:
+        generation = self._generation
+        response = await self.client.get_latest_blockhash(commitment=Confirmed)
+        if generation != self._generation:
+            # Forced out while in flight: use what a fetch issued since has stored, or wait for one
+            if self.blockhash is not None:
+                return self.blockhash
+            return await self.refresh()
+        if response.context.slot >= self.slot:
+            self.blockhash = response.value.blockhash
+            self.last_valid_block_height = response.value.last_valid_block_height
+            self.slot = response.context.slot
+            self.fetched_at = time.monotonic()
+        self.refreshes.inc()
+        return self.blockhash
+
+    async def refresh(self) -> Hash:
+        # Concurrent callers share one in-flight request
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._fetch())
+        try:
+            return await asyncio.shield(self._inflight)
+        except Exception:
+            self.failures.inc()
+            raise
+
+    async def get(self) -> Hash:
+        if self.is_stale():
+            self.inline.inc()
+            await self.refresh()
+        self.age_at_use.record(self.age)
+        return self.blockhash
+
+    def force_refresh(self):
+        """Drop the cached value and wake the refresher, e.g. after a send
+        failed with blockhash-not-found."""
+        self.forced.inc()
+        self.fetched_at = 0.0
+        self.blockhash = None
+        self.slot = 0
+        self._generation += 1
+        self._inflight = None
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        return {
+            "age": self.age,
+            "slot": self.slot,
+            "last_valid_block_height": self.last_valid_block_height,
+            "refreshes": self.refreshes.value,
+            "failures": self.failures.value,
+            "forced": self.forced.value,
+            "inline_fetches": self.inline.value,
+        }
+
+    async def run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                log.error(f"Error refreshing blockhash: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
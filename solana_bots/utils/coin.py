@@ -1,11 +1,13 @@
 from dataclasses import dataclass
 from typing import Optional
-from construct import Flag, Int64ul, Padding, Struct
 from solders.pubkey import  Pubkey  # type: ignore
-from spl.token.instructions import get_associated_token_address
 from .base_class import BaseClass
-from termcolor import cprint
-from .constants import PUMP_FUN_PROGRAM
+from .logsink import log
+from .accounts import AccountRegistry, MintAccounts
+from . import curve_math
+from .curve_cache import BondingCurveCache, CurveState, launch_state
+from .events import CreateEvent, TradeEvent
+from .subscriptions import SubscriptionClient
 
 
 @dataclass
@@ -15,82 +17,91 @@ class CoinData:
     associated_bonding_curve: Pubkey
     virtual_token_reserves: int
     virtual_sol_reserves: int
+    real_token_reserves: int
     token_total_supply: int
     complete: bool
     
     
 class Coin(BaseClass):
-    def __init__(self, rpc_url: str):
+    def __init__(self, rpc_url: str, subscriptions: Optional[SubscriptionClient] = None):
       super().__init__(rpc_url)
+      self.subscriptions = subscriptions or SubscriptionClient()
+      self.accounts = AccountRegistry()
+      self.curves = BondingCurveCache(self.client, self.subscriptions)
+      
+    def register_launch(self, event: CreateEvent, slot: int = 0, dev_trade: Optional[TradeEvent] = None) -> MintAccounts:
+      """Cache a launch's accounts and seed its curve so the first buy needs no RPC reads."""
+      accounts = self.accounts.register(event.mint, event.bonding_curve)
+      if dev_trade is not None and dev_trade.mint == event.mint:
+        state = launch_state(slot, dev_trade.virtual_sol_reserves, dev_trade.virtual_token_reserves)
+      else:
+        state = launch_state(slot)
+      self.curves.track(accounts.bonding_curve, state)
+      return accounts
     
     async def get_coin_data(self, mint_str: str) -> Optional[CoinData]:
-        cprint("Getting coin data...", "green")
-        cprint(f"Mint: {mint_str}", "green")
-        bonding_curve, associated_bonding_curve = await self.derive_bonding_curve_accounts(mint_str)
-        if not all([bonding_curve, associated_bonding_curve]):
+        log.debug("Getting coin data...", "green")
+        log.debug(f"Mint: {mint_str}", "green")
+        accounts = self.get_accounts(mint_str)
+        if accounts is None:
             return None
 
-        virtual_reserves = await self.get_virtual_reserves(bonding_curve)
+        virtual_reserves = await self.get_virtual_reserves(accounts.bonding_curve)
         if virtual_reserves is None:
             return None
 
         try:
             return CoinData(
-                mint=Pubkey.from_string(mint_str),
-                bonding_curve=bonding_curve,
-                associated_bonding_curve=associated_bonding_curve,
-                virtual_token_reserves=int(virtual_reserves.virtualTokenReserves),
-                virtual_sol_reserves=int(virtual_reserves.virtualSolReserves),
-                token_total_supply=int(virtual_reserves.tokenTotalSupply),
-              complete=bool(virtual_reserves.complete),
+                mint=accounts.mint,
+                bonding_curve=accounts.bonding_curve,
+                associated_bonding_curve=accounts.associated_bonding_curve,
+                virtual_token_reserves=virtual_reserves.virtual_token_reserves,
+                virtual_sol_reserves=virtual_reserves.virtual_sol_reserves,
+                real_token_reserves=virtual_reserves.real_token_reserves,
+                token_total_supply=virtual_reserves.token_total_supply,
+                complete=virtual_reserves.complete,
         )
         except Exception as e:
             print(e)
             return None
 
     
-    async def derive_bonding_curve_accounts(self, mint: str):
+    def get_accounts(self, mint_str: str) -> Optional[MintAccounts]:
       try:
-        mint = Pubkey.from_string(mint)
-        bonding_curve, _ = Pubkey.find_program_address(
-          ["bonding-curve".encode(), bytes(mint)],
-          PUMP_FUN_PROGRAM
-        )
-        associated_bonding_curve = get_associated_token_address(bonding_curve, mint)
-        return bonding_curve, associated_bonding_curve
+        return self.accounts.get(mint_str)
       except Exception as e:
-        cprint(f"Error getting coin data: {e}", "red")
-        return None, None 
+        log.error(f"Error getting coin data: {e}")
+        return None
+    
+    async def derive_bonding_curve_accounts(self, mint: str):
+      accounts = self.get_accounts(mint)
+      if accounts is None:
+        return None, None
+      return accounts.bonding_curve, accounts.associated_bonding_curve
       
-    async def get_virtual_reserves(self, bonding_curve: Pubkey):
-      bonding_curve_struct = Struct(
-        Padding(8),
-        "virtualTokenReserves" / Int64ul,
-        "virtualSolReserves" / Int64ul,
-        "realTokenReserves" / Int64ul,
-        "realSolReserves" / Int64ul,
-        "tokenTotalSupply" / Int64ul,
-        "complete" / Flag
-      )
+    async def get_virtual_reserves(self, bonding_curve: Pubkey) -> Optional[CurveState]:
       try:
-        account_info = await self.client.get_account_info(bonding_curve)
-        data = account_info.value.data
-        parsed_data = bonding_curve_struct.parse(data)
-        return parsed_data
+        return await self.curves.get(bonding_curve)
       except Exception as e:
-        cprint(f"Error deriving bonding curve accounts: {e}", "red")
+        log.error(f"Error deriving bonding curve accounts: {e}")
+        
+    async def track_curve(self, mint_str: str):
+      bonding_curve, _ = await self.derive_bonding_curve_accounts(mint_str)
+      if bonding_curve:
+        self.curves.track(bonding_curve)
+        
+    async def release_curve(self, mint_str: str):
+      bonding_curve, _ = await self.derive_bonding_curve_accounts(mint_str)
+      if bonding_curve:
+        self.curves.evict(bonding_curve)
     
-    def sol_for_tokens(self, sol_spent: int, sol_reserves: int, token_reserves: int):
-        new_sol_reserves = sol_reserves + sol_spent
-        new_token_reserves = (sol_reserves * token_reserves) / new_sol_reserves
-        token_received = token_reserves - new_token_reserves
-        return token_received
+    def sol_for_tokens(self, sol_spent: int, sol_reserves: int, token_reserves: int) -> int:
+      # Token base units bought with sol_spent lamports, fee included
+      return curve_math.tokens_for_sol(sol_spent, sol_reserves, token_reserves)
      
-    def tokens_for_sol(self,tokens_to_sell: int, sol_reserves: int, token_reserves: int):
-        new_token_reserves = token_reserves + tokens_to_sell
-        new_sol_reserves = (sol_reserves * token_reserves) / new_token_reserves
-        sol_received = sol_reserves - new_sol_reserves
-        return sol_received
+    def tokens_for_sol(self, tokens_to_sell: int, sol_reserves: int, token_reserves: int) -> int:
+      # Lamports received for tokens_to_sell base units, after fee
+      return curve_math.sell_proceeds(tokens_to_sell, sol_reserves, token_reserves)
     
 
 
@@ -1,9 +1,30 @@
+from .settings import get_settings
 
-from solders.keypair import Keypair #type: ignore
-import os
-PRIV_KEY = os.getenv("KEY_PAIR")
-RPC = os.getenv("RPC_HTTPS_URL")
+# Compute unit limit and price (micro-lamports) used until the fee oracle has data
 UNIT_BUDGET =  100_000
 UNIT_PRICE =  100_000
-payer_keypair =  Keypair.from_base58_string(os.getenv("KEY_PAIR"))
-# payer_keypair = Keypair.from_base58_string(PRIV_KEY)
\ No newline at end of file
+
+# Environment-backed names resolve through get_settings() on first access,
+# so importing this module needs no secrets.
+_SETTINGS = {
+    "PRIV_KEY": "key_pair",
+    "RPC": "rpc_url",
+    "SEND_RPC_URLS": "send_rpc_urls",
+    "RECORD_PATH": "record_path",
+    "EVENT_STORE_DIR": "event_store_dir",
+    "LOG_LEVEL": "log_level",
+    "METRICS_PORT": "metrics_port",
+    "MIN_UNIT_PRICE": "min_unit_price",
+    "MAX_UNIT_PRICE": "max_unit_price",
+    "WALLET_POLICY": "wallet_policy",
+    "TRADER_PROCESSES": "trader_processes",
+    "payer_keypair": "payer_keypair",
+    "payer_keypairs": "payer_keypairs",
+}
+
+
+def __getattr__(name: str):
+    attribute = _SETTINGS.get(name)
+    if attribute is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(get_settings(), attribute)
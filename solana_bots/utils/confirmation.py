@@ -0,0 +1,170 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from solana.rpc.async_api import AsyncClient
+from solders.signature import Signature  # type: ignore
+from solders.transaction_status import TransactionConfirmationStatus  # type: ignore
+
+from .logsink import log
+from .metrics import registry, tracer
+from .subscriptions import Subscription, SubscriptionClient
+
+PROCESSED = "processed"
+CONFIRMED = "confirmed"
+# Landing slots remembered for recently confirmed signatures
+LANDED_SLOTS = 1024
+
+
+def _level(status: Optional[TransactionConfirmationStatus]) -> str:
+    if status == TransactionConfirmationStatus.Confirmed or status == TransactionConfirmationStatus.Finalized:
+        return CONFIRMED
+    return PROCESSED
+
+
+class _Pending:
+    __slots__ = ("signature", "operation", "trace", "started", "processed_at", "slot", "future", "subscriptions")
+
+    def __init__(self, signature: Signature, operation: str, future: asyncio.Future, trace: Optional[str] = None):
+        self.signature = signature
+        self.operation = operation
+        self.trace = trace
+        self.started = time.monotonic()
+        self.processed_at: Optional[float] = None
+        self.slot: Optional[int] = None
+        self.future = future
+        self.subscriptions: List[Subscription] = []
+
+
+class ConfirmationEngine:
+    """Resolves one future per in-flight signature.
+
+    ``signatureSubscribe`` at processed and confirmed commitment on the shared
+    subscription websocket is the fast path. Signatures still unresolved
+    after ``poll_after`` seconds are polled with batched
+    ``get_signature_statuses`` calls. A future resolves to True once the
+    transaction is confirmed without error, or to False if it failed.
+    ``slot`` then reports the slot a confirmed transaction landed in.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        subscriptions: SubscriptionClient,
+        poll_after: float = 1.0,
+        poll_interval: float = 0.5,
+        batch_size: int = 256,
+    ):
+        self.client = client
+        self.subscriptions = subscriptions
+        self.poll_after = poll_after
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._pending: Dict[Signature, _Pending] = {}
+        self._landed: "OrderedDict[Signature, int]" = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self.polls = registry.counter("confirm.status_polls")
+        self.timeouts = registry.counter("confirm.timeouts")
+
+    def __len__(self):
+        return len(self._pending)
+
+    def watch(self, signature: Signature, operation: str = "buy", trace: Optional[str] = None) -> asyncio.Future:
+        """``trace`` names the ``tracer`` key to mark processed/confirmed on."""
+        pending = self._pending.get(signature)
+        if pending is not None:
+            return pending.future
+        pending = self._pending[signature] = _Pending(
+            signature, operation, asyncio.get_running_loop().create_future(), trace
+        )
+        for level in (PROCESSED, CONFIRMED):
+            pending.subscriptions.append(self.subscriptions.subscribe(
+                "signatureSubscribe",
+                [str(signature), {"commitment": level}],
+                lambda result, level=level: self._on_notification(signature, level, result),
+                oneshot=True,
+            ))
+        self._wakeup.set()
+        return pending.future
+
+    async def wait(
+        self, signature: Signature, operation: str = "buy", timeout: float = 30.0, trace: Optional[str] = None
+    ) -> Optional[bool]:
+        """True if confirmed, False if the transaction failed, None on timeout."""
+        future = self.watch(signature, operation, trace)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts.inc()
+            pending = self._pending.get(signature)
+            if pending is not None:
+                self._resolve(pending, None)
+            return None
+
+    def slot(self, signature: Signature) -> Optional[int]:
+        """The slot ``signature`` landed in, if it confirmed recently."""
+        return self._landed.get(signature)
+
+    def discard(self, signature: Signature):
+        """Stop watching ``signature``; anyone waiting on it gets None."""
+        pending = self._pending.get(signature)
+        if pending is not None:
+            self._resolve(pending, None)
+
+    def _on_notification(self, signature: Signature, level: str, result: dict):
+        pending = self._pending.get(signature)
+        value = result.get("value")
+        if pending is None or not isinstance(value, dict):
+            return
+        self._mark(pending, level, value.get("err"), (result.get("context") or {}).get("slot"))
+
+    def _mark(self, pending: _Pending, level: str, err, slot: Optional[int] = None):
+        now = time.monotonic()
+        if slot is not None:
+            pending.slot = slot
+        if pending.processed_at is None:
+            pending.processed_at = now
+            registry.histogram(f"confirm.{pending.operation}.to_processed").record(now - pending.started)
+            tracer.mark(pending.trace, PROCESSED, now)
+        if err is not None:
+            self._resolve(pending, False)
+        elif level == CONFIRMED:
+            registry.histogram(f"confirm.{pending.operation}.to_confirmed").record(now - pending.started)
+            tracer.mark(pending.trace, CONFIRMED, now)
+            if pending.slot is not None:
+                self._landed[pending.signature] = pending.slot
+                if len(self._landed) > LANDED_SLOTS:
+                    self._landed.popitem(last=False)
+            self._resolve(pending, True)
+
+    def _resolve(self, pending: _Pending, result: Optional[bool]):
+        self._pending.pop(pending.signature, None)
+        for subscription in pending.subscriptions:
+            self.subscriptions.unsubscribe(subscription)
+        if not pending.future.done():
+            pending.future.set_result(result)
+
+    async def poll(self):
+        now = time.monotonic()
+        due = [p for p in self._pending.values() if now - p.started >= self.poll_after]
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start:start + self.batch_size]
+            self.polls.inc()
+            response = await self.client.get_signature_statuses([p.signature for p in batch])
+            for pending, status in zip(batch, response.value):
+                if status is None or pending.future.done():
+                    continue
+                level = _level(status.confirmation_status)
+                self._mark(pending, level, status.err, status.slot)
+
+    async def run(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll()
+            except Exception as e:
+                log.error(f"Error polling signature statuses: {e}")
@@ -8,6 +8,14 @@ ASSOC_TOKEN_ACC_PROG = Pubkey.from_string("ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNs
 RENT = Pubkey.from_string("SysvarRent111111111111111111111111111111111")
 EVENT_AUTHORITY = Pubkey.from_string("Ce6TQqeHC9p8KetsN6JsjHK7UTZk7nasjjnr7XxXp9F1")
 PUMP_FUN_PROGRAM = Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P")
+# pump.fun Global config every bonding curve starts from
+INITIAL_VIRTUAL_TOKEN_RESERVES = 1_073_000_000_000_000
+INITIAL_VIRTUAL_SOL_RESERVES = 30_000_000_000
+INITIAL_REAL_TOKEN_RESERVES = 793_100_000_000_000
+TOKEN_TOTAL_SUPPLY = 1_000_000_000_000_000
+# Trading fee charged on the SOL side of every buy and sell
+FEE_BASIS_POINTS = 100
+LAMPORTS_PER_SOL = 1_000_000_000
 request = {
     "jsonrpc": "2.0",
     "id": 1,
@@ -0,0 +1,168 @@
+import asyncio
+import base64
+import struct
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Processed
+from solders.pubkey import Pubkey  # type: ignore
+
+from .constants import (
+    INITIAL_REAL_TOKEN_RESERVES,
+    INITIAL_VIRTUAL_SOL_RESERVES,
+    INITIAL_VIRTUAL_TOKEN_RESERVES,
+    TOKEN_TOTAL_SUPPLY,
+)
+from .logsink import log
+from .metrics import registry
+from .subscriptions import Subscription, SubscriptionClient
+
+# 8-byte Anchor discriminator, five u64 reserves/supply fields, complete flag
+BONDING_CURVE_LAYOUT = struct.Struct("<8xQQQQQ?")
+
+
+@dataclass
+class CurveState:
+    virtual_token_reserves: int
+    virtual_sol_reserves: int
+    real_token_reserves: int
+    real_sol_reserves: int
+    token_total_supply: int
+    complete: bool
+    slot: int = 0
+    updated_at: float = 0.0
+    live: bool = False
+
+
+def decode_bonding_curve(data: bytes, slot: int = 0) -> CurveState:
+    fields = BONDING_CURVE_LAYOUT.unpack_from(data)
+    return CurveState(*fields, slot=slot, updated_at=time.monotonic())
+
+
+def launch_state(
+    slot: int = 0,
+    virtual_sol_reserves: int = INITIAL_VIRTUAL_SOL_RESERVES,
+    virtual_token_reserves: int = INITIAL_VIRTUAL_TOKEN_RESERVES,
+) -> CurveState:
+    """Curve state of a fresh launch, from the genesis constants or from the
+    reserves reported by the dev buy in the create transaction."""
+    sold = INITIAL_VIRTUAL_TOKEN_RESERVES - virtual_token_reserves
+    return CurveState(
+        virtual_token_reserves=virtual_token_reserves,
+        virtual_sol_reserves=virtual_sol_reserves,
+        real_token_reserves=INITIAL_REAL_TOKEN_RESERVES - sold,
+        real_sol_reserves=virtual_sol_reserves - INITIAL_VIRTUAL_SOL_RESERVES,
+        token_total_supply=TOKEN_TOTAL_SUPPLY,
+        complete=False,
+        slot=slot,
+        updated_at=time.monotonic(),
+    )
+
+
+class BondingCurveCache:
+    """In-memory bonding-curve reserves for held positions.
+
+    Tracked accounts are kept current with ``accountSubscribe`` on the
+    shared subscription websocket. While a subscription is live, reads are
+    served from memory (up to ``stale_after`` seconds without a push);
+    otherwise entries fall back to an RPC poll reused for ``ttl`` seconds.
+    Every state stored is passed to each of ``listeners``.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        subscriptions: SubscriptionClient,
+        ttl: float = 1.0,
+        stale_after: float = 30.0,
+    ):
+        self.client = client
+        self.subscriptions = subscriptions
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self.entries: Dict[Pubkey, CurveState] = {}
+        self.tracked: Dict[Pubkey, Subscription] = {}
+        self.listeners: List[Callable[[Pubkey, CurveState], None]] = []
+        self.hits = registry.counter("curve_cache.hits")
+        self.polls = registry.counter("curve_cache.polls")
+        self.pushes = registry.counter("curve_cache.pushes")
+
+    def track(self, bonding_curve: Pubkey, state: Optional[CurveState] = None):
+        if state is not None:
+            self._store(bonding_curve, state)
+        if bonding_curve in self.tracked:
+            return
+        self.tracked[bonding_curve] = self.subscriptions.subscribe(
+            "accountSubscribe",
+            [str(bonding_curve), {"encoding": "base64", "commitment": "processed"}],
+            partial(self._on_update, bonding_curve),
+            on_subscribed=partial(self._on_subscribed, bonding_curve),
+        )
+
+    def evict(self, bonding_curve: Pubkey):
+        self.entries.pop(bonding_curve, None)
+        subscription = self.tracked.pop(bonding_curve, None)
+        if subscription is not None:
+            self.subscriptions.unsubscribe(subscription)
+
+    def _is_live(self, bonding_curve: Pubkey) -> bool:
+        subscription = self.tracked.get(bonding_curve)
+        return subscription is not None and subscription.active
+
+    def _store(self, bonding_curve: Pubkey, state: CurveState) -> CurveState:
+        current = self.entries.get(bonding_curve)
+        if current is not None and state.slot < current.slot:
+            return current
+        self.entries[bonding_curve] = state
+        for listener in self.listeners:
+            listener(bonding_curve, state)
+        return state
+
+    def peek(self, bonding_curve: Pubkey) -> Optional[CurveState]:
+        """Return the cached state if it can be trusted without an RPC call."""
+        state = self.entries.get(bonding_curve)
+        if state is None:
+            return None
+        age = time.monotonic() - state.updated_at
+        if state.live and self._is_live(bonding_curve) and age < self.stale_after:
+            return state
+        if age < self.ttl:
+            return state
+        return None
+
+    async def get(self, bonding_curve: Pubkey) -> Optional[CurveState]:
+        state = self.peek(bonding_curve)
+        if state is not None:
+            self.hits.inc()
+            return state
+        return await self.poll(bonding_curve)
+
+    async def poll(self, bonding_curve: Pubkey) -> Optional[CurveState]:
+        self.polls.inc()
+        response = await self.client.get_account_info(bonding_curve, commitment=Processed)
+        if response.value is None:
+            return None
+        state = decode_bonding_curve(response.value.data, response.context.slot)
+        if bonding_curve not in self.tracked:
+            return state
+        # Polled after the subscription was confirmed, so later changes are pushed
+        state.live = self._is_live(bonding_curve)
+        return self._store(bonding_curve, state)
+
+    def _on_update(self, bonding_curve: Pubkey, result: dict):
+        state = decode_bonding_curve(base64.b64decode(result["value"]["data"][0]), result["context"]["slot"])
+        state.live = True
+        self._store(bonding_curve, state)
+        self.pushes.inc()
+
+    def _on_subscribed(self, bonding_curve: Pubkey):
+        asyncio.create_task(self._prime(bonding_curve))
+
+    async def _prime(self, bonding_curve: Pubkey):
+        try:
+            await self.poll(bonding_curve)
+        except Exception as e:
+            log.error(f"Error priming bonding curve {bonding_curve}: {e}")
@@ -0,0 +1,157 @@
+"""Exact pump.fun bonding-curve quotes in lamports and token base units.
+
+The scalar functions mirror the program's u64/u128 integer math, fee
+included. The ``*_batch`` functions price whole NumPy arrays at once
+(broadcasting sizes against curves) and return int64 arrays with the same
+results as the scalar functions.
+"""
+from typing import Optional, Tuple
+
+from .constants import FEE_BASIS_POINTS
+
+BPS = 10_000
+# Returned by buy_cost_batch for sizes the curve cannot fill
+UNFILLABLE = (1 << 63) - 1
+
+
+def fee(lamports: int, fee_bps: int = FEE_BASIS_POINTS) -> int:
+    return lamports * fee_bps // BPS
+
+
+def buy_cost(amount: int, virtual_sol: int, virtual_token: int, fee_bps: int = FEE_BASIS_POINTS) -> int:
+    """Lamports charged, fee included, for buying ``amount`` tokens."""
+    if amount <= 0:
+        return 0
+    if amount >= virtual_token:
+        raise ValueError("amount exceeds virtual token reserves")
+    sol_cost = amount * virtual_sol // (virtual_token - amount) + 1
+    return sol_cost + fee(sol_cost, fee_bps)
+
+
+def sell_proceeds(amount: int, virtual_sol: int, virtual_token: int, fee_bps: int = FEE_BASIS_POINTS) -> int:
+    """Lamports received, after fee, for selling ``amount`` tokens."""
+    if amount <= 0:
+        return 0
+    sol_output = amount * virtual_sol // (virtual_token + amount)
+    return sol_output - fee(sol_output, fee_bps)
+
+
+def _max_sol_cost(sol_in: int, fee_bps: int) -> int:
+    # Largest pre-fee cost c with c + fee(c) <= sol_in
+    cost = sol_in * BPS // (BPS + fee_bps)
+    while cost + 1 + fee(cost + 1, fee_bps) <= sol_in:
+        cost += 1
+    return cost
+
+
+def tokens_for_sol(
+    sol_in: int,
+    virtual_sol: int,
+    virtual_token: int,
+    real_token: Optional[int] = None,
+    fee_bps: int = FEE_BASIS_POINTS,
+) -> int:
+    """Largest token amount whose ``buy_cost`` fits in ``sol_in`` lamports,
+    capped at ``real_token`` when given."""
+    cost = _max_sol_cost(sol_in, fee_bps)
+    if cost <= 0:
+        return 0
+    # a * vsr // (vtr - a) + 1 <= cost  <=>  a * (vsr + cost) < cost * vtr
+    amount = (cost * virtual_token - 1) // (virtual_sol + cost)
+    if real_token is not None:
+        amount = min(amount, real_token)
+    return amount
+
+
+def apply_buy(amount: int, virtual_sol: int, virtual_token: int) -> Tuple[int, int]:
+    """Virtual reserves after a buy of ``amount`` tokens (the fee goes to the
+    fee recipient, not the curve)."""
+    sol_cost = buy_cost(amount, virtual_sol, virtual_token, fee_bps=0)
+    return virtual_sol + sol_cost, virtual_token - amount
+
+
+def apply_sell(amount: int, virtual_sol: int, virtual_token: int) -> Tuple[int, int]:
+    sol_output = sell_proceeds(amount, virtual_sol, virtual_token, fee_bps=0)
+    return virtual_sol - sol_output, virtual_token + amount
+
+
+def max_cost(lamports: int, slippage_bps: int) -> int:
+    return lamports * (BPS + slippage_bps) // BPS
+
+
+def min_output(lamports: int, slippage_bps: int) -> int:
+    return lamports * (BPS - slippage_bps) // BPS
+
+
+def _numpy():
+    import numpy
+
+    return numpy
+
+
+def _mul_div(a, b, d):
+    """Exact ``a * b // d`` and remainder, elementwise, for non-negative
+    int64-range arrays.
+
+    The quotient is estimated in float64 and corrected with the remainder,
+    which is computed exactly in wrapping 64-bit arithmetic. This is exact
+    while the estimate is off by less than 2**63 / d, which holds for every
+    reserve and size a bonding curve can reach.
+    """
+    np = _numpy()
+    a, b, d = np.broadcast_arrays(*(np.asarray(x, dtype=np.uint64) for x in (a, b, d)))
+    estimate = np.floor(a.astype(np.float64) * b.astype(np.float64) / d.astype(np.float64))
+    q = np.minimum(estimate, 2.0 ** 63).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        r = (a * b - q * d).view(np.int64)
+    d = d.view(np.int64)
+    return q.view(np.int64) + r // d, r % d
+
+
+def buy_cost_batch(amounts, virtual_sol, virtual_token, fee_bps: int = FEE_BASIS_POINTS):
+    np = _numpy()
+    amounts, virtual_sol, virtual_token = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.int64) for x in (amounts, virtual_sol, virtual_token))
+    )
+    fillable = amounts < virtual_token
+    remaining = np.where(fillable, virtual_token - amounts, 1)
+    sol_cost = _mul_div(amounts, virtual_sol, remaining)[0] + 1
+    total = sol_cost + sol_cost * fee_bps // BPS
+    return np.where(amounts <= 0, 0, np.where(fillable, total, UNFILLABLE))
+
+
+def sell_proceeds_batch(amounts, virtual_sol, virtual_token, fee_bps: int = FEE_BASIS_POINTS):
+    np = _numpy()
+    amounts = np.maximum(np.asarray(amounts, dtype=np.int64), 0)
+    sol_output = _mul_div(amounts, virtual_sol, np.asarray(virtual_token, dtype=np.int64) + amounts)[0]
+    return sol_output - sol_output * fee_bps // BPS
+
+
+def tokens_for_sol_batch(sol_in, virtual_sol, virtual_token, real_token=None, fee_bps: int = FEE_BASIS_POINTS):
+    np = _numpy()
+    sol_in = np.asarray(sol_in, dtype=np.int64)
+    cost = sol_in * BPS // (BPS + fee_bps)
+    cost += (cost + 1 + (cost + 1) * fee_bps // BPS <= sol_in)
+    cost = np.maximum(cost, 0)
+    quotient, remainder = _mul_div(cost, virtual_token, np.asarray(virtual_sol, dtype=np.int64) + cost)
+    # (cost * vtr - 1) // (vsr + cost)
+    amounts = np.where(cost > 0, quotient - (remainder == 0), 0)
+    if real_token is not None:
+        amounts = np.minimum(amounts, np.asarray(real_token, dtype=np.int64))
+    return amounts
+
+
+def quote_grid(sizes, virtual_sol, virtual_token, real_token=None, fee_bps: int = FEE_BASIS_POINTS):
+    """Tokens received and lamports charged for every SOL size on every curve.
+
+    ``sizes`` is a vector of lamport amounts and the reserves are vectors
+    over curves; both results have shape ``(len(curves), len(sizes))``.
+    """
+    np = _numpy()
+    sizes = np.asarray(sizes, dtype=np.int64)[None, :]
+    virtual_sol = np.asarray(virtual_sol, dtype=np.int64)[:, None]
+    virtual_token = np.asarray(virtual_token, dtype=np.int64)[:, None]
+    if real_token is not None:
+        real_token = np.asarray(real_token, dtype=np.int64)[:, None]
+    tokens = tokens_for_sol_batch(sizes, virtual_sol, virtual_token, real_token, fee_bps)
+    return tokens, buy_cost_batch(tokens, virtual_sol, virtual_token, fee_bps)
@@ -0,0 +1,112 @@
+"""Run the whole bot against local stand-ins, with throwaway wallets.
+
+    python -m solana_bots --dry-run [--launches N] [--rate R] [--duration S] [--processes K]
+
+A ``WebsocketStandIn`` streams ``launches`` synthetic create frames at
+``rate`` per second and a ``JsonRpcStandIn`` accepts every transaction
+and reports it confirmed. ``main()`` runs unchanged on top of them for
+``duration`` seconds. Reports how long it took from calling ``main()`` to
+the first transaction reaching the RPC, and the RPC calls made.
+"""
+import asyncio
+import base64
+import time
+from typing import Optional
+
+from solders.keypair import Keypair  # type: ignore
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from .constants import PUMP_FUN_PROGRAM
+from .curve_cache import BONDING_CURVE_LAYOUT, launch_state
+from .metrics import registry
+from .settings import Settings, configure
+from .standins import JsonRpcStandIn, WebsocketStandIn, launch_frame
+
+_SYSTEM_PROGRAM = "11111111111111111111111111111111"
+
+
+class DryRunRpc(JsonRpcStandIn):
+    """Accepts every transaction and funds the dry-run wallets. Any other
+    account read is answered with a freshly launched bonding curve, so
+    positions can be priced and sold. Extra keyword arguments (latency,
+    failure rates) go to ``JsonRpcStandIn``."""
+
+    def __init__(self, wallets, balance: int = 10 * 10**9, **options):
+        self.wallets = {str(keypair.pubkey()) for keypair in wallets}
+        self.balance = balance
+        self.sends = 0
+        self.first_send: Optional[float] = None
+        state = launch_state()
+        self.curve_data = base64.b64encode(BONDING_CURVE_LAYOUT.pack(
+            state.virtual_token_reserves, state.virtual_sol_reserves, state.real_token_reserves,
+            state.real_sol_reserves, state.token_total_supply, state.complete,
+        )).decode()
+        super().__init__({
+            "sendTransaction": self.send,
+            "getRecentPrioritizationFees": lambda params: [],
+            "getTransaction": lambda params: None,
+            "getAccountInfo": lambda params: self.context(self.curve()),
+            "getMultipleAccounts": lambda params: self.context([self.account(key) for key in params[0]]),
+        }, **options)
+
+    def send(self, params) -> str:
+        txn = VersionedTransaction.from_bytes(base64.b64decode(params[0]))
+        self.sends += 1
+        if self.first_send is None:
+            self.first_send = time.monotonic()
+        return str(txn.signatures[0])
+
+    def curve(self) -> dict:
+        return {
+            "lamports": 1_000_000, "owner": str(PUMP_FUN_PROGRAM), "data": [self.curve_data, "base64"],
+            "executable": False, "rentEpoch": 0, "space": BONDING_CURVE_LAYOUT.size,
+        }
+
+    def account(self, key: str) -> Optional[dict]:
+        if key not in self.wallets:
+            return None
+        return {
+            "lamports": self.balance, "owner": _SYSTEM_PROGRAM, "data": ["", "base64"],
+            "executable": False, "rentEpoch": 0, "space": 0,
+        }
+
+
+async def dry_run(
+    launches: int = 5,
+    rate: float = 2.0,
+    duration: float = 5.0,
+    processes: int = 0,
+    log_level: str = "info",
+) -> dict:
+    from .main import main
+
+    wallets = [Keypair() for _ in range(max(1, processes))]
+    rpc = await DryRunRpc(wallets).start()
+    websocket = await WebsocketStandIn([launch_frame(300_000_000 + i, i) for i in range(launches)], rate=rate).start()
+    configure(Settings(
+        rpc_url=rpc.url,
+        wss_urls=[websocket.url],
+        key_pair=str(wallets[0]),
+        extra_key_pairs=[str(keypair) for keypair in wallets[1:]],
+        log_level=log_level,
+        trader_processes=processes,
+    ))
+    started = time.monotonic()
+    bot = asyncio.create_task(main())
+    try:
+        await asyncio.wait((bot,), timeout=duration)
+    finally:
+        bot.cancel()
+        await asyncio.gather(bot, return_exceptions=True)
+        await websocket.close()
+        await rpc.close()
+
+    sent = registry.histogram("trace.sent")
+    return {
+        "launches": launches,
+        "frames_sent": websocket.cursor,
+        "first_send_ms": (rpc.first_send - started) * 1e3 if rpc.first_send is not None else None,
+        "transactions": rpc.sends,
+        "detection_to_send": sent.summary() if sent.count else None,
+        "rpc_requests": dict(sorted(rpc.requests.items())),
+    }
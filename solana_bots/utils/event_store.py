@@ -0,0 +1,339 @@
+import bisect
+import glob
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from solders.pubkey import Pubkey  # type: ignore
+
+from .events import CreateEvent, TradeEvent
+from .logsink import log
+from .metrics import registry
+
+LAUNCH_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("slot", "<u8"),
+    ("mint", "V32"),
+    ("bonding_curve", "V32"),
+    ("creator", "V32"),
+])
+TRADE_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("slot", "<u8"),
+    ("mint", "V32"),
+    ("user", "V32"),
+    ("sol_amount", "<u8"),
+    ("token_amount", "<u8"),
+    ("is_buy", "?"),
+    ("block_time", "<i8"),
+    ("virtual_sol_reserves", "<u8"),
+    ("virtual_token_reserves", "<u8"),
+])
+LAUNCHES = "launches"
+TRADES = "trades"
+_DTYPES = {LAUNCHES: LAUNCH_DTYPE, TRADES: TRADE_DTYPE}
+_STOP = object()
+# Rows drained from the queue per write
+_WRITE_BATCH = 4096
+
+
+class _Segment:
+    """One fixed-capacity ``.npy`` file, memory-mapped. Unwritten rows have
+    a zero timestamp."""
+
+    __slots__ = ("path", "rows", "count")
+
+    def __init__(self, path: str, dtype: np.dtype, capacity: int):
+        if os.path.exists(path):
+            self.rows = open_memmap(path, mode="r+")
+            empty = np.flatnonzero(self.rows["timestamp"] == 0)
+            self.count = int(empty[0]) if len(empty) else len(self.rows)
+        else:
+            self.rows = open_memmap(path, mode="w+", dtype=dtype, shape=(capacity,))
+            self.count = 0
+        self.path = path
+
+    @property
+    def full(self) -> bool:
+        return self.count >= len(self.rows)
+
+
+class _SegmentWriter:
+    """Rolling segments for one event kind, written only by the store's thread."""
+
+    def __init__(self, directory: str, kind: str, capacity: int, max_segments: Optional[int]):
+        self.directory = directory
+        self.kind = kind
+        self.dtype = _DTYPES[kind]
+        self.capacity = capacity
+        self.max_segments = max_segments
+        paths = segment_paths(directory, kind)
+        self.next_index = int(paths[-1].rsplit("-", 1)[1].split(".")[0]) + 1 if paths else 1
+        self.segment = _Segment(paths[-1], self.dtype, capacity) if paths else self._roll()
+
+    def _roll(self) -> _Segment:
+        path = os.path.join(self.directory, f"{self.kind}-{self.next_index:06d}.npy")
+        self.next_index += 1
+        segment = _Segment(path, self.dtype, self.capacity)
+        if self.max_segments:
+            for old in segment_paths(self.directory, self.kind)[:-self.max_segments]:
+                os.remove(old)
+        return segment
+
+    def extend(self, rows: List[tuple]):
+        start = 0
+        while start < len(rows):
+            if self.segment.full:
+                self.segment.rows.flush()
+                self.segment = self._roll()
+            segment = self.segment
+            count = min(len(rows) - start, len(segment.rows) - segment.count)
+            segment.rows[segment.count:segment.count + count] = np.array(rows[start:start + count], dtype=self.dtype)
+            segment.count += count
+            start += count
+
+    def flush(self):
+        self.segment.rows.flush()
+
+
+def segment_paths(directory: str, kind: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, f"{kind}-*.npy")))
+
+
+def load_segments(directory: str, kind: str) -> np.ndarray:
+    """All written rows of ``kind``, oldest first, for offline analysis."""
+    parts = []
+    for path in segment_paths(directory, kind):
+        rows = np.load(path, mmap_mode="r")
+        parts.append(rows[rows["timestamp"] != 0])
+    return np.concatenate(parts) if parts else np.empty(0, dtype=_DTYPES[kind])
+
+
+class _Launch:
+    __slots__ = ("timestamp", "slot", "bonding_curve", "creator")
+
+    def __init__(self, timestamp: float, slot: int, bonding_curve: Pubkey, creator: Pubkey):
+        self.timestamp = timestamp
+        self.slot = slot
+        self.bonding_curve = bonding_curve
+        self.creator = creator
+
+
+class _CurveActivity:
+    """Trades on one curve, with running totals so window sums are two bisects."""
+
+    __slots__ = ("slots", "volume", "buys", "last_seen")
+
+    def __init__(self):
+        self.slots: List[int] = []
+        self.volume: List[int] = [0]
+        self.buys: List[int] = [0]
+        self.last_seen = 0.0
+
+    def add(self, slot: int, sol_amount: int, is_buy: bool, timestamp: float):
+        if self.slots and slot < self.slots[-1]:
+            slot = self.slots[-1]
+        self.slots.append(slot)
+        self.volume.append(self.volume[-1] + sol_amount)
+        self.buys.append(self.buys[-1] + is_buy)
+        self.last_seen = timestamp
+
+    def since(self, slot: int) -> int:
+        return bisect.bisect_left(self.slots, slot)
+
+
+class EventStore:
+    """Append-only store of every launch and trade the streamer decodes.
+
+    Rows go to fixed-width NumPy structured arrays in memory-mapped ``.npy``
+    segments that roll every ``capacity`` rows (keeping at most
+    ``max_segments`` per kind). Appends only touch the in-memory indexes and
+    a queue; a background thread does the file writes, so the event loop
+    never waits on disk. Queries are answered from the indexes by mint and
+    by creator, which cover the last ``index_window`` seconds.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        capacity: int = 1 << 16,
+        max_segments: Optional[int] = None,
+        index_window: float = 24 * 3600.0,
+        flush_interval: float = 1.0,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.index_window = index_window
+        self.flush_interval = flush_interval
+        self.launches: Dict[Pubkey, _Launch] = {}
+        self.creators: Dict[Pubkey, List[Tuple[float, Pubkey]]] = {}
+        self.curves: Dict[Pubkey, _CurveActivity] = {}
+        self._writers = {kind: _SegmentWriter(directory, kind, capacity, max_segments) for kind in _DTYPES}
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._appended = 0
+        self.written = registry.counter("event_store.rows_written")
+        self.write_errors = registry.counter("event_store.write_errors")
+        self._load()
+        self._thread = threading.Thread(target=self._write_loop, name="event-store", daemon=True)
+        self._thread.start()
+
+    # -- writes ---------------------------------------------------------
+
+    def append_launch(self, event: CreateEvent, slot: int = 0, timestamp: Optional[float] = None):
+        timestamp = timestamp or time.time()
+        self._index_launch(timestamp, slot, event.mint, event.bonding_curve, event.user)
+        self._queue.put((LAUNCHES, (timestamp, slot, bytes(event.mint), bytes(event.bonding_curve), bytes(event.user))))
+
+    def append_trade(self, trade: TradeEvent, slot: int = 0, timestamp: Optional[float] = None):
+        timestamp = timestamp or time.time()
+        self._index_trade(timestamp, slot, trade.mint, trade.sol_amount, trade.is_buy)
+        self._queue.put((TRADES, (
+            timestamp, slot, bytes(trade.mint), bytes(trade.user), trade.sol_amount, trade.token_amount,
+            trade.is_buy, trade.timestamp, trade.virtual_sol_reserves, trade.virtual_token_reserves,
+        )))
+
+    def _index_launch(self, timestamp: float, slot: int, mint: Pubkey, bonding_curve: Pubkey, creator: Pubkey):
+        self.launches[mint] = _Launch(timestamp, slot, bonding_curve, creator)
+        launches = self.creators.get(creator)
+        if launches is None:
+            launches = self.creators[creator] = []
+        if launches and timestamp < launches[-1][0]:
+            # Keep each creator's launches sorted for bisect
+            launches.insert(bisect.bisect_left(launches, (timestamp,)), (timestamp, mint))
+        else:
+            launches.append((timestamp, mint))
+        self._tick(timestamp)
+
+    def _index_trade(self, timestamp: float, slot: int, mint: Pubkey, sol_amount: int, is_buy: bool):
+        activity = self.curves.get(mint)
+        if activity is None:
+            activity = self.curves[mint] = _CurveActivity()
+        activity.add(slot, sol_amount, is_buy, timestamp)
+        self._tick(timestamp)
+
+    def _tick(self, now: float):
+        self._appended += 1
+        if self._appended % 16_384 == 0:
+            self.prune(now)
+
+    def prune(self, now: Optional[float] = None):
+        """Drop index entries older than ``index_window``; segments keep them."""
+        cutoff = (now or time.time()) - self.index_window
+        for creator in list(self.creators):
+            launches = self.creators[creator]
+            keep = bisect.bisect_left(launches, (cutoff,))
+            if keep == len(launches):
+                del self.creators[creator]
+            elif keep:
+                del launches[:keep]
+        for mint in [m for m, launch in self.launches.items() if launch.timestamp < cutoff]:
+            del self.launches[mint]
+        for mint in [m for m, activity in self.curves.items() if activity.last_seen < cutoff]:
+            del self.curves[mint]
+
+    # -- queries --------------------------------------------------------
+
+    def creator_launches(self, creator: Pubkey, window: float = 3600.0, now: Optional[float] = None) -> int:
+        """How many tokens ``creator`` launched in the last ``window`` seconds."""
+        launches = self.creators.get(creator)
+        if not launches:
+            return 0
+        return len(launches) - bisect.bisect_left(launches, ((now or time.time()) - window,))
+
+    def launch(self, mint: Pubkey) -> Optional[_Launch]:
+        return self.launches.get(mint)
+
+    def curve_volume(self, mint: Pubkey, slots: int, current_slot: Optional[int] = None) -> int:
+        """SOL volume in lamports on ``mint``'s curve over the last ``slots`` slots."""
+        activity = self.curves.get(mint)
+        if activity is None or not activity.slots:
+            return 0
+        current = activity.slots[-1] if current_slot is None else current_slot
+        return activity.volume[-1] - activity.volume[activity.since(current - slots + 1)]
+
+    def curve_trades(self, mint: Pubkey, slots: int, current_slot: Optional[int] = None) -> Tuple[int, int]:
+        """(buys, sells) on ``mint``'s curve over the last ``slots`` slots."""
+        activity = self.curves.get(mint)
+        if activity is None or not activity.slots:
+            return 0, 0
+        current = activity.slots[-1] if current_slot is None else current_slot
+        start = activity.since(current - slots + 1)
+        total = len(activity.slots) - start
+        buys = activity.buys[-1] - activity.buys[start]
+        return buys, total - buys
+
+    # -- persistence ----------------------------------------------------
+
+    def _load(self):
+        cutoff = time.time() - self.index_window
+        keys: Dict[bytes, Pubkey] = {}
+
+        def key(raw: bytes) -> Pubkey:
+            pubkey = keys.get(raw)
+            if pubkey is None:
+                pubkey = keys[raw] = Pubkey(raw)
+            return pubkey
+
+        rows = load_segments(self.directory, LAUNCHES)
+        rows = rows[rows["timestamp"] >= cutoff]
+        columns = (rows[name].tolist() for name in ("timestamp", "slot", "mint", "bonding_curve", "creator"))
+        for timestamp, slot, mint, bonding_curve, creator in zip(*columns):
+            self._index_launch(timestamp, slot, key(mint), Pubkey(bonding_curve), key(creator))
+        rows = load_segments(self.directory, TRADES)
+        rows = rows[rows["timestamp"] >= cutoff]
+        columns = (rows[name].tolist() for name in ("timestamp", "slot", "mint", "sol_amount", "is_buy"))
+        for timestamp, slot, mint, sol_amount, is_buy in zip(*columns):
+            self._index_trade(timestamp, slot, key(mint), sol_amount, is_buy)
+
+    def _write_loop(self):
+        last_flush = time.monotonic()
+        running = True
+        while running:
+            batches: Dict[str, List[tuple]] = {LAUNCHES: [], TRADES: []}
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                for drained in range(1, _WRITE_BATCH + 1):
+                    if item is _STOP:
+                        running = False
+                        break
+                    batches[item[0]].append(item[1])
+                    if drained < _WRITE_BATCH:
+                        item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            for kind, rows in batches.items():
+                if not rows:
+                    continue
+                try:
+                    self._writers[kind].extend(rows)
+                    self.written.inc(len(rows))
+                except Exception as e:
+                    self.write_errors.inc(len(rows))
+                    log.error(f"Error writing {len(rows)} {kind} rows: {e}")
+            if not running or time.monotonic() - last_flush >= self.flush_interval:
+                self._flush()
+                last_flush = time.monotonic()
+
+    def _flush(self):
+        for writer in self._writers.values():
+            writer.flush()
+
+    def stats(self) -> dict:
+        return {
+            "written": self.written.value,
+            "pending": self._queue.qsize(),
+            "write_errors": self.write_errors.value,
+            "indexed_launches": len(self.launches),
+            "indexed_creators": len(self.creators),
+            "indexed_curves": len(self.curves),
+        }
+
+    def close(self):
+        """Write everything queued so far and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
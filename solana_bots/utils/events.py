@@ -0,0 +1,193 @@
+import base64
+import binascii
+import struct
+from typing import List, Optional, Union
+from solders.pubkey import Pubkey  # type: ignore
+
+PROGRAM_DATA_PREFIX = "Program data: "
+
+# Anchor event discriminators: sha256("event:<Name>")[:8]
+CREATE_EVENT_DISCRIMINATOR = bytes.fromhex("1b72a94ddeeb6376")
+TRADE_EVENT_DISCRIMINATOR = bytes.fromhex("bddb7fd34ee661ee")
+
+# Eight base64 characters encode exactly six bytes, so the event type can be
+# told apart from the raw log text before anything is decoded.
+CREATE_EVENT_B64_PREFIX = base64.b64encode(CREATE_EVENT_DISCRIMINATOR[:6]).decode()
+TRADE_EVENT_B64_PREFIX = base64.b64encode(TRADE_EVENT_DISCRIMINATOR[:6]).decode()
+
+_TRADE_LOG_MARKER = PROGRAM_DATA_PREFIX + TRADE_EVENT_B64_PREFIX
+
+_DISCRIMINATOR_LEN = 8
+_U32 = struct.Struct("<I")
+_CREATE_KEYS = struct.Struct("<32s32s32s")
+# mint, solAmount, tokenAmount, isBuy, user, timestamp, virtualSolReserves, virtualTokenReserves
+_TRADE = struct.Struct("<32sQQ?32sqQQ")
+
+
+class CreateEvent:
+    __slots__ = ("name", "symbol", "uri", "mint", "bonding_curve", "user")
+
+    def __init__(self, name: str, symbol: str, uri: str, mint: Pubkey, bonding_curve: Pubkey, user: Pubkey):
+        self.name = name
+        self.symbol = symbol
+        self.uri = uri
+        self.mint = mint
+        self.bonding_curve = bonding_curve
+        self.user = user
+
+    def __repr__(self):
+        return f"CreateEvent(name={self.name!r}, symbol={self.symbol!r}, mint={self.mint}, bonding_curve={self.bonding_curve}, user={self.user})"
+
+
+class TradeEvent:
+    __slots__ = (
+        "mint",
+        "sol_amount",
+        "token_amount",
+        "is_buy",
+        "user",
+        "timestamp",
+        "virtual_sol_reserves",
+        "virtual_token_reserves",
+    )
+
+    def __init__(
+        self,
+        mint: Pubkey,
+        sol_amount: int,
+        token_amount: int,
+        is_buy: bool,
+        user: Pubkey,
+        timestamp: int,
+        virtual_sol_reserves: int,
+        virtual_token_reserves: int,
+    ):
+        self.mint = mint
+        self.sol_amount = sol_amount
+        self.token_amount = token_amount
+        self.is_buy = is_buy
+        self.user = user
+        self.timestamp = timestamp
+        self.virtual_sol_reserves = virtual_sol_reserves
+        self.virtual_token_reserves = virtual_token_reserves
+
+    def __repr__(self):
+        side = "buy" if self.is_buy else "sell"
+        return f"TradeEvent({side}, mint={self.mint}, sol_amount={self.sol_amount}, token_amount={self.token_amount}, user={self.user})"
+
+
+def _read_string(view: memoryview, offset: int):
+    (length,) = _U32.unpack_from(view, offset)
+    offset += 4
+    end = offset + length
+    if end > len(view):
+        raise ValueError("string runs past end of event data")
+    return str(view[offset:end], "utf-8"), end
+
+
+def decode_create_event(data: bytes) -> Optional[CreateEvent]:
+    """Decode a raw CreateEvent payload, or return None for any other event."""
+    if data[:_DISCRIMINATOR_LEN] != CREATE_EVENT_DISCRIMINATOR:
+        return None
+    view = memoryview(data)
+    name, offset = _read_string(view, _DISCRIMINATOR_LEN)
+    symbol, offset = _read_string(view, offset)
+    uri, offset = _read_string(view, offset)
+    mint, bonding_curve, user = _CREATE_KEYS.unpack_from(view, offset)
+    return CreateEvent(name, symbol, uri, Pubkey(mint), Pubkey(bonding_curve), Pubkey(user))
+
+
+def decode_trade_event(data: bytes) -> Optional[TradeEvent]:
+    """Decode a raw TradeEvent payload, or return None for any other event."""
+    if data[:_DISCRIMINATOR_LEN] != TRADE_EVENT_DISCRIMINATOR:
+        return None
+    mint, sol_amount, token_amount, is_buy, user, timestamp, v_sol, v_token = _TRADE.unpack_from(data, _DISCRIMINATOR_LEN)
+    return TradeEvent(Pubkey(mint), sol_amount, token_amount, is_buy, Pubkey(user), timestamp, v_sol, v_token)
+
+
+def _payload(log: str) -> str:
+    if log.startswith(PROGRAM_DATA_PREFIX):
+        return log[len(PROGRAM_DATA_PREFIX):]
+    return log
+
+
+def decode_create_log(log: str) -> Optional[CreateEvent]:
+    """Decode a ``Program data:`` log line if it carries a CreateEvent.
+
+    Non-create events are rejected on their base64 prefix, before decoding.
+    """
+    payload = _payload(log)
+    if not payload.startswith(CREATE_EVENT_B64_PREFIX):
+        return None
+    try:
+        return decode_create_event(base64.b64decode(payload))
+    except (binascii.Error, struct.error, ValueError):
+        return None
+
+
+def decode_trade_log(log: str) -> Optional[TradeEvent]:
+    """Decode a ``Program data:`` log line if it carries a TradeEvent."""
+    payload = _payload(log)
+    if not payload.startswith(TRADE_EVENT_B64_PREFIX):
+        return None
+    try:
+        return decode_trade_event(base64.b64decode(payload))
+    except (binascii.Error, struct.error, ValueError):
+        return None
+
+
+def scan_trade_events(frame: Union[str, bytes]) -> List[TradeEvent]:
+    """Decode every TradeEvent in a raw logsNotification frame without
+    parsing the JSON. Base64 never contains quotes or escapes, so each
+    payload runs to the next double quote."""
+    if isinstance(frame, (bytes, bytearray)):
+        frame = frame.decode()
+    events = []
+    start = frame.find(_TRADE_LOG_MARKER)
+    while start >= 0:
+        start += len(PROGRAM_DATA_PREFIX)
+        end = frame.find('"', start)
+        if end < 0:
+            break
+        event = decode_trade_log(frame[start:end])
+        if event is not None:
+            events.append(event)
+        start = frame.find(_TRADE_LOG_MARKER, end)
+    return events
+
+
+def decode_event_log(log: str) -> Optional[Union[CreateEvent, TradeEvent]]:
+    """Decode any known pump.fun event from a ``Program data:`` log line."""
+    payload = _payload(log)
+    if payload.startswith(CREATE_EVENT_B64_PREFIX):
+        return decode_create_log(payload)
+    if payload.startswith(TRADE_EVENT_B64_PREFIX):
+        return decode_trade_log(payload)
+    return None
+
+
+def encode_create_event(name: str, symbol: str, uri: str, mint: Pubkey, bonding_curve: Pubkey, user: Pubkey) -> bytes:
+    """Build a raw CreateEvent payload. Used by benchmarks and replays."""
+    data = bytearray(CREATE_EVENT_DISCRIMINATOR)
+    for value in (name, symbol, uri):
+        raw = value.encode()
+        data.extend(_U32.pack(len(raw)))
+        data.extend(raw)
+    data.extend(_CREATE_KEYS.pack(bytes(mint), bytes(bonding_curve), bytes(user)))
+    return bytes(data)
+
+
+def encode_trade_event(
+    mint: Pubkey,
+    sol_amount: int,
+    token_amount: int,
+    is_buy: bool,
+    user: Pubkey,
+    timestamp: int,
+    virtual_sol_reserves: int,
+    virtual_token_reserves: int,
+) -> bytes:
+    """Build a raw TradeEvent payload. Used by benchmarks and replays."""
+    return TRADE_EVENT_DISCRIMINATOR + _TRADE.pack(
+        bytes(mint), sol_amount, token_amount, is_buy, bytes(user), timestamp, virtual_sol_reserves, virtual_token_reserves
+    )
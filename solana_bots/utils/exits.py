@@ -0,0 +1,287 @@
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from solders.pubkey import Pubkey  # type: ignore
+
+from . import curve_math
+from .logsink import log
+from .metrics import registry
+
+if TYPE_CHECKING:
+    from .curve_cache import CurveState
+    from .settings import Settings
+
+TAKE_PROFIT = "take_profit"
+STOP_LOSS = "stop_loss"
+TRAILING_STOP = "trailing_stop"
+REASONS = (TAKE_PROFIT, STOP_LOSS, TRAILING_STOP)
+
+# (mint, percentage to sell, reason)
+Exit = Tuple[str, int, str]
+
+
+def parse_take_profit(tiers: List[str]) -> Tuple[Tuple[int, int], ...]:
+    """``["100:50", "300:100"]`` -> ((100, 50), (300, 100)): at +100% sell
+    half of what is held, at +300% the rest."""
+    parsed = []
+    for tier in tiers:
+        gain, _, percentage = tier.partition(":")
+        parsed.append((int(gain), int(percentage or 100)))
+    parsed.sort()
+    for gain, percentage in parsed:
+        if gain <= 0 or not 1 <= percentage <= 100:
+            raise ValueError(f"Invalid take-profit tier {gain}:{percentage}")
+    return tuple(parsed)
+
+
+@dataclass(frozen=True)
+class ExitPolicy:
+    """Price exits, all in percent of the position's cost basis.
+
+    ``take_profit`` is a ladder of ``(gain, percentage)`` tiers, each
+    selling ``percentage`` of the tokens still held once the position is up
+    ``gain`` percent. ``stop_loss`` sells everything once it is down that
+    much; ``trailing_stop`` once it has fallen that far from its peak
+    value, armed after a ``trailing_activation`` percent gain. The time
+    stop is the position scheduler's ``hold``.
+    """
+
+    take_profit: Tuple[Tuple[int, int], ...] = ()
+    stop_loss: Optional[int] = None
+    trailing_stop: Optional[int] = None
+    trailing_activation: int = 0
+
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> "ExitPolicy":
+        return cls(
+            take_profit=parse_take_profit(settings.take_profit),
+            stop_loss=settings.stop_loss,
+            trailing_stop=settings.trailing_stop,
+            trailing_activation=settings.trailing_activation,
+        )
+
+
+class ExitEngine:
+    """Decides price exits for every open position in one NumPy pass.
+
+    Positions live in parallel arrays (tokens held, cost basis, peak value
+    and the curve's virtual reserves), one row each. ``update`` is a
+    ``BondingCurveCache`` listener: every pushed or polled curve state just
+    writes the reserves into its rows and marks the engine dirty. ``run``
+    then evaluates all positions at most once per ``interval``, so a burst
+    of updates costs one pass, and hands each exit to ``on_exit(mint,
+    percentage)``, normally ``PositionScheduler.exit``.
+
+    A row with a sell in flight is skipped until ``sold`` or ``failed``
+    reports back; a take-profit tier whose sell fails fires again.
+    """
+
+    def __init__(
+        self,
+        policy: ExitPolicy,
+        on_exit: Optional[Callable[[str, int], bool]] = None,
+        interval: float = 0.05,
+        capacity: int = 64,
+    ):
+        self.policy = policy
+        self.on_exit = on_exit
+        self.interval = interval
+        self.mints: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.curves: Dict[Pubkey, List[int]] = {}
+        self._curve_of: List[Pubkey] = []
+        self.tokens = np.zeros(capacity, dtype=np.int64)
+        self.cost = np.zeros(capacity, dtype=np.int64)
+        self.peak = np.zeros(capacity, dtype=np.int64)
+        self.virtual_sol = np.zeros(capacity, dtype=np.int64)
+        self.virtual_token = np.zeros(capacity, dtype=np.int64)
+        self.tier = np.zeros(capacity, dtype=np.int64)
+        self.busy = np.zeros(capacity, dtype=bool)
+        # Gain and percentage of each tier, plus a padding tier for rows past the last
+        self._tier_gain = np.array([gain for gain, _ in policy.take_profit] + [0], dtype=np.int64)
+        self._tier_percentage = [percentage for _, percentage in policy.take_profit] + [0]
+        self._dirty = asyncio.Event()
+        self.passes = registry.counter("exits.passes")
+        self.fired = {reason: registry.counter(f"exits.{reason}") for reason in REASONS}
+        self.pass_time = registry.histogram("exits.pass_time")
+
+    def __len__(self):
+        return len(self.mints)
+
+    def _grow(self):
+        for name in ("tokens", "cost", "peak", "virtual_sol", "virtual_token", "tier", "busy"):
+            array = getattr(self, name)
+            grown = np.zeros(2 * len(array), dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    # -- positions ------------------------------------------------------
+
+    def open(self, mint: str, bonding_curve: Pubkey, tokens: int, cost: int, state: Optional["CurveState"] = None):
+        """Start watching a filled buy of ``tokens`` that cost ``cost`` lamports."""
+        if mint in self.rows or tokens <= 0 or cost <= 0:
+            return
+        if len(self.mints) == len(self.tokens):
+            self._grow()
+        row = self.rows[mint] = len(self.mints)
+        self.mints.append(mint)
+        self._curve_of.append(bonding_curve)
+        self.curves.setdefault(bonding_curve, []).append(row)
+        self.tokens[row], self.cost[row], self.tier[row], self.busy[row] = tokens, cost, 0, False
+        self.peak[row] = 0
+        if state is not None:
+            self.virtual_sol[row], self.virtual_token[row] = state.virtual_sol_reserves, state.virtual_token_reserves
+        else:
+            self.virtual_sol[row] = self.virtual_token[row] = 0
+
+    def close(self, mint: str):
+        """Stop watching ``mint``; the last row moves into its place."""
+        row = self.rows.pop(mint, None)
+        if row is None:
+            return
+        self._unlink(row)
+        last = len(self.mints) - 1
+        if row != last:
+            moved = self.mints[last]
+            self._unlink(last)
+            for name in ("tokens", "cost", "peak", "virtual_sol", "virtual_token", "tier", "busy"):
+                array = getattr(self, name)
+                array[row] = array[last]
+            self.mints[row] = moved
+            self._curve_of[row] = self._curve_of[last]
+            self.rows[moved] = row
+            self.curves.setdefault(self._curve_of[row], []).append(row)
+        self.mints.pop()
+        self._curve_of.pop()
+
+    def _unlink(self, row: int):
+        bonding_curve = self._curve_of[row]
+        rows = self.curves.get(bonding_curve)
+        if rows is not None:
+            rows.remove(row)
+            if not rows:
+                del self.curves[bonding_curve]
+
+    def sold(self, mint: str, tokens: int, cost: int):
+        """A partial sell confirmed; ``tokens`` and ``cost`` are what is left.
+        The peak value shrinks in proportion."""
+        row = self.rows.get(mint)
+        if row is None:
+            return
+        if tokens <= 0:
+            self.close(mint)
+            return
+        held = int(self.tokens[row])
+        self.peak[row] = int(self.peak[row]) * tokens // held if held else 0
+        self.tokens[row], self.cost[row], self.busy[row] = tokens, max(cost, 1), False
+        self._dirty.set()
+
+    def failed(self, mint: str):
+        """A partial sell did not confirm: re-arm its take-profit tier."""
+        row = self.rows.get(mint)
+        if row is None:
+            return
+        self.busy[row] = False
+        if self.tier[row] > 0:
+            self.tier[row] -= 1
+        self._dirty.set()
+
+    # -- curve updates --------------------------------------------------
+
+    def update(self, bonding_curve: Pubkey, state: "CurveState"):
+        rows = self.curves.get(bonding_curve)
+        if not rows:
+            return
+        for row in rows:
+            self.virtual_sol[row] = state.virtual_sol_reserves
+            self.virtual_token[row] = state.virtual_token_reserves
+        self._dirty.set()
+
+    # -- evaluation -----------------------------------------------------
+
+    def evaluate(self) -> List[Exit]:
+        """Exits due on the current reserves, for positions without a sell
+        in flight. Updates peaks but fires nothing."""
+        n = len(self.mints)
+        if not n:
+            return []
+        policy = self.policy
+        self.passes.inc()
+        tokens, cost = self.tokens[:n], self.cost[:n]
+        virtual_token = self.virtual_token[:n]
+        priced = (virtual_token > 0) & ~self.busy[:n]
+        value = curve_math.sell_proceeds_batch(tokens, self.virtual_sol[:n], np.maximum(virtual_token, 1))
+        value = np.where(priced, value, 0)
+        peak = self.peak[:n]
+        np.maximum(peak, value, out=peak)
+        # Gains compared in integer percent of cost: value * 100 vs cost * (100 + gain)
+        value100, cost100 = value * 100, cost * 100
+
+        full = np.zeros(n, dtype=bool)
+        reasons = np.zeros(n, dtype=np.int8)
+        if policy.stop_loss is not None:
+            hit = priced & (value100 <= cost * (100 - policy.stop_loss))
+            reasons[hit & ~full] = 2
+            full |= hit
+        if policy.trailing_stop is not None:
+            armed = peak * 100 >= cost * (100 + policy.trailing_activation)
+            hit = priced & armed & (value100 <= peak * (100 - policy.trailing_stop))
+            reasons[hit & ~full] = 3
+            full |= hit
+        take = np.zeros(n, dtype=bool)
+        if policy.take_profit:
+            tier = self.tier[:n]
+            take = priced & ~full & (tier < len(policy.take_profit))
+            take &= value100 >= cost100 + cost * self._tier_gain[tier]
+
+        exits: List[Exit] = []
+        for row in np.flatnonzero(full | take):
+            mint = self.mints[row]
+            if full[row]:
+                exits.append((mint, 100, STOP_LOSS if reasons[row] == 2 else TRAILING_STOP))
+            else:
+                exits.append((mint, self._tier_percentage[self.tier[row]], TAKE_PROFIT))
+        return exits
+
+    def step(self) -> List[Exit]:
+        """One pass: evaluate and hand every exit to ``on_exit``."""
+        exits = self.evaluate()
+        fired = []
+        for mint, percentage, reason in exits:
+            row = self.rows[mint]
+            if self.on_exit is not None and not self.on_exit(mint, percentage):
+                # Not held or already selling; ``sold``/``failed``/``close`` will follow
+                self.busy[row] = True
+                continue
+            self.fired[reason].inc()
+            fired.append((mint, percentage, reason))
+            log.info(f"Exit {mint}: {reason}, selling {percentage}%", "magenta")
+            if percentage >= 100:
+                self.close(mint)
+            else:
+                self.tier[row] += 1
+                self.busy[row] = True
+        return fired
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            started = loop.time()
+            try:
+                self.step()
+            except Exception as e:
+                log.error(f"Error evaluating exits: {e}")
+            self.pass_time.record(loop.time() - started)
+            # Updates arriving meanwhile are batched into the next pass
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "open": len(self.mints),
+            "passes": self.passes.value,
+            **{reason: counter.value for reason, counter in self.fired.items()},
+        }
@@ -0,0 +1,143 @@
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .metrics import registry
+
+_SIGNATURE_KEY = '"signature":'
+_SIGNATURE_KEY_BYTES = _SIGNATURE_KEY.encode()
+
+
+def extract_signature(frame: Union[str, bytes]) -> Optional[Union[str, bytes]]:
+    """Pull the transaction signature out of a raw logsNotification frame
+    without parsing it. Returns None for frames that carry no signature."""
+    if isinstance(frame, (bytes, bytearray)):
+        key, quote = _SIGNATURE_KEY_BYTES, b'"'
+    else:
+        key, quote = _SIGNATURE_KEY, '"'
+    start = frame.find(key)
+    if start < 0:
+        return None
+    start = frame.find(quote, start + len(key))
+    end = frame.find(quote, start + 1) if start >= 0 else -1
+    if end < 0:
+        return None
+    return frame[start + 1:end]
+
+
+def endpoint_label(url: str) -> str:
+    # Only the host: providers embed API keys in the path or query string
+    return urlsplit(url).netloc or url
+
+
+def parse_endpoints(value: str) -> List[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+class SeenSet:
+    """Bounded, time-windowed record of the first arrival of each key."""
+
+    def __init__(self, maxsize: int = 50_000, ttl: float = 120.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._seen: "OrderedDict[object, Tuple[float, str]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._seen)
+
+    def _expire(self, now: float):
+        seen = self._seen
+        cutoff = now - self.ttl
+        while seen:
+            first_at, _ = next(iter(seen.values()))
+            if first_at >= cutoff and len(seen) <= self.maxsize:
+                break
+            seen.popitem(last=False)
+
+    def first_seen(self, key, now: float, source: str) -> Optional[Tuple[float, str]]:
+        """Record ``key`` if new and return None; otherwise return the
+        ``(first_at, source)`` of the arrival that won."""
+        record = self._seen.get(key)
+        if record is not None:
+            return record
+        self._seen[key] = (now, source)
+        self._expire(now)
+        return None
+
+
+class Backoff:
+    """Exponential reconnect delay with full jitter."""
+
+    def __init__(self, base: float = 0.5, cap: float = 30.0):
+        self.base = base
+        self.cap = cap
+        self.attempt = 0
+
+    def reset(self):
+        self.attempt = 0
+
+    def next_delay(self) -> float:
+        delay = min(self.cap, self.base * (2 ** self.attempt))
+        self.attempt += 1
+        return random.uniform(0, delay)
+
+
+class EndpointStats:
+    def __init__(self, label: str):
+        self.label = label
+        self.frames = registry.counter(f"fanin.{label}.frames")
+        self.wins = registry.counter(f"fanin.{label}.wins")
+        self.duplicates = registry.counter(f"fanin.{label}.duplicates")
+        self.reconnects = registry.counter(f"fanin.{label}.reconnects")
+        self.behind = registry.histogram(f"fanin.{label}.behind_winner")
+        self.connected = False
+
+    def summary(self) -> dict:
+        frames = self.frames.value
+        return {
+            "connected": self.connected,
+            "frames": frames,
+            "wins": self.wins.value,
+            "win_rate": self.wins.value / frames if frames else 0.0,
+            "duplicates": self.duplicates.value,
+            "reconnects": self.reconnects.value,
+            "behind_winner": self.behind.summary(),
+        }
+
+
+class FanIn:
+    """Deduplicates frames from several websocket endpoints by transaction
+    signature so that only the first arrival is processed."""
+
+    def __init__(self, urls: List[str], seen: Optional[SeenSet] = None):
+        self.endpoints: List[Tuple[str, str]] = []
+        self.stats: Dict[str, EndpointStats] = {}
+        for index, url in enumerate(urls):
+            label = endpoint_label(url)
+            if label in self.stats:
+                label = f"{label}#{index}"
+            self.endpoints.append((url, label))
+            self.stats[label] = EndpointStats(label)
+        self.seen = seen or SeenSet()
+
+    def accept(self, label: str, frame, now: float = None) -> bool:
+        """Return True if ``frame`` is the first arrival of its transaction."""
+        if now is None:
+            now = time.monotonic()
+        stats = self.stats[label]
+        stats.frames.inc()
+        signature = extract_signature(frame)
+        if signature is None:
+            return True
+        winner = self.seen.first_seen(signature, now, stats.label)
+        if winner is None:
+            stats.wins.inc()
+            return True
+        stats.duplicates.inc()
+        stats.behind.record(now - winner[0])
+        return False
+
+    def summary(self) -> dict:
+        return {label: stats.summary() for label, stats in self.stats.items()}
@@ -0,0 +1,161 @@
+import asyncio
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from solders.pubkey import Pubkey  # type: ignore
+from solders.signature import Signature  # type: ignore
+
+from .constants import FEE_RECIPIENT, GLOBAL, PUMP_FUN_PROGRAM
+from .logsink import log
+from .metrics import registry
+from .rpc import RpcTransport
+
+# Urgency tiers and the percentile of recent per-slot fees each one bids
+LOW = "low"
+NORMAL = "normal"
+HIGH = "high"
+URGENT = "urgent"
+TIER_PERCENTILES = {LOW: 25, NORMAL: 50, HIGH: 75, URGENT: 95}
+
+# Accounts every pump.fun swap write-locks or reads
+FEE_ACCOUNTS = (PUMP_FUN_PROGRAM, GLOBAL, FEE_RECIPIENT)
+
+
+class FeeOracle:
+    """Prices compute units from recent fees and sizes the limit from our own usage.
+
+    ``run`` samples ``getRecentPrioritizationFees`` for ``accounts`` every
+    ``interval`` seconds and keeps the per-slot fees of the last
+    ``window_slots`` slots. ``quote`` prices an order at its urgency tier's
+    percentile of that window, clamped to ``[min_price, max_price]``.
+
+    ``learn`` reads ``computeUnitsConsumed`` from a confirmed transaction's
+    meta. Once ``min_samples`` are in, an order kind's limit is its largest
+    recent usage plus ``headroom``, capped at ``default_limit``.
+    """
+
+    def __init__(
+        self,
+        transport: RpcTransport,
+        default_limit: int,
+        default_price: int,
+        min_price: int = 0,
+        max_price: Optional[int] = None,
+        accounts: Iterable[Pubkey] = FEE_ACCOUNTS,
+        interval: float = 2.0,
+        window_slots: int = 450,
+        headroom: float = 1.15,
+        min_samples: int = 5,
+        usage_samples: int = 64,
+    ):
+        self.transport = transport
+        self.default_limit = default_limit
+        self.default_price = default_price
+        self.min_price = min_price
+        self.max_price = max_price
+        self.accounts = [str(account) for account in accounts]
+        self.interval = interval
+        self.window_slots = window_slots
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.usage_samples = usage_samples
+        self.fees: Dict[int, int] = {}
+        self._sorted: List[int] = []
+        self.usage: Dict[str, Deque[int]] = {}
+        self._learning: Set[asyncio.Task] = set()
+        self.samples = registry.counter("fees.samples")
+        self.failures = registry.counter("fees.failures")
+        self.learned = registry.counter("fees.learned")
+        self.prices = {tier: registry.gauge(f"fees.price.{tier}") for tier in TIER_PERCENTILES}
+
+    def record_fees(self, fees: Iterable[Tuple[int, int]]):
+        """Fold ``(slot, micro-lamports per CU)`` pairs into the window."""
+        for slot, fee in fees:
+            self.fees[slot] = fee
+        if not self.fees:
+            return
+        newest = max(self.fees)
+        for slot in [slot for slot in self.fees if slot <= newest - self.window_slots]:
+            del self.fees[slot]
+        self._sorted = sorted(self.fees.values())
+        for tier, gauge in self.prices.items():
+            gauge.set(self.price(tier))
+
+    async def sample(self):
+        response = await self.transport.call("getRecentPrioritizationFees", [self.accounts])
+        if "error" in response:
+            raise RuntimeError(response["error"].get("message"))
+        self.record_fees((item["slot"], item["prioritizationFee"]) for item in response["result"])
+        self.samples.inc()
+
+    def percentile(self, q: float) -> Optional[int]:
+        if not self._sorted:
+            return None
+        return self._sorted[min(len(self._sorted) - 1, int(len(self._sorted) * q / 100))]
+
+    def price(self, urgency: str = NORMAL) -> int:
+        price = self.percentile(TIER_PERCENTILES[urgency])
+        if price is None:
+            return self.default_price
+        price = max(price, self.min_price)
+        return min(price, self.max_price) if self.max_price is not None else price
+
+    def record_usage(self, kind: str, units: int):
+        samples = self.usage.get(kind)
+        if samples is None:
+            samples = self.usage[kind] = deque(maxlen=self.usage_samples)
+        samples.append(units)
+        self.learned.inc()
+
+    def limit(self, kind: str) -> int:
+        samples = self.usage.get(kind)
+        if not samples or len(samples) < self.min_samples:
+            return self.default_limit
+        return min(self.default_limit, math.ceil(max(samples) * self.headroom))
+
+    def quote(self, kind: str, urgency: str = NORMAL) -> Tuple[int, int]:
+        """``(unit_limit, unit_price)`` for an order of ``kind``."""
+        return self.limit(kind), self.price(urgency)
+
+    async def _learn(self, kind: str, signature: Signature, attempts: int = 3, delay: float = 1.0):
+        params = [str(signature), {"encoding": "base64", "commitment": "confirmed", "maxSupportedTransactionVersion": 0}]
+        for _ in range(attempts):
+            try:
+                response = await self.transport.call("getTransaction", params)
+            except Exception as e:
+                log.error(f"Error fetching compute usage for {signature}: {e}")
+                return
+            meta = (response.get("result") or {}).get("meta")
+            if meta is not None:
+                units = meta.get("computeUnitsConsumed")
+                if units and meta.get("err") is None:
+                    self.record_usage(kind, units)
+                return
+            # Confirmed transactions can take a moment to be served by getTransaction
+            await asyncio.sleep(delay)
+
+    def learn(self, kind: str, signature: Signature):
+        """Record the compute units a confirmed order used, in the background."""
+        task = asyncio.ensure_future(self._learn(kind, signature))
+        self._learning.add(task)
+        task.add_done_callback(self._learning.discard)
+
+    def stats(self) -> dict:
+        return {
+            "slots": len(self.fees),
+            "prices": {tier: self.price(tier) for tier in TIER_PERCENTILES},
+            "limits": {kind: self.limit(kind) for kind in self.usage},
+            "samples": self.samples.value,
+            "failures": self.failures.value,
+            "learned": self.learned.value,
+        }
+
+    async def run(self):
+        while True:
+            try:
+                await self.sample()
+            except Exception as e:
+                self.failures.inc()
+                log.error(f"Error sampling prioritization fees: {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,184 @@
+import struct
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price  # type: ignore
+from solders.hash import Hash  # type: ignore
+from solders.instruction import AccountMeta, CompiledInstruction, Instruction  # type: ignore
+from solders.keypair import Keypair  # type: ignore
+from solders.message import MessageV0  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from solders.transaction import VersionedTransaction  # type: ignore
+from spl.token.instructions import CloseAccountParams, close_account
+
+from .accounts import MintAccounts, create_ata_idempotent
+from .config import UNIT_BUDGET, UNIT_PRICE
+from .constants import (
+    ASSOC_TOKEN_ACC_PROG,
+    EVENT_AUTHORITY,
+    FEE_RECIPIENT,
+    GLOBAL,
+    PUMP_FUN_PROGRAM,
+    RENT,
+    SYSTEM_PROGRAM,
+    TOKEN_PROGRAM,
+)
+
+BUY_DISCRIMINATOR = bytes.fromhex("66063d1201daebea")
+SELL_DISCRIMINATOR = bytes.fromhex("33e685a4017f83ad")
+
+_SWAP_DATA = struct.Struct("<8sQQ")
+_UNIT_LIMIT_DATA = struct.Struct("<BI")
+_UNIT_PRICE_DATA = struct.Struct("<BQ")
+_SET_UNIT_LIMIT = 2
+_SET_UNIT_PRICE = 3
+
+_GLOBAL_META = AccountMeta(pubkey=GLOBAL, is_signer=False, is_writable=False)
+_FEE_RECIPIENT_META = AccountMeta(pubkey=FEE_RECIPIENT, is_signer=False, is_writable=True)
+_BUY_TAIL = [
+    AccountMeta(pubkey=SYSTEM_PROGRAM, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=TOKEN_PROGRAM, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=RENT, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=EVENT_AUTHORITY, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=PUMP_FUN_PROGRAM, is_signer=False, is_writable=False),
+]
+_SELL_TAIL = [
+    AccountMeta(pubkey=SYSTEM_PROGRAM, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=ASSOC_TOKEN_ACC_PROG, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=TOKEN_PROGRAM, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=EVENT_AUTHORITY, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=PUMP_FUN_PROGRAM, is_signer=False, is_writable=False),
+]
+
+BUY = "buy"
+SELL = "sell"
+SELL_AND_CLOSE = "sell_and_close"
+
+
+def _swap_keys(accounts: MintAccounts, user: Pubkey, tail: List[AccountMeta]) -> List[AccountMeta]:
+    return [
+        _GLOBAL_META,
+        _FEE_RECIPIENT_META,
+        AccountMeta(pubkey=accounts.mint, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=accounts.bonding_curve, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=accounts.associated_bonding_curve, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=accounts.user_ata(user), is_signer=False, is_writable=True),
+        AccountMeta(pubkey=user, is_signer=True, is_writable=True),
+        *tail,
+    ]
+
+
+class OrderTemplate:
+    """A compiled, unsigned pump.fun order for one mint and payer.
+
+    Only the compute-budget values, the swap amounts and the blockhash
+    change between orders, so ``message`` patches those into the cached
+    compiled instructions instead of compiling from scratch.
+    """
+
+    __slots__ = ("header", "account_keys", "instructions", "swap_index", "discriminator")
+
+    def __init__(self, message: MessageV0, discriminator: bytes):
+        self.header = message.header
+        self.account_keys = message.account_keys
+        self.instructions = list(message.instructions)
+        program_index = self.account_keys.index(PUMP_FUN_PROGRAM)
+        self.swap_index = next(i for i, ix in enumerate(self.instructions) if ix.program_id_index == program_index)
+        self.discriminator = discriminator
+
+    def message(
+        self,
+        amount: int,
+        sol_limit: int,
+        blockhash: Hash,
+        unit_limit: Optional[int] = None,
+        unit_price: Optional[int] = None,
+    ) -> MessageV0:
+        instructions = self.instructions.copy()
+        if unit_limit is not None:
+            ix = instructions[0]
+            instructions[0] = CompiledInstruction(ix.program_id_index, _UNIT_LIMIT_DATA.pack(_SET_UNIT_LIMIT, unit_limit), ix.accounts)
+        if unit_price is not None:
+            ix = instructions[1]
+            instructions[1] = CompiledInstruction(ix.program_id_index, _UNIT_PRICE_DATA.pack(_SET_UNIT_PRICE, unit_price), ix.accounts)
+        ix = instructions[self.swap_index]
+        instructions[self.swap_index] = CompiledInstruction(
+            ix.program_id_index, _SWAP_DATA.pack(self.discriminator, amount, sol_limit), ix.accounts
+        )
+        return MessageV0(self.header, self.account_keys, blockhash, instructions, [])
+
+    def transaction(
+        self,
+        amount: int,
+        sol_limit: int,
+        blockhash: Hash,
+        signer: Keypair,
+        unit_limit: Optional[int] = None,
+        unit_price: Optional[int] = None,
+    ) -> VersionedTransaction:
+        return VersionedTransaction(self.message(amount, sol_limit, blockhash, unit_limit, unit_price), [signer])
+
+
+class InstructionFactory:
+    """Builds pump.fun buy/sell instructions from cached static parts and
+    keeps an LRU of compiled ``OrderTemplate``s per (mint, payer, kind)."""
+
+    def __init__(self, unit_limit: int = UNIT_BUDGET, unit_price: int = UNIT_PRICE, maxsize: int = 1024):
+        self.unit_limit = unit_limit
+        self.unit_price = unit_price
+        self.maxsize = maxsize
+        self._compute_budget = [set_compute_unit_limit(unit_limit), set_compute_unit_price(unit_price)]
+        self._templates: "OrderedDict[Tuple[Pubkey, Pubkey, str], OrderTemplate]" = OrderedDict()
+
+    def compute_budget(self) -> List[Instruction]:
+        return list(self._compute_budget)
+
+    def buy_instruction(self, accounts: MintAccounts, user: Pubkey, amount: int, max_sol_cost: int) -> Instruction:
+        data = _SWAP_DATA.pack(BUY_DISCRIMINATOR, amount, max_sol_cost)
+        return Instruction(PUMP_FUN_PROGRAM, data, _swap_keys(accounts, user, _BUY_TAIL))
+
+    def sell_instruction(self, accounts: MintAccounts, user: Pubkey, amount: int, min_sol_output: int) -> Instruction:
+        data = _SWAP_DATA.pack(SELL_DISCRIMINATOR, amount, min_sol_output)
+        return Instruction(PUMP_FUN_PROGRAM, data, _swap_keys(accounts, user, _SELL_TAIL))
+
+    def _build(self, accounts: MintAccounts, user: Pubkey, kind: str) -> OrderTemplate:
+        instructions = self.compute_budget()
+        if kind == BUY:
+            ata = accounts.user_ata(user)
+            instructions.append(create_ata_idempotent(user, user, accounts.mint, ata))
+            instructions.append(self.buy_instruction(accounts, user, 0, 0))
+            discriminator = BUY_DISCRIMINATOR
+        else:
+            instructions.append(self.sell_instruction(accounts, user, 0, 0))
+            if kind == SELL_AND_CLOSE:
+                ata = accounts.user_ata(user)
+                instructions.append(close_account(CloseAccountParams(TOKEN_PROGRAM, ata, user, user)))
+            discriminator = SELL_DISCRIMINATOR
+        message = MessageV0.try_compile(user, instructions, [], Hash.default())
+        return OrderTemplate(message, discriminator)
+
+    def template(self, accounts: MintAccounts, user: Pubkey, kind: str) -> OrderTemplate:
+        key = (accounts.mint, user, kind)
+        template = self._templates.get(key)
+        if template is not None:
+            self._templates.move_to_end(key)
+            return template
+        template = self._templates[key] = self._build(accounts, user, kind)
+        while len(self._templates) > self.maxsize:
+            self._templates.popitem(last=False)
+        return template
+
+    def buy_template(self, accounts: MintAccounts, user: Pubkey) -> OrderTemplate:
+        return self.template(accounts, user, BUY)
+
+    def sell_template(self, accounts: MintAccounts, user: Pubkey, close: bool = True) -> OrderTemplate:
+        return self.template(accounts, user, SELL_AND_CLOSE if close else SELL)
+
+    def prepare(self, accounts: MintAccounts, user: Pubkey):
+        """Compile the sell templates ahead of time, e.g. while a position is held."""
+        self.sell_template(accounts, user, close=True)
+        self.sell_template(accounts, user, close=False)
+
+    def discard(self, mint: Pubkey):
+        for key in [key for key in self._templates if key[0] == mint]:
+            del self._templates[key]
@@ -0,0 +1,115 @@
+import asyncio
+import sys
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional, TextIO, Tuple
+
+from termcolor import colored
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+_DEFAULT_COLORS = {WARNING: "yellow", ERROR: "red"}
+
+
+class LogSink:
+    """Level-filtered log lines, written in batches off the hot path.
+
+    ``log`` only appends to a bounded buffer (dropping the oldest lines
+    when full); ``run`` wakes every ``flush_interval`` seconds, or as soon
+    as ``batch_size`` lines are waiting, and writes the batch with a single
+    call in a worker thread so a slow terminal never stalls the event loop.
+    ``log`` may also be called from other threads.
+    """
+
+    def __init__(
+        self,
+        level: int = INFO,
+        stream: TextIO = sys.stdout,
+        batch_size: int = 256,
+        flush_interval: float = 0.05,
+        maxlen: int = 65_536,
+        timestamps: bool = False,
+    ):
+        self.level = level
+        self.stream = stream
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timestamps = timestamps
+        self.buffer: Deque[Tuple[float, str, Optional[str]]] = deque(maxlen=maxlen)
+        self.dropped = 0
+        self._wakeup: Optional[asyncio.Future] = None
+        self._loop_thread: Optional[int] = None
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def log(self, level: int, message: str, color: Optional[str] = None):
+        if level < self.level:
+            return
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append((time.time(), message, color or _DEFAULT_COLORS.get(level)))
+        if self._wakeup is not None and len(self.buffer) >= self.batch_size:
+            if threading.get_ident() == self._loop_thread:
+                self._wake()
+            # Lines from worker threads are picked up by the next timed flush
+
+    def _wake(self):
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    def debug(self, message: str, color: Optional[str] = None):
+        self.log(DEBUG, message, color)
+
+    def info(self, message: str, color: Optional[str] = None):
+        self.log(INFO, message, color)
+
+    def warning(self, message: str, color: Optional[str] = None):
+        self.log(WARNING, message, color)
+
+    def error(self, message: str, color: Optional[str] = None):
+        self.log(ERROR, message, color)
+
+    def _format(self, at: float, message: str, color: Optional[str]) -> str:
+        if self.timestamps:
+            message = f"{time.strftime('%H:%M:%S', time.localtime(at))}.{int(at % 1 * 1000):03d} {message}"
+        return colored(message, color) if color else message
+
+    def _drain(self) -> str:
+        lines = []
+        while self.buffer:
+            lines.append(self._format(*self.buffer.popleft()))
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def _write(self, text: str):
+        self.stream.write(text)
+        self.stream.flush()
+
+    def flush(self):
+        """Write everything buffered now, synchronously (e.g. at shutdown)."""
+        text = self._drain()
+        if text:
+            self._write(text)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        try:
+            while True:
+                # asyncio.wait rather than wait_for: it never swallows a cancel
+                self._wakeup = loop.create_future()
+                await asyncio.wait((self._wakeup,), timeout=self.flush_interval)
+                text = self._drain()
+                if text:
+                    await loop.run_in_executor(None, self._write, text)
+        finally:
+            self._wakeup = None
+            self._loop_thread = None
+            self.flush()
+
+
+log = LogSink()
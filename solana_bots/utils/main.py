@@ -1,17 +1,21 @@
 
 from .streamer import Streamer
+from .multiproc import ShardRouter
 from .constants import *
-from .config import *
+from .settings import get_settings
+from .rpc import close_transports
+from .recorder import FrameRecorder
+from .rules import build_rules
+from .logsink import LEVELS, log
+from .metrics import MetricsServer, registry
 import asyncio
 import signal
-from termcolor import cprint
-from typing import Set
 
-async def shutdown(signal, loop, active_trades: Set[asyncio.Task]):
-    cprint(f"Received exit signal {signal.name}...", "yellow")
+async def shutdown(signal, loop):
+    log.warning(f"Received exit signal {signal.name}...")
     tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
     [task.cancel() for task in tasks]
-    cprint(f"Cancelling {len(tasks)} outstanding tasks", "yellow")
+    log.warning(f"Cancelling {len(tasks)} outstanding tasks")
     await asyncio.gather(*tasks, return_exceptions=True)
     loop.stop()
     
@@ -23,14 +27,42 @@ async def main():
     signals = (signal.SIGHUP, signal.SIGTERM, signal.SIGINT)
     for s in signals:
         loop.add_signal_handler(
-            s, lambda s=s: asyncio.create_task(shutdown(s, loop, streamer.active_trades))
+            s, lambda s=s: asyncio.create_task(shutdown(s, loop))
         )
     
-    streamer = Streamer(RPC)
+    settings = get_settings()
+    log.level = LEVELS[settings.log_level.lower()]
+    metrics_server = await MetricsServer(registry, port=settings.metrics_port).start() if settings.metrics_port else None
+    recorder = None
+    if settings.record_path:
+        recorder = FrameRecorder(settings.record_path, compress=settings.record_path.endswith(".zst"))
+    events = None
+    if settings.event_store_dir:
+        from .event_store import EventStore  # NumPy is only loaded when the store is enabled
+        events = EventStore(settings.event_store_dir)
+    rules = build_rules(settings, events)
+    exits = None
+    if settings.exits_enabled and not settings.trader_processes:
+        from .exits import ExitEngine, ExitPolicy  # NumPy, like the event store
+        exits = ExitEngine(ExitPolicy.from_settings(settings))
+    if settings.trader_processes:
+        streamer = ShardRouter(
+            settings.rpc_url, settings.trader_processes, recorder=recorder, events=events,
+            metrics_port=settings.metrics_port, rules=rules,
+        )
+    else:
+        streamer = Streamer(settings.rpc_url, recorder=recorder, events=events, rules=rules, exits=exits)
     try:
         await streamer.stream_transactions()
     finally:
-        await streamer.client.close()  # Clean up client connection
+        await close_transports()  # Clean up the shared RPC connection pools
+        if recorder is not None:
+            recorder.close()
+        if events is not None:
+            events.close()
+        if metrics_server is not None:
+            await metrics_server.close()
+        log.flush()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
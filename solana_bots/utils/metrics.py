@@ -0,0 +1,230 @@
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+
+class Counter:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Histogram:
+    """Log-linear histogram of durations in seconds, stored in microseconds.
+
+    Values below 32us get exact buckets; above that each power of two is
+    split into 16 sub-buckets, giving ~3% relative error. Like every metric
+    here it is only written from the event loop thread, so it needs no locks.
+    """
+
+    _SUB_BITS = 4
+    _SUB_COUNT = 1 << _SUB_BITS
+    _LINEAR = _SUB_COUNT * 2
+    _BUCKETS = _LINEAR + _SUB_COUNT * 40
+
+    __slots__ = ("name", "counts", "count", "total", "max")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts = [0] * self._BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def _index(cls, micros: int) -> int:
+        if micros < cls._LINEAR:
+            return micros
+        shift = micros.bit_length() - cls._SUB_BITS - 1
+        index = cls._LINEAR + (shift - 1) * cls._SUB_COUNT + ((micros >> shift) - cls._SUB_COUNT)
+        return min(index, cls._BUCKETS - 1)
+
+    @classmethod
+    def _value(cls, index: int) -> float:
+        if index < cls._LINEAR:
+            return float(index)
+        shift, sub = divmod(index - cls._LINEAR, cls._SUB_COUNT)
+        shift += 1
+        return float(((sub + cls._SUB_COUNT) << shift) + (1 << (shift - 1)))
+
+    def record(self, seconds: float):
+        micros = int(seconds * 1e6) if seconds > 0 else 0
+        self.counts[self._index(micros)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, int(self.count * q / 100 + 0.5))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(self._value(index) / 1e6, self.max)
+        return self.max
+
+    def summary(self, percentiles: Iterable[float] = (50, 90, 99)) -> dict:
+        out = {"count": self.count, "mean": self.total / self.count if self.count else 0.0, "max": self.max}
+        for q in percentiles:
+            out[f"p{q:g}"] = self.percentile(q)
+        return out
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def _get(self, cls, name: str):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name)
+        return metric
+
+    def counter(self, name: str) -> Counter:
+        return self._get(Counter, name)
+
+    def gauge(self, name: str) -> Gauge:
+        return self._get(Gauge, name)
+
+    def histogram(self, name: str) -> Histogram:
+        return self._get(Histogram, name)
+
+    def snapshot(self) -> dict:
+        out = {}
+        for name, metric in self.metrics.items():
+            out[name] = metric.summary() if isinstance(metric, Histogram) else metric.value
+        return out
+
+
+# Stages of one trade, in order. Each is timed from when the launch frame was received.
+RECEIVED = "received"
+PARSED = "parsed"
+DISPATCHED = "dispatched"
+COIN_DATA = "coin_data"
+BLOCKHASH = "blockhash"
+SENT = "sent"
+PROCESSED = "processed"
+CONFIRMED = "confirmed"
+SOLD = "sold"
+STAGES = (RECEIVED, PARSED, DISPATCHED, COIN_DATA, BLOCKHASH, SENT, PROCESSED, CONFIRMED, SOLD)
+
+
+class _Trace:
+    __slots__ = ("started", "stage", "at")
+
+    def __init__(self, started: float):
+        self.started = started
+        self.stage = RECEIVED
+        self.at = started
+
+
+class Tracer:
+    """Monotonic stage timestamps for each trade, keyed by mint.
+
+    ``mark`` records two histograms: ``trace.<stage>`` (time since the
+    launch frame was received) and ``trace.<previous>_to_<stage>``.
+    Marks for keys without an open trace are ignored.
+    """
+
+    def __init__(self, registry: "Registry"):
+        self.registry = registry
+        self.traces: Dict[str, _Trace] = {}
+
+    def begin(self, key: str, received_at: float):
+        self.traces[key] = _Trace(received_at)
+
+    def mark(self, key: Optional[str], stage: str, at: Optional[float] = None):
+        trace = self.traces.get(key)
+        if trace is None:
+            return
+        at = time.monotonic() if at is None else at
+        self.registry.histogram(f"trace.{stage}").record(at - trace.started)
+        self.registry.histogram(f"trace.{trace.stage}_to_{stage}").record(at - trace.at)
+        trace.stage = stage
+        trace.at = at
+
+    def end(self, key: str):
+        self.traces.pop(key, None)
+
+
+_INVALID_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def prometheus_name(name: str, prefix: str = "solana_bots_") -> str:
+    return prefix + _INVALID_NAME.sub("_", name)
+
+
+def render_prometheus(registry: "Registry", quantiles: Iterable[float] = (0.5, 0.9, 0.99)) -> str:
+    """The registry in the Prometheus text exposition format. Histograms are
+    exported as summaries in seconds."""
+    lines: List[str] = []
+    for name, metric in sorted(registry.metrics.items()):
+        name = prometheus_name(name)
+        if isinstance(metric, Histogram):
+            lines.append(f"# TYPE {name} summary")
+            for q in quantiles:
+                lines.append(f'{name}{{quantile="{q:g}"}} {metric.percentile(q * 100):.9g}')
+            lines.append(f"{name}_sum {metric.total:.9g}")
+            lines.append(f"{name}_count {metric.count}")
+        elif isinstance(metric, Counter):
+            lines.append(f"# TYPE {name}_total counter")
+            lines.append(f"{name}_total {metric.value}")
+        else:
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {metric.value}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+class MetricsServer:
+    """Serves ``render_prometheus(registry)`` on ``http://host:port/metrics``."""
+
+    def __init__(self, registry: "Registry", host: str = "127.0.0.1", port: int = 9464):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.runner = None
+
+    async def start(self):
+        from aiohttp import web
+
+        async def metrics(request):
+            return web.Response(text=render_prometheus(self.registry), content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", metrics)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        self.port = self.runner.addresses[0][1]
+        return self
+
+    async def close(self):
+        if self.runner:
+            await self.runner.cleanup()
+
+
+registry = Registry()
+tracer = Tracer(registry)
@@ -0,0 +1,399 @@
+import asyncio
+import bisect
+import contextlib
+import dataclasses
+import hashlib
+import multiprocessing
+import os
+import signal
+import struct
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, List, Optional, Tuple
+
+from solders.keypair import Keypair  # type: ignore
+
+from .events import (
+    CreateEvent,
+    TradeEvent,
+    decode_create_event,
+    decode_trade_event,
+    encode_create_event,
+    encode_trade_event,
+)
+from .logsink import LEVELS, log
+from .metrics import MetricsServer, registry, tracer
+from .pipeline import OverflowPolicy
+from .prefilter import FramePrefilter
+from .recorder import FrameRecorder
+from .rpc import close_transports
+from .rules import RuleEngine
+from .settings import Settings, configure, get_settings
+from .streamer import FrameIngest, Streamer, start_tasks, supervise
+
+if TYPE_CHECKING:
+    from .event_store import EventStore
+
+# received_at, slot, CreateEvent payload length, TradeEvent payload length (0 without a dev buy)
+_RECORD_HEADER = struct.Struct("<dQHH")
+# Records on a worker pipe are prefixed with their length
+_LENGTH = struct.Struct("<I")
+
+
+def encode_launch(
+    event: CreateEvent, received_at: float, slot: int = 0, dev_trade: Optional[TradeEvent] = None
+) -> bytes:
+    """A launch as a compact binary record: a fixed header followed by the
+    raw Anchor event payloads, so workers decode it with the same code as
+    the log lines."""
+    create = encode_create_event(event.name, event.symbol, event.uri, event.mint, event.bonding_curve, event.user)
+    trade = b"" if dev_trade is None else encode_trade_event(
+        dev_trade.mint, dev_trade.sol_amount, dev_trade.token_amount, dev_trade.is_buy, dev_trade.user,
+        dev_trade.timestamp, dev_trade.virtual_sol_reserves, dev_trade.virtual_token_reserves,
+    )
+    return _RECORD_HEADER.pack(received_at, slot, len(create), len(trade)) + create + trade
+
+
+def decode_launch(record: bytes) -> Tuple[CreateEvent, float, int, Optional[TradeEvent]]:
+    """``(event, received_at, slot, dev_trade)`` from ``encode_launch``."""
+    received_at, slot, create_len, trade_len = _RECORD_HEADER.unpack_from(record)
+    offset = _RECORD_HEADER.size
+    event = decode_create_event(record[offset:offset + create_len])
+    if event is None:
+        raise ValueError("launch record does not hold a CreateEvent")
+    offset += create_len
+    dev_trade = decode_trade_event(record[offset:offset + trade_len]) if trade_len else None
+    return event, received_at, slot, dev_trade
+
+
+class HashRing:
+    """Consistent hashing of keys onto nodes.
+
+    Each node owns ``replicas`` points on a 64-bit ring and a key belongs
+    to the node owning the next point. Removing a node only moves the keys
+    it owned, so the other workers keep their mints.
+    """
+
+    def __init__(self, nodes: Iterable[int] = (), replicas: int = 64):
+        self.replicas = replicas
+        self.nodes: set = set()
+        self._points: List[int] = []
+        self._owners: List[int] = []
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(key: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def add(self, node: int):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}:{replica}".encode())
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: int):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def node_for(self, key: bytes) -> Optional[int]:
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, self._hash(key))
+        return self._owners[index % len(self._points)]
+
+
+class _PipeProtocol(asyncio.Protocol):
+    def __init__(self, on_lost):
+        self.on_lost = on_lost
+
+    def connection_lost(self, exc):
+        self.on_lost(exc)
+
+
+async def open_writer(conn: Connection, on_lost=lambda exc: None) -> asyncio.WriteTransport:
+    """A non-blocking write transport over the sending end of a ``Pipe``.
+    ``on_lost`` is called when the reader goes away."""
+    pipe = os.fdopen(os.dup(conn.fileno()), "wb", buffering=0)
+    conn.close()
+    transport, _ = await asyncio.get_running_loop().connect_write_pipe(lambda: _PipeProtocol(on_lost), pipe)
+    return transport
+
+
+def write_record(transport: asyncio.WriteTransport, record: bytes):
+    transport.write(_LENGTH.pack(len(record)) + record)
+
+
+async def read_records(conn: Connection) -> AsyncIterator[bytes]:
+    """Length-prefixed records from the receiving end of a ``Pipe`` until
+    the writer closes it."""
+    reader = asyncio.StreamReader()
+    pipe = os.fdopen(os.dup(conn.fileno()), "rb", buffering=0)
+    conn.close()
+    transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), pipe
+    )
+    try:
+        while True:
+            try:
+                header = await reader.readexactly(_LENGTH.size)
+                yield await reader.readexactly(_LENGTH.unpack(header)[0])
+            except asyncio.IncompleteReadError:
+                return
+    finally:
+        transport.close()
+
+
+def shard_keypairs(keypairs: List[Keypair], processes: int) -> List[List[Keypair]]:
+    """Deal the payer wallets out so no two processes sign with the same one."""
+    if len(keypairs) < processes:
+        raise ValueError(
+            f"{processes} trader processes need at least as many wallets; "
+            f"add keys to EXTRA_KEY_PAIRS (have {len(keypairs)})"
+        )
+    return [keypairs[index::processes] for index in range(processes)]
+
+
+class TraderProcess:
+    """Ingestion-side handle on one trader process and its record pipe."""
+
+    def __init__(self, index: int, process: multiprocessing.Process):
+        self.index = index
+        self.process = process
+        self.transport: Optional[asyncio.WriteTransport] = None
+        self.routed = registry.counter(f"shard.{index}.routed")
+        self.dropped = registry.counter(f"shard.{index}.dropped")
+
+    @property
+    def alive(self) -> bool:
+        return self.transport is not None and not self.transport.is_closing()
+
+    def summary(self) -> dict:
+        return {
+            "pid": self.process.pid,
+            "alive": self.alive,
+            "routed": self.routed.value,
+            "dropped": self.dropped.value,
+            "buffered": self.transport.get_write_buffer_size() if self.alive else 0,
+        }
+
+
+class ShardRouter(FrameIngest):
+    """Ingestion process of the sharded mode.
+
+    Owns the websockets and decodes frames like the ``Streamer``, but sends
+    each launch as an ``encode_launch`` record to one of ``processes``
+    trader processes, chosen by consistent hashing of the mint. Every
+    trader runs its own loop, RPC pools and ``Streamer`` position scheduler
+    and signs with its own slice of the payer wallets.
+
+    ``rules`` run here, before routing, so creator rates count every
+    launch rather than one shard's. A launch is dropped, not queued, when
+    its trader already has ``max_buffer`` bytes waiting; a trader that
+    dies is taken off the ring and its share of new mints moves to the
+    others.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        processes: int,
+        prefilter: Optional[FramePrefilter] = None,
+        queue_size: int = 1024,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        workers: int = 2,
+        recorder: Optional[FrameRecorder] = None,
+        events: Optional["EventStore"] = None,
+        keypairs: Optional[List[Keypair]] = None,
+        metrics_port: Optional[int] = None,
+        max_buffer: int = 1 << 20,
+        stop_timeout: float = 10.0,
+        rules: Optional[RuleEngine] = None,
+    ):
+        super().__init__(prefilter, queue_size, overflow, workers, recorder, events, rules)
+        if processes < 1:
+            raise ValueError("ShardRouter needs at least one trader process")
+        self.rpc_url = rpc_url
+        self.wallets = shard_keypairs(keypairs or get_settings().payer_keypairs, processes)
+        self.metrics_port = metrics_port
+        self.max_buffer = max_buffer
+        self.stop_timeout = stop_timeout
+        self.ring = HashRing()
+        self.traders: List[TraderProcess] = []
+        self.unrouted = registry.counter("shard.unrouted")
+        self.lost = registry.counter("shard.lost")
+
+    async def start(self, wss_urls: List[str]):
+        """Spawn the trader processes and connect their record pipes."""
+        context = multiprocessing.get_context("spawn")
+        # Traders use this process's settings, not a fresh read of the environment
+        settings = dataclasses.replace(get_settings())
+        for index, keypairs in enumerate(self.wallets):
+            receiver, sender = context.Pipe(duplex=False)
+            metrics_port = self.metrics_port + 1 + index if self.metrics_port else None
+            process = context.Process(
+                target=_trader_main,
+                args=(index, settings, self.rpc_url, wss_urls, [str(k) for k in keypairs], receiver, metrics_port),
+                name=f"trader-{index}",
+                daemon=True,
+            )
+            process.start()
+            receiver.close()
+            trader = TraderProcess(index, process)
+            trader.transport = await open_writer(sender, lambda exc, trader=trader: self.trader_lost(trader))
+            self.traders.append(trader)
+            self.ring.add(index)
+            log.info(f"Trader {index} started (pid {process.pid}, {len(keypairs)} wallets)", "green")
+
+    def trader_lost(self, trader: TraderProcess):
+        if trader.index in self.ring.nodes:
+            self.ring.remove(trader.index)
+            self.lost.inc()
+            log.error(f"Trader {trader.index} went away; {len(self.ring)} left")
+
+    def dispatch(self, event: CreateEvent, received_at: float, slot: int = 0, dev_trade: Optional[TradeEvent] = None):
+        if not super().dispatch(event, received_at, slot, dev_trade):
+            return
+        # The trace continues in the trader process
+        tracer.end(str(event.mint))
+        index = self.ring.node_for(bytes(event.mint))
+        if index is None:
+            self.unrouted.inc()
+            return
+        trader = self.traders[index]
+        if trader.transport.get_write_buffer_size() > self.max_buffer:
+            trader.dropped.inc()
+            return
+        write_record(trader.transport, encode_launch(event, received_at, slot, dev_trade))
+        trader.routed.inc()
+
+    async def stop(self):
+        """SIGTERM every trader, which shuts down through ``main.shutdown``,
+        and kill the ones still running after ``stop_timeout``."""
+        loop = asyncio.get_running_loop()
+        # Emptied first so closing the pipes below is not reported as a loss
+        self.ring = HashRing()
+        for trader in self.traders:
+            if trader.transport is not None:
+                trader.transport.close()
+            if trader.process.is_alive():
+                os.kill(trader.process.pid, signal.SIGTERM)
+        for trader in self.traders:
+            await loop.run_in_executor(None, trader.process.join, self.stop_timeout)
+            if trader.process.is_alive():
+                log.error(f"Trader {trader.index} did not stop; killing it")
+                trader.process.kill()
+                await loop.run_in_executor(None, trader.process.join)
+        self.traders.clear()
+
+    def shard_stats(self) -> dict:
+        return {
+            "unrouted": self.unrouted.value,
+            "lost": self.lost.value,
+            "traders": {trader.index: trader.summary() for trader in self.traders},
+        }
+
+    async def monitor(self):
+        while True:
+            await asyncio.sleep(60)
+            log.info(f"Frames: {self.prefilter.stats()}", "blue")
+            log.info(f"Ingest: {self.ingest_stats()}", "blue")
+            log.info(f"Shards: {self.shard_stats()}", "blue")
+            if self.events is not None:
+                log.info(f"Events: {self.events.stats()}", "blue")
+            if self.rules is not None:
+                log.info(f"Rules: {self.rules.stats()}", "blue")
+
+    def background(self, wss_urls: List[str]) -> list:
+        return super().background(wss_urls) + [self.monitor()]
+
+    async def stream_transactions(self, wss_urls: Optional[List[str]] = None):
+        wss_urls = wss_urls or get_settings().wss_urls
+        if not wss_urls:
+            raise ValueError("WSS_HTTPS_URL must be set in .env file")
+        await self.start(wss_urls)
+        try:
+            await super().stream_transactions(wss_urls)
+        finally:
+            await self.stop()
+
+
+async def run_trader(
+    index: int,
+    rpc_url: str,
+    wss_urls: List[str],
+    keypairs: List[Keypair],
+    receiver: Connection,
+    metrics_port: Optional[int] = None,
+):
+    """A trader process: opens positions for the launches on ``receiver``
+    until the ingestion process closes it or SIGTERM/SIGHUP arrives."""
+    from .main import shutdown  # main imports this module
+
+    loop = asyncio.get_running_loop()
+    for s in (signal.SIGHUP, signal.SIGTERM):
+        loop.add_signal_handler(s, lambda s=s: asyncio.create_task(shutdown(s, loop)))
+
+    settings = get_settings()
+    log.level = LEVELS[settings.log_level.lower()]
+    metrics_server = await MetricsServer(registry, port=metrics_port).start() if metrics_port else None
+    exits = None
+    if settings.exits_enabled:
+        from .exits import ExitEngine, ExitPolicy
+
+        exits = ExitEngine(ExitPolicy.from_settings(settings))
+    streamer = Streamer(rpc_url, keypairs=keypairs, exits=exits)
+
+    async def receive():
+        async for record in read_records(receiver):
+            try:
+                event, received_at, slot, dev_trade = decode_launch(record)
+                # received_at is time.monotonic() in the ingestion process; on
+                # Linux that clock is shared, so stage timings span the handoff
+                tracer.begin(str(event.mint), received_at)
+                streamer.open_position(event, received_at, slot, dev_trade)
+            except Exception as e:
+                log.error(f"Trader {index}: bad launch record: {e}")
+        log.warning(f"Trader {index}: ingestion process closed the pipe")
+
+    tasks = start_tasks([receive()] + streamer.background(wss_urls))
+    try:
+        # Only the receiver may finish; a background task that stops raises here
+        finished = await supervise(tasks)
+        if finished is not tasks[0]:
+            raise RuntimeError(f"Trader {index}: task {finished.get_name()} stopped")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await close_transports()
+        if metrics_server is not None:
+            await metrics_server.close()
+        log.flush()
+
+
+def _trader_main(
+    index: int,
+    settings: Settings,
+    rpc_url: str,
+    wss_urls: List[str],
+    keys: List[str],
+    receiver: Connection,
+    metrics_port: Optional[int],
+):
+    # Ctrl-C reaches the whole process group; the ingestion process handles
+    # it and stops the traders with SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    configure(settings)
+    keypairs = [Keypair.from_base58_string(key) for key in keys]
+    with contextlib.suppress(asyncio.CancelledError):
+        asyncio.run(run_trader(index, rpc_url, wss_urls, keypairs, receiver, metrics_port))
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Tuple
+
+from .metrics import registry
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop-oldest"
+    DROP_NEWEST = "drop-newest"
+    BLOCK = "block"
+
+
+class FrameQueue:
+    """Bounded queue of ``(received_at, frame)`` between the websocket reader
+    and the decode/dispatch workers.
+
+    ``received_at`` is ``time.monotonic()`` at enqueue. When full, the
+    overflow policy decides whether the oldest frame is evicted, the new
+    frame is dropped, or the reader waits for room.
+    """
+
+    def __init__(self, maxsize: int = 1024, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST, name: str = "ingest"):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.policy = OverflowPolicy(policy)
+        self._items: Deque[Tuple[float, Any]] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.enqueued = registry.counter(f"{name}.enqueued")
+        self.dropped_oldest = registry.counter(f"{name}.dropped_oldest")
+        self.dropped_newest = registry.counter(f"{name}.dropped_newest")
+        self.depth = registry.gauge(f"{name}.depth")
+        self.max_depth = registry.gauge(f"{name}.max_depth")
+        self.lag = registry.histogram(f"{name}.lag")
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+    def _push(self, item: Tuple[float, Any]):
+        self._items.append(item)
+        self.enqueued.inc()
+        size = len(self._items)
+        self.depth.set(size)
+        if size > self.max_depth.value:
+            self.max_depth.set(size)
+        self._not_empty.set()
+        if size >= self.maxsize:
+            self._not_full.clear()
+
+    def put_nowait(self, frame: Any, received_at: float = None) -> bool:
+        """Enqueue without waiting. Returns False if ``frame`` was dropped."""
+        item = (received_at if received_at is not None else time.monotonic(), frame)
+        if self.full():
+            if self.policy is OverflowPolicy.DROP_NEWEST:
+                self.dropped_newest.inc()
+                return False
+            if self.policy is OverflowPolicy.DROP_OLDEST:
+                self._items.popleft()
+                self.dropped_oldest.inc()
+            else:
+                raise asyncio.QueueFull
+        self._push(item)
+        return True
+
+    async def put(self, frame: Any, received_at: float = None) -> bool:
+        if received_at is None:
+            received_at = time.monotonic()
+        if self.policy is OverflowPolicy.BLOCK:
+            while self.full():
+                await self._not_full.wait()
+        return self.put_nowait(frame, received_at)
+
+    async def get(self) -> Tuple[float, Any]:
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        item = self._items.popleft()
+        size = len(self._items)
+        self.depth.set(size)
+        if size < self.maxsize:
+            self._not_full.set()
+        return item
+
+    def record_dispatch(self, received_at: float):
+        """Record receive-to-dispatch lag for a frame that produced a trade."""
+        self.lag.record(time.monotonic() - received_at)
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self._items),
+            "max_depth": self.max_depth.value,
+            "enqueued": self.enqueued.value,
+            "dropped_oldest": self.dropped_oldest.value,
+            "dropped_newest": self.dropped_newest.value,
+            "lag": self.lag.summary(),
+        }
@@ -0,0 +1,124 @@
+import struct
+from typing import Dict, Iterable, List, Optional
+
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Processed
+from solders.pubkey import Pubkey  # type: ignore
+
+from .accounts import AccountRegistry
+from .metrics import registry
+
+# SPL token account: mint (32), owner (32), amount (u64), ...
+_TOKEN_AMOUNT = struct.Struct("<Q")
+_TOKEN_AMOUNT_OFFSET = 64
+TOKEN_DECIMALS = 6
+# getMultipleAccounts accepts at most 100 keys per request
+MAX_ACCOUNTS_PER_CALL = 100
+
+
+def decode_token_amount(data: bytes) -> int:
+    return _TOKEN_AMOUNT.unpack_from(data, _TOKEN_AMOUNT_OFFSET)[0]
+
+
+class Position:
+    __slots__ = ("mint", "ata", "balance", "slot", "cost")
+
+    def __init__(self, mint: str, ata: Pubkey, balance: Optional[int] = None, slot: int = 0):
+        self.mint = mint
+        self.ata = ata
+        self.balance = balance
+        self.slot = slot
+        # Lamports paid for the tokens still held
+        self.cost = 0
+
+    @property
+    def ui_balance(self) -> Optional[float]:
+        return None if self.balance is None else self.balance / 10 ** TOKEN_DECIMALS
+
+
+class PositionBook:
+    """Token balances of every ATA held by one owner.
+
+    Balances move with our own confirmed buys and sells, and are
+    reconciled for all positions at once with ``get_multiple_accounts``
+    decoded from the raw SPL token layout. Each balance carries the slot it
+    is known at, so only a refresh read at a later slot replaces it; a
+    lagging node cannot roll a fill back.
+    """
+
+    def __init__(self, client: AsyncClient, owner: Pubkey, accounts: AccountRegistry):
+        self.client = client
+        self.owner = owner
+        self.accounts = accounts
+        self.positions: Dict[str, Position] = {}
+        self.refreshes = registry.counter("positions.refreshes")
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, mint_str: str):
+        return mint_str in self.positions
+
+    def open(self, mint_str: str) -> Position:
+        position = self.positions.get(mint_str)
+        if position is None:
+            ata = self.accounts.get(mint_str).user_ata(self.owner)
+            position = self.positions[mint_str] = Position(mint_str, ata)
+        return position
+
+    def close(self, mint_str: str):
+        self.positions.pop(mint_str, None)
+
+    def apply_buy(self, mint_str: str, amount: int, cost: int = 0, slot: Optional[int] = None):
+        """A buy of ``amount`` tokens confirmed, landing in ``slot``."""
+        position = self.open(mint_str)
+        position.cost += cost
+        if position.balance is not None:
+            position.balance += amount
+        else:
+            position.balance = amount
+        if slot is not None:
+            position.slot = max(position.slot, slot)
+
+    def apply_sell(self, mint_str: str, amount: int, slot: Optional[int] = None):
+        position = self.positions.get(mint_str)
+        if position is None or position.balance is None:
+            return
+        if position.balance:
+            # The cost basis goes with the tokens, pro rata
+            position.cost -= position.cost * min(amount, position.balance) // position.balance
+        position.balance = max(0, position.balance - amount)
+        if slot is not None:
+            position.slot = max(position.slot, slot)
+
+    def balance(self, mint_str: str) -> Optional[int]:
+        position = self.positions.get(mint_str)
+        return None if position is None else position.balance
+
+    async def refresh(self, mints: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Reload balances for ``mints`` (default: every position)."""
+        positions: List[Position] = (
+            [self.open(mint) for mint in mints] if mints is not None else list(self.positions.values())
+        )
+        balances = {}
+        for start in range(0, len(positions), MAX_ACCOUNTS_PER_CALL):
+            batch = positions[start:start + MAX_ACCOUNTS_PER_CALL]
+            self.refreshes.inc()
+            response = await self.client.get_multiple_accounts(
+                [position.ata for position in batch], commitment=Processed, encoding="base64"
+            )
+            slot = response.context.slot
+            for position, account in zip(batch, response.value):
+                # A known balance is only replaced by a read from a later slot
+                if position.balance is not None and slot <= position.slot:
+                    continue
+                position.balance = decode_token_amount(account.data) if account is not None else 0
+                position.slot = slot
+                balances[position.mint] = position.balance
+        return balances
+
+    async def get_balance(self, mint_str: str) -> Optional[int]:
+        balance = self.balance(mint_str)
+        if balance is None:
+            balance = (await self.refresh([mint_str])).get(mint_str)
+        return balance
@@ -0,0 +1,87 @@
+import json
+import re
+from typing import Callable, Iterable, Optional, Union
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _DECODE_ERRORS = (ValueError, orjson.JSONDecodeError)
+    JSON_BACKEND = "orjson"
+except ImportError:
+    try:
+        import msgspec
+
+        _loads = msgspec.json.Decoder().decode
+        _DECODE_ERRORS = (ValueError, msgspec.DecodeError)
+        JSON_BACKEND = "msgspec"
+    except ImportError:
+        _loads = json.loads
+        _DECODE_ERRORS = (ValueError,)
+        JSON_BACKEND = "json"
+
+# Log lines that mark a token launch; see Streamer.is_valid_stream
+LAUNCH_MARKERS = ("InitializeMint2", "Create Metadata Accounts v3")
+
+Frame = Union[str, bytes]
+
+_SLOT = re.compile(r'"slot":\s*(\d+)')
+
+
+class FramePrefilter:
+    """Reject websocket frames on a raw substring scan before parsing them.
+
+    Only frames containing at least one marker are handed to the JSON
+    decoder. ``loads`` defaults to orjson or msgspec when installed.
+    """
+
+    def __init__(self, markers: Iterable[str] = LAUNCH_MARKERS, loads: Optional[Callable[[Frame], dict]] = None):
+        self.markers = tuple(markers)
+        self._byte_markers = tuple(m.encode() for m in self.markers)
+        self.loads = loads or _loads
+        self.seen = 0
+        self.rejected = 0
+        self.parsed = 0
+        self.errors = 0
+
+    def matches(self, frame: Frame) -> bool:
+        markers = self._byte_markers if isinstance(frame, (bytes, bytearray, memoryview)) else self.markers
+        for marker in markers:
+            if marker in frame:
+                return True
+        return False
+
+    def __call__(self, frame: Frame) -> Optional[dict]:
+        self.seen += 1
+        if not self.matches(frame):
+            self.rejected += 1
+            return None
+        try:
+            parsed = self.loads(frame)
+        except _DECODE_ERRORS:
+            self.errors += 1
+            return None
+        self.parsed += 1
+        return parsed
+
+    def stats(self) -> dict:
+        return {
+            "seen": self.seen,
+            "rejected": self.rejected,
+            "parsed": self.parsed,
+            "errors": self.errors,
+        }
+
+
+def extract_logs(parsed: dict) -> list:
+    return parsed.get("params", {}).get("result", {}).get("value", {}).get("logs", [])
+
+
+def extract_slot(parsed: dict) -> int:
+    return parsed.get("params", {}).get("result", {}).get("context", {}).get("slot", 0)
+
+
+def scan_slot(frame: str) -> int:
+    """The notification's context slot, read from the raw frame."""
+    match = _SLOT.search(frame)
+    return int(match.group(1)) if match else 0
@@ -0,0 +1,115 @@
+import os
+import struct
+import time
+from typing import BinaryIO, Iterator, Tuple, Union
+
+# File header: magic, format version, flags
+_HEADER = struct.Struct("<4sBB")
+_MAGIC = b"SBFR"
+_VERSION = 1
+_ZSTD = 0x01
+# Per frame: wall-clock receive time (seconds), payload length
+_RECORD = struct.Struct("<dI")
+
+Frame = Union[str, bytes]
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("zstd-compressed recordings need the zstandard package") from e
+    return zstandard
+
+
+class FrameRecorder:
+    """Appends raw websocket frames with their receive time to a file.
+
+    Each record is a ``<dI`` (wall-clock seconds, length) header followed
+    by the frame bytes. With ``compress`` the record stream is zstd
+    compressed; re-opening an existing recording appends a new zstd frame,
+    which ``iter_frames`` reads straight through.
+    """
+
+    def __init__(self, path: str, compress: bool = False, level: int = 3):
+        self.path = path
+        self.compress = compress
+        self.frames = 0
+        self.bytes = 0
+        # Streamer timestamps frames with time.monotonic(); store wall-clock time
+        self._wall_offset = time.time() - time.monotonic()
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as f:
+                if _read_header(f) != compress:
+                    raise ValueError(f"{path} was recorded with compress={not compress}")
+        self._file = open(path, "ab")
+        if not exists:
+            self._file.write(_HEADER.pack(_MAGIC, _VERSION, _ZSTD if compress else 0))
+        self._out: BinaryIO = self._file
+        if compress:
+            self._out = _zstandard().ZstdCompressor(level=level).stream_writer(self._file, closefd=False)
+
+    def write(self, frame: Frame, received_at: float):
+        payload = frame.encode() if isinstance(frame, str) else frame
+        self._out.write(_RECORD.pack(received_at + self._wall_offset, len(payload)))
+        self._out.write(payload)
+        self.frames += 1
+        self.bytes += len(payload)
+
+    def flush(self):
+        if self.compress:
+            self._out.flush(_zstandard().FLUSH_BLOCK)
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.compress:
+            self._out.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_header(f: BinaryIO) -> bool:
+    magic, version, flags = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("not a frame recording")
+    return bool(flags & _ZSTD)
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = f.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def iter_frames(path: str) -> Iterator[Tuple[float, str]]:
+    """Yield ``(received_at, frame)`` pairs in recorded order.
+
+    A truncated trailing record (e.g. from a crash mid-write) ends the
+    iteration instead of raising.
+    """
+    with open(path, "rb") as f:
+        source: BinaryIO = f
+        if _read_header(f):
+            source = _zstandard().ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        while True:
+            header = _read_exact(source, _RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            received_at, length = _RECORD.unpack(header)
+            payload = _read_exact(source, length)
+            if len(payload) < length:
+                return
+            yield received_at, payload.decode()
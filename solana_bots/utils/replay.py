@@ -0,0 +1,236 @@
+"""Replay recorded frames through the Streamer and backtest the hold strategy.
+
+    python -m solana_bots.utils.replay RECORDING [--speed N] [--hold S] [--sol-in SOL]
+
+Frames go through the same prefilter, decode and dispatch path as live
+traffic. The Streamer's position scheduler runs on a clock driven by
+recorded receive times, and ``SimulatedExecutor`` fills its orders against
+bonding curves rebuilt from the recorded trades.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from solders.keypair import Keypair  # type: ignore
+
+from . import curve_math
+from .constants import LAMPORTS_PER_SOL
+from .events import PROGRAM_DATA_PREFIX, TRADE_EVENT_B64_PREFIX, decode_trade_log
+from .metrics import Histogram
+from .prefilter import extract_logs
+from .recorder import iter_frames
+from .scheduler import PositionScheduler
+from .streamer import HOLD_SECONDS, Streamer
+
+_TRADE_MARKER = PROGRAM_DATA_PREFIX + TRADE_EVENT_B64_PREFIX
+
+
+class _Fill:
+    __slots__ = ("mint", "tokens", "cost", "opened_at", "proceeds", "closed_at")
+
+    def __init__(self, mint: str, tokens: int, cost: int, opened_at: float):
+        self.mint = mint
+        self.tokens = tokens
+        self.cost = cost
+        self.opened_at = opened_at
+        self.proceeds: Optional[int] = None
+        self.closed_at: Optional[float] = None
+
+    @property
+    def pnl(self) -> int:
+        return (self.proceeds or 0) - self.cost
+
+
+class SimulatedExecutor:
+    """Fills buys and sells against simulated curves instead of sending
+    transactions.
+
+    Curves start from the state ``Coin.register_launch`` seeded and follow
+    the reserves reported by later recorded trades. Our own fills move the
+    simulated curve but are not fed back into the recorded market.
+    """
+
+    def __init__(self, coin, sol_in: float = 0.001):
+        self.coin = coin
+        self.sol_in = int(sol_in * LAMPORTS_PER_SOL)
+        # mint -> [virtual_sol, virtual_token, real_token]
+        self.curves: Dict[str, List[int]] = {}
+        self.open: Dict[str, _Fill] = {}
+        self.closed: List[_Fill] = []
+        self.failed = 0
+
+    def observe(self, trade) -> bool:
+        curve = self.curves.get(str(trade.mint))
+        if curve is None:
+            return False
+        sold = curve[1] - trade.virtual_token_reserves
+        curve[0], curve[1], curve[2] = trade.virtual_sol_reserves, trade.virtual_token_reserves, curve[2] - sold
+        return True
+
+    def _curve(self, mint: str) -> Optional[List[int]]:
+        curve = self.curves.get(mint)
+        if curve is None:
+            accounts = self.coin.get_accounts(mint)
+            state = accounts and self.coin.curves.entries.get(accounts.bonding_curve)
+            if not state:
+                return None
+            curve = self.curves[mint] = [
+                state.virtual_sol_reserves, state.virtual_token_reserves, state.real_token_reserves,
+            ]
+        return curve
+
+    def buy(self, mint: str, now: float) -> bool:
+        curve = self._curve(mint)
+        if curve is None:
+            self.failed += 1
+            return False
+        tokens = curve_math.tokens_for_sol(self.sol_in, curve[0], curve[1], curve[2])
+        if tokens <= 0:
+            del self.curves[mint]
+            self.failed += 1
+            return False
+        cost = curve_math.buy_cost(tokens, curve[0], curve[1])
+        curve[0], curve[1] = curve_math.apply_buy(tokens, curve[0], curve[1])
+        curve[2] -= tokens
+        self.open[mint] = _Fill(mint, tokens, cost, now)
+        return True
+
+    def sell(self, mint: str, now: float) -> bool:
+        fill = self.open.pop(mint, None)
+        if fill is None:
+            return False
+        curve = self.curves.pop(mint)
+        fill.proceeds = curve_math.sell_proceeds(fill.tokens, curve[0], curve[1])
+        fill.closed_at = now
+        self.closed.append(fill)
+        return True
+
+    def summary(self) -> dict:
+        pnl = [fill.pnl for fill in self.closed]
+        invested = sum(fill.cost for fill in self.closed)
+        return {
+            "trades": len(self.closed),
+            "failed_buys": self.failed,
+            "wins": sum(1 for p in pnl if p > 0),
+            "pnl_sol": sum(pnl) / LAMPORTS_PER_SOL,
+            "invested_sol": invested / LAMPORTS_PER_SOL,
+            "return": sum(pnl) / invested if invested else 0.0,
+            "best_sol": max(pnl, default=0) / LAMPORTS_PER_SOL,
+            "worst_sol": min(pnl, default=0) / LAMPORTS_PER_SOL,
+        }
+
+
+class ReplayEngine:
+    """Feeds ``(received_at, frame)`` pairs through ``Streamer.process_frame``.
+
+    ``speed`` of 1 replays in real time, N replays N times faster, and None
+    replays as fast as possible. The scheduler's clock always follows the
+    recorded timestamps, so the hold is the same whatever the speed.
+    """
+
+    def __init__(self, streamer, executor: SimulatedExecutor, speed: Optional[float] = None, hold: float = HOLD_SECONDS):
+        self.streamer = streamer
+        self.executor = executor
+        self.speed = speed
+        self.hold = hold
+        self.now = 0.0
+        self.frames = 0
+        self.trades_observed = 0
+        self.decode = Histogram("replay.decode")
+        self.scheduler = streamer.scheduler = PositionScheduler(
+            self.buy, self.sell, streamer.position_closed, hold=hold,
+            max_open=streamer.scheduler.max_open, clock=lambda: self.now,
+        )
+
+    async def buy(self, mint: str) -> bool:
+        return self.executor.buy(mint, self.now)
+
+    async def sell(self, mint: str, percentage: int = 100) -> bool:
+        # Replay backtests the time stop only, which always sells everything
+        return self.executor.sell(mint, self.now)
+
+    async def _advance(self, now: float):
+        """Fire every deadline up to ``now``, each at its own time."""
+        deadline = self.scheduler.next_deadline()
+        while deadline is not None and deadline <= now:
+            self.now = deadline
+            self.scheduler.expire(deadline)
+            await self.scheduler.settle()
+            deadline = self.scheduler.next_deadline()
+        self.now = now
+
+    def _observe_trades(self, frame: str):
+        if not self.executor.curves or _TRADE_MARKER not in frame:
+            return
+        for log in extract_logs(self.streamer.prefilter.loads(frame)):
+            if log.startswith(_TRADE_MARKER):
+                trade = decode_trade_log(log)
+                if trade is not None and self.executor.observe(trade):
+                    self.trades_observed += 1
+
+    async def run(self, frames: Iterable[Tuple[float, str]]) -> dict:
+        workers = asyncio.create_task(self.scheduler.run(timers=False))
+        try:
+            return await self._run(frames)
+        finally:
+            workers.cancel()
+
+    async def _run(self, frames: Iterable[Tuple[float, str]]) -> dict:
+        started = time.perf_counter()
+        first = last = None
+        for recorded_at, frame in frames:
+            if first is None:
+                first = recorded_at
+            last = recorded_at
+            if self.speed:
+                wait = (recorded_at - first) / self.speed - (time.perf_counter() - started)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            await self._advance(recorded_at)
+            self._observe_trades(frame)
+            decode_started = time.perf_counter()
+            self.streamer.process_frame(frame, time.monotonic())
+            self.decode.record(time.perf_counter() - decode_started)
+            self.frames += 1
+            # Newly dispatched positions buy at this frame's time
+            await self.scheduler.settle()
+        elapsed = time.perf_counter() - started
+
+        # Hold whatever is still open to its deadline, on the last recorded curve
+        if last is not None:
+            await self._advance(last + self.hold)
+        return {
+            "frames": self.frames,
+            "seconds": elapsed,
+            "events_per_sec": self.frames / elapsed if elapsed else 0.0,
+            "recorded_seconds": last - first if first is not None else 0.0,
+            "decode": self.decode.summary(),
+            "trades_observed": self.trades_observed,
+            "skipped_busy": self.streamer.skipped_busy.value,
+            "positions": self.scheduler.stats(),
+            "pnl": self.executor.summary(),
+        }
+
+
+async def replay(path: str, speed: Optional[float] = None, hold: float = HOLD_SECONDS, sol_in: float = 0.001) -> dict:
+    # Every fill is simulated, so a throwaway wallet stands in for the configured ones
+    streamer = Streamer("http://127.0.0.1:1", keypairs=[Keypair()])
+    engine = ReplayEngine(streamer, SimulatedExecutor(streamer.coin, sol_in), speed, hold)
+    return await engine.run(iter_frames(path))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, N = N times faster, 0 = max")
+    parser.add_argument("--hold", type=float, default=HOLD_SECONDS)
+    parser.add_argument("--sol-in", type=float, default=0.001)
+    args = parser.parse_args()
+    results = asyncio.run(replay(args.recording, args.speed or None, args.hold, args.sol_in))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import asyncio
+import json
+from typing import Dict, List, Optional, Set, Tuple
+
+import aiohttp
+from solana.exceptions import SolanaRpcException, handle_async_exceptions
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment
+from solana.rpc.core import RPCException, _ClientCore
+from solana.rpc.providers.async_http import AsyncHTTPProvider
+from solana.rpc.providers.core import DEFAULT_TIMEOUT, _HTTPProviderCore
+from solders.rpc.requests import Body  # type: ignore
+
+from .fanin import endpoint_label
+from .metrics import registry
+
+# Calls per method allowed on the wire at once; anything not listed is unlimited
+DEFAULT_METHOD_LIMITS = {
+    "sendTransaction": 16,
+    "getMultipleAccounts": 8,
+    "getSignatureStatuses": 4,
+    "getTokenAccountsByOwner": 4,
+}
+# Most providers cap JSON-RPC batches at 100 requests
+MAX_BATCH = 100
+
+
+def _is_read(method: str) -> bool:
+    return method.startswith("get")
+
+
+class _Call:
+    __slots__ = ("request", "future")
+
+    def __init__(self, request: dict, future: asyncio.Future):
+        self.request = request
+        self.future = future
+
+
+class RpcTransport:
+    """One keep-alive connection pool to a JSON-RPC endpoint.
+
+    Reads (``get*`` methods) issued in the same event loop tick are
+    coalesced into a single batched POST of up to ``max_batch`` requests,
+    and identical reads already in flight share one request. Everything
+    else, ``sendTransaction`` above all, goes out at once in a POST of its
+    own: a batch waits for its slowest call, and many send endpoints reject
+    array bodies. ``method_limits`` caps how many calls of a given method
+    may be outstanding at once.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 64,
+        method_limits: Optional[Dict[str, int]] = None,
+        max_batch: int = MAX_BATCH,
+        timeout: float = DEFAULT_TIMEOUT,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.url = url
+        self.max_connections = max_connections
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        limits = DEFAULT_METHOD_LIMITS if method_limits is None else method_limits
+        self._limits = {method: asyncio.Semaphore(limit) for method, limit in limits.items()}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._queue: List[_Call] = []
+        self._flush_scheduled = False
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # Strong references to batch POSTs nobody awaits
+        self._posts: Set[asyncio.Task] = set()
+        self._next_id = 1
+        label = endpoint_label(url)
+        self.calls = registry.counter(f"rpc.{label}.calls")
+        self.deduplicated = registry.counter(f"rpc.{label}.deduplicated")
+        self.round_trips = registry.counter(f"rpc.{label}.round_trips")
+        self.batched = registry.counter(f"rpc.{label}.batched_requests")
+        self.errors = registry.counter(f"rpc.{label}.errors")
+        self.latency = registry.histogram(f"rpc.{label}.round_trip")
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the running loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.headers,
+            )
+        return self._session
+
+    async def request(self, body: str) -> str:
+        """Send one serialized JSON-RPC request and return the raw response
+        with the caller's original ``id``."""
+        request = json.loads(body)
+        response = dict(await self.call(request["method"], request.get("params")))
+        response["id"] = request.get("id")
+        return json.dumps(response)
+
+    async def call(self, method: str, params: Optional[list] = None) -> dict:
+        """Send ``method`` and return the full JSON-RPC response object."""
+        self.calls.inc()
+        if not _is_read(method):
+            return await self._limited(method, params)
+        key = (method, json.dumps(params))
+        future = self._inflight.get(key)
+        if future is not None:
+            self.deduplicated.inc()
+            return await asyncio.shield(future)
+        future = self._inflight[key] = asyncio.ensure_future(self._limited(method, params))
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _limited(self, method: str, params: Optional[list]) -> dict:
+        send = self._enqueue if _is_read(method) else self._send
+        limit = self._limits.get(method)
+        if limit is None:
+            return await send(method, params)
+        async with limit:
+            return await send(method, params)
+
+    def _call(self, method: str, params: Optional[list]) -> _Call:
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method}
+        if params is not None:
+            request["params"] = params
+        self._next_id += 1
+        return _Call(request, asyncio.get_running_loop().create_future())
+
+    async def _send(self, method: str, params: Optional[list]) -> dict:
+        call = self._call(method, params)
+        await self._post([call])
+        return await call.future
+
+    def _enqueue(self, method: str, params: Optional[list]) -> asyncio.Future:
+        call = self._call(method, params)
+        self._queue.append(call)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        return call.future
+
+    def _flush(self):
+        self._flush_scheduled = False
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.max_batch):
+            post = asyncio.ensure_future(self._post(queue[start:start + self.max_batch]))
+            self._posts.add(post)
+            post.add_done_callback(self._posts.discard)
+
+    async def _post(self, calls: List[_Call]):
+        loop = asyncio.get_running_loop()
+        payload = calls[0].request if len(calls) == 1 else [call.request for call in calls]
+        self.round_trips.inc()
+        if len(calls) > 1:
+            self.batched.inc(len(calls))
+        started = loop.time()
+        try:
+            async with self.session.post(self.url, data=json.dumps(payload)) as response:
+                response.raise_for_status()
+                result = await response.json(content_type=None)
+        except Exception as e:
+            self.errors.inc()
+            for call in calls:
+                if not call.future.done():
+                    call.future.set_exception(e)
+            return
+        self.latency.record(loop.time() - started)
+        results = {item.get("id"): item for item in (result if isinstance(result, list) else [result])}
+        for call in calls:
+            if call.future.done():
+                continue
+            item = results.get(call.request["id"])
+            if item is None:
+                call.future.set_exception(RPCException(f"no response for {call.request['method']}"))
+            else:
+                call.future.set_result(item)
+
+    def stats(self) -> dict:
+        calls = self.calls.value
+        return {
+            "calls": calls,
+            "round_trips": self.round_trips.value,
+            "saved": calls - self.round_trips.value,
+            "deduplicated": self.deduplicated.value,
+            "batched": self.batched.value,
+            "errors": self.errors.value,
+            "round_trip": self.latency.summary(),
+        }
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """``AsyncHTTPProvider`` that sends through a shared ``RpcTransport``
+    instead of owning its own HTTP client."""
+
+    def __init__(self, transport: RpcTransport):
+        _HTTPProviderCore.__init__(self, transport.url)
+        self.transport = transport
+        self.session = None
+
+    @handle_async_exceptions(SolanaRpcException, aiohttp.ClientError, asyncio.TimeoutError)
+    async def make_request(self, body: Body, parser):
+        return await super().make_request(body, parser)
+
+    async def make_request_unparsed(self, body: Body) -> str:
+        return await self.transport.request(body.to_json())
+
+    async def make_batch_request_unparsed(self, reqs: Tuple[Body, ...]) -> str:
+        responses = await asyncio.gather(*(self.transport.request(body.to_json()) for body in reqs))
+        return "[" + ",".join(responses) + "]"
+
+    async def is_connected(self) -> bool:
+        try:
+            response = await self.transport.call("getHealth")
+        except Exception:
+            return False
+        return response.get("result") == "ok"
+
+    async def __aenter__(self) -> "PooledHTTPProvider":
+        return self
+
+    async def close(self) -> None:
+        # The transport is shared; see close_transports
+        pass
+
+
+class PooledClient(AsyncClient):
+    """``AsyncClient`` whose requests go through a shared ``RpcTransport``."""
+
+    def __init__(self, transport: RpcTransport, commitment: Optional[Commitment] = None):
+        _ClientCore.__init__(self, commitment)
+        self._provider = PooledHTTPProvider(transport)
+
+
+_transports: Dict[str, RpcTransport] = {}
+_clients: Dict[str, PooledClient] = {}
+
+
+def get_transport(url: str) -> RpcTransport:
+    transport = _transports.get(url)
+    if transport is None:
+        transport = _transports[url] = RpcTransport(url)
+    return transport
+
+
+def shared_client(url: str) -> PooledClient:
+    """The process-wide client for ``url``, backed by its shared transport."""
+    client = _clients.get(url)
+    if client is None:
+        client = _clients[url] = PooledClient(get_transport(url))
+    return client
+
+
+def transport_stats() -> Dict[str, dict]:
+    return {url: transport.stats() for url, transport in _transports.items()}
+
+
+async def close_transports():
+    for transport in _transports.values():
+        await transport.close()
+    _transports.clear()
+    _clients.clear()
@@ -0,0 +1,300 @@
+import hashlib
+import math
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, Optional
+
+from solders.pubkey import Pubkey  # type: ignore
+
+from .events import CreateEvent, TradeEvent
+from .metrics import registry
+
+if TYPE_CHECKING:
+    from .event_store import EventStore
+    from .settings import Settings
+
+# Lists longer than this are held in a BloomFilter instead of a set
+BLOOM_THRESHOLD = 100_000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 32-byte keys.
+
+    Sized for ``capacity`` keys at ``error_rate`` false positives. The
+    ``hashes`` bit positions come from one blake2b digest by double
+    hashing. Never gives a false negative, so a blacklisted creator is
+    always caught; a false positive skips a launch we might have bought.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key) -> Iterable[int]:
+        digest = hashlib.blake2b(bytes(key), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key) -> bool:
+        bits = self.bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+
+def creator_set(creators: Iterable[str], threshold: int = BLOOM_THRESHOLD):
+    """Pubkeys from base58 strings, as a set or, past ``threshold``, a BloomFilter."""
+    keys = [Pubkey.from_string(creator) for creator in creators]
+    if len(keys) <= threshold:
+        return set(keys)
+    bloom = BloomFilter(len(keys))
+    for key in keys:
+        bloom.add(key)
+    return bloom
+
+
+def read_creators(path: str) -> List[str]:
+    """One base58 pubkey per line; blank lines and ``#`` comments are skipped."""
+    with open(path) as f:
+        return [line for line in (raw.split("#", 1)[0].strip() for raw in f) if line]
+
+
+class SlidingWindowCounter:
+    """Per-key event counts over the last ``window`` seconds.
+
+    Each key keeps a deque of its timestamps, trimmed on every ``add``;
+    keys idle for a whole window are dropped every ``prune_every`` adds.
+    """
+
+    def __init__(self, window: float, prune_every: int = 4096):
+        self.window = window
+        self.prune_every = prune_every
+        self.events: Dict[object, Deque[float]] = {}
+        self._added = 0
+
+    def add(self, key, now: float) -> int:
+        """Record one event for ``key`` and return its count in the window."""
+        times = self.events.get(key)
+        if times is None:
+            times = self.events[key] = deque()
+        times.append(now)
+        cutoff = now - self.window
+        while times[0] < cutoff:
+            times.popleft()
+        self._added += 1
+        if self._added % self.prune_every == 0:
+            self.prune(now)
+        return len(times)
+
+    def count(self, key, now: float) -> int:
+        times = self.events.get(key)
+        if times is None:
+            return 0
+        cutoff = now - self.window
+        while times and times[0] < cutoff:
+            times.popleft()
+        return len(times)
+
+    def prune(self, now: float):
+        cutoff = now - self.window
+        for key in [k for k, times in self.events.items() if times[-1] < cutoff]:
+            del self.events[key]
+
+
+# Verdicts a rule can return: ACCEPT and REJECT end the evaluation,
+# None passes the launch on to the next rule.
+ACCEPT = True
+REJECT = False
+
+
+class Rule(ABC):
+    """One pre-trade check. ``cost`` orders the rules, cheapest first.
+
+    ``record`` sees every launch, before any rule runs, so state a rule
+    keeps does not depend on which earlier rule decided.
+    """
+
+    name = "rule"
+    cost = 0
+
+    def record(self, event: CreateEvent, now: float):
+        pass
+
+    @abstractmethod
+    def __call__(self, event: CreateEvent, dev_trade: Optional[TradeEvent], now: float) -> Optional[bool]:
+        """ACCEPT, REJECT, or None to defer to the next rule."""
+
+
+class CreatorList(Rule):
+    """Accepts (``allow``) or rejects launches whose creator is in ``creators``,
+    a set of Pubkeys or a BloomFilter."""
+
+    def __init__(self, creators, allow: bool = False):
+        self.creators = creators
+        self.verdict = ACCEPT if allow else REJECT
+        self.name = "creator_whitelist" if allow else "creator_blacklist"
+        # The whitelist goes first so its creators skip every other rule
+        self.cost = 0 if allow else 2
+
+    def __call__(self, event, dev_trade, now):
+        if event.user in self.creators:
+            return self.verdict
+        return None
+
+
+class CreatorRate(Rule):
+    """Rejects creators with more than ``max_launches`` launches, this one
+    included, in the last ``window`` seconds.
+
+    Counts come from the ``EventStore`` creator index when there is one,
+    which the ingest path has already appended this launch to and which
+    survives restarts; otherwise from a ``SlidingWindowCounter`` that
+    ``record`` feeds. Either way every launch counts, including those an
+    earlier rule rejected.
+    """
+
+    name = "creator_rate"
+    cost = 3
+
+    def __init__(self, max_launches: int, window: float = 3600.0, events: Optional["EventStore"] = None):
+        self.max_launches = max_launches
+        self.window = window
+        self.events = events
+        self.counts = SlidingWindowCounter(window) if events is None else None
+
+    def record(self, event, now):
+        if self.counts is not None:
+            self.counts.add(event.user, now)
+
+    def __call__(self, event, dev_trade, now):
+        if self.events is not None:
+            launches = self.events.creator_launches(event.user, self.window, now)
+        else:
+            launches = self.counts.count(event.user, now)
+        return REJECT if launches > self.max_launches else None
+
+
+class DevBuy(Rule):
+    """Bounds the creator's first buy, in lamports; no dev buy counts as 0."""
+
+    name = "dev_buy"
+    cost = 1
+
+    def __init__(self, min_lamports: Optional[int] = None, max_lamports: Optional[int] = None):
+        self.min_lamports = min_lamports or 0
+        self.max_lamports = max_lamports
+
+    def __call__(self, event, dev_trade, now):
+        amount = dev_trade.sol_amount if dev_trade is not None and dev_trade.is_buy else 0
+        if amount < self.min_lamports or (self.max_lamports is not None and amount > self.max_lamports):
+            return REJECT
+        return None
+
+
+class NamePattern(Rule):
+    """Rejects launches whose name or symbol matches ``pattern`` (case-insensitive)."""
+
+    name = "name_pattern"
+    cost = 4
+
+    def __init__(self, pattern: str):
+        self.search = re.compile(pattern, re.IGNORECASE).search
+
+    def __call__(self, event, dev_trade, now):
+        if self.search(event.name) or self.search(event.symbol):
+            return REJECT
+        return None
+
+
+class RuleEngine:
+    """Runs ``rules`` over every launch before it is traded.
+
+    Rules are ordered by ``cost`` once, at construction, and evaluated in
+    that order until one returns a verdict; a launch no rule rejects is
+    accepted. Every rule's ``record`` runs first, whatever the verdict.
+    Each rule counts its verdicts in ``rules.<name>.hits``.
+
+    Filtering must never cost a buy, so ``budget`` seconds is a hard cap:
+    once it is spent the remaining rules are skipped and the launch is
+    accepted (counted in ``rules.over_budget``).
+    """
+
+    def __init__(self, rules: Iterable[Rule], budget: float = 200e-6):
+        self.rules = tuple(sorted(rules, key=lambda rule: rule.cost))
+        self.budget = budget
+        self._checks = tuple((rule, registry.counter(f"rules.{rule.name}.hits")) for rule in self.rules)
+        self._records = tuple(rule.record for rule in self.rules if type(rule).record is not Rule.record)
+        self.accepted = registry.counter("rules.accepted")
+        self.rejected = registry.counter("rules.rejected")
+        self.over_budget = registry.counter("rules.over_budget")
+        self.latency = registry.histogram("rules.latency")
+
+    def evaluate(self, event: CreateEvent, dev_trade: Optional[TradeEvent] = None, now: Optional[float] = None) -> Optional[str]:
+        """None to trade the launch, else the name of the rule that rejected it."""
+        now = now or time.time()
+        started = time.perf_counter()
+        for record in self._records:
+            record(event, now)
+        rejected_by = None
+        for rule, hits in self._checks:
+            verdict = rule(event, dev_trade, now)
+            if verdict is not None:
+                hits.inc()
+                if verdict is REJECT:
+                    rejected_by = rule.name
+                break
+            if time.perf_counter() - started > self.budget:
+                self.over_budget.inc()
+                break
+        self.latency.record(time.perf_counter() - started)
+        if rejected_by is None:
+            self.accepted.inc()
+        else:
+            self.rejected.inc()
+        return rejected_by
+
+    def stats(self) -> dict:
+        return {
+            "accepted": self.accepted.value,
+            "rejected": self.rejected.value,
+            "over_budget": self.over_budget.value,
+            "hits": {rule.name: hits.value for rule, hits in self._checks},
+            "latency": self.latency.summary(),
+        }
+
+
+def build_rules(settings: "Settings", events: Optional["EventStore"] = None) -> Optional[RuleEngine]:
+    """The rules ``settings`` configures, or None when it configures none."""
+    rules: List[Rule] = []
+    if settings.creator_whitelist:
+        rules.append(CreatorList(set(Pubkey.from_string(c) for c in settings.creator_whitelist), allow=True))
+    blacklist = list(settings.creator_blacklist)
+    if settings.creator_blacklist_file:
+        blacklist.extend(read_creators(settings.creator_blacklist_file))
+    if blacklist:
+        rules.append(CreatorList(creator_set(blacklist)))
+    if settings.min_dev_buy is not None or settings.max_dev_buy is not None:
+        rules.append(DevBuy(settings.min_dev_buy, settings.max_dev_buy))
+    if settings.max_creator_launches is not None:
+        rules.append(CreatorRate(settings.max_creator_launches, settings.creator_window, events))
+    if settings.name_deny:
+        rules.append(NamePattern(settings.name_deny))
+    if not rules:
+        return None
+    return RuleEngine(rules, budget=settings.rule_budget_us * 1e-6)
@@ -0,0 +1,337 @@
+import asyncio
+import enum
+import heapq
+import itertools
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .logsink import log
+from .metrics import registry
+
+
+class PositionState(enum.Enum):
+    PENDING_BUY = "pending_buy"
+    HELD = "held"
+    EXITING = "exiting"
+    CLOSED = "closed"
+
+
+# How long a deadline waits for an in-flight partial sell before firing
+PARTIAL_SELL_WAIT = 1.0
+
+# Everything else raised by one order is that order's failure, not the
+# worker's: solders, for one, raises pyo3's PanicException (a BaseException)
+# on a reply it cannot parse
+_FATAL = (asyncio.CancelledError, KeyboardInterrupt, SystemExit)
+
+
+class Position:
+    __slots__ = ("mint", "state", "created_at", "opened_at", "due", "attempts", "percentage", "selling")
+
+    def __init__(self, mint: str, created_at: float):
+        self.mint = mint
+        self.state = PositionState.PENDING_BUY
+        self.created_at = created_at
+        self.opened_at: Optional[float] = None
+        # When the pending heap entry for this position fires; stale entries are skipped
+        self.due: Optional[float] = None
+        self.attempts = 0
+        # Share of the tokens the queued sell sells; below 100 the position stays held
+        self.percentage = 100
+        self.selling = False
+
+
+def retry_delay(attempt: int) -> float:
+    """Backoff before sell attempt ``attempt + 1``: 2, 4, 8, then 10 seconds."""
+    return min(2.0 * 2 ** (attempt - 1), 10.0)
+
+
+class PositionScheduler:
+    """Runs every position through pending-buy -> held -> exiting -> closed.
+
+    Positions are plain records, not tasks. ``buy_concurrency`` and
+    ``sell_concurrency`` worker tasks execute orders from two queues, and
+    one timer task pops a heap of deadlines to move held positions to
+    exiting after ``hold`` seconds and to re-queue failed sells. So the
+    number of tasks is fixed however many positions are open, and
+    ``max_open`` alone bounds how many there are. ``exit`` sells a held
+    position, or part of it, before its deadline.
+
+    Buys that wait longer than ``buy_timeout`` are dropped as stale. A
+    position still unsold after ``sell_attempts`` tries or ``max_age``
+    seconds is abandoned. Whatever an order raises, its worker logs it,
+    closes the position or retries the sell, and carries on. ``clock`` and ``expire`` let replay drive the
+    deadlines from recorded time instead of running the timer task.
+    """
+
+    def __init__(
+        self,
+        buy: Callable[[str], Awaitable[bool]],
+        sell: Callable[[str, int], Awaitable[bool]],
+        on_close: Optional[Callable[[Position], Awaitable[None]]] = None,
+        hold: float = 30.0,
+        max_open: int = 256,
+        buy_concurrency: int = 2,
+        sell_concurrency: int = 4,
+        max_pending_buys: int = 16,
+        buy_timeout: float = 2.0,
+        sell_attempts: int = 10,
+        max_age: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.buy = buy
+        self.sell = sell
+        self.on_close = on_close
+        self.hold = hold
+        self.max_open = max_open
+        self.buy_concurrency = buy_concurrency
+        self.sell_concurrency = sell_concurrency
+        self.buy_timeout = buy_timeout
+        self.sell_attempts = sell_attempts
+        self.max_age = max_age
+        self.clock = clock
+        self.positions: Dict[str, Position] = {}
+        self._buys: asyncio.Queue = asyncio.Queue(max_pending_buys)
+        self._sells: asyncio.Queue = asyncio.Queue()
+        self._deadlines: List[Tuple[float, int, Position]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Future] = None
+        self.counts = {
+            state: registry.gauge(f"positions.{state.value}") for state in PositionState if state is not PositionState.CLOSED
+        }
+        self.opened = registry.counter("positions.opened")
+        self.closed = registry.counter("positions.closed")
+        self.rejected = registry.counter("positions.rejected")
+        self.stale = registry.counter("positions.stale_buys")
+        self.failed_buys = registry.counter("positions.failed_buys")
+        self.sold = registry.counter("positions.sold")
+        self.early_exits = registry.counter("positions.early_exits")
+        self.partial_sells = registry.counter("positions.partial_sells")
+        self.sell_retries = registry.counter("positions.sell_retries")
+        self.abandoned = registry.counter("positions.abandoned")
+        self.hold_time = registry.histogram("positions.hold_time")
+
+    def __len__(self):
+        return len(self.positions)
+
+    def accepting(self) -> bool:
+        return len(self.positions) < self.max_open and not self._buys.full()
+
+    def open(self, mint: str) -> bool:
+        """Queue a buy for ``mint``. False if it is already open or we are at capacity."""
+        if mint in self.positions or not self.accepting():
+            self.rejected.inc()
+            return False
+        position = self.positions[mint] = Position(mint, self.clock())
+        self._buys.put_nowait(position)
+        self._count(None, PositionState.PENDING_BUY)
+        return True
+
+    def exit(self, mint: str, percentage: int = 100) -> bool:
+        """Sell ``percentage`` of a held position now instead of at its
+        deadline. A full exit moves it to exiting; after a partial one it
+        stays held. False if it is not held or a sell is already queued."""
+        position = self.positions.get(mint)
+        if position is None or position.state is not PositionState.HELD or position.selling:
+            return False
+        if percentage >= 100:
+            # Its deadline entry goes stale and is skipped
+            position.due = None
+            self._transition(position, PositionState.EXITING)
+            percentage = 100
+        position.percentage = percentage
+        position.selling = True
+        self._sells.put_nowait(position)
+        self.early_exits.inc()
+        return True
+
+    def _count(self, old: Optional[PositionState], new: PositionState):
+        if old is not None:
+            self.counts[old].value -= 1
+        if new is PositionState.CLOSED:
+            self.closed.inc()
+        else:
+            self.counts[new].value += 1
+
+    def _transition(self, position: Position, state: PositionState):
+        self._count(position.state, state)
+        position.state = state
+
+    def _schedule(self, position: Position, at: float):
+        position.due = at
+        heapq.heappush(self._deadlines, (at, next(self._sequence), position))
+        if self._wakeup is not None and not self._wakeup.done() and self._deadlines[0][2] is position:
+            self._wakeup.set_result(None)
+
+    def next_deadline(self) -> Optional[float]:
+        return self._deadlines[0][0] if self._deadlines else None
+
+    def expire(self, now: float) -> int:
+        """Queue sells for every deadline at or before ``now``."""
+        fired = 0
+        while self._deadlines and self._deadlines[0][0] <= now:
+            at, _, position = heapq.heappop(self._deadlines)
+            if position.due != at or position.state is PositionState.CLOSED:
+                continue
+            if position.selling:
+                # A partial sell is in flight; sell the rest once it is done
+                self._schedule(position, now + PARTIAL_SELL_WAIT)
+                continue
+            position.due = None
+            if position.state is PositionState.HELD:
+                self._transition(position, PositionState.EXITING)
+            position.percentage = 100
+            position.selling = True
+            self._sells.put_nowait(position)
+            fired += 1
+        return fired
+
+    async def _close(self, position: Position):
+        self._transition(position, PositionState.CLOSED)
+        position.due = None
+        self.positions.pop(position.mint, None)
+        if position.opened_at is not None:
+            self.hold_time.record(self.clock() - position.opened_at)
+        if self.on_close is not None:
+            try:
+                await self.on_close(position)
+            except _FATAL:
+                raise
+            except BaseException as e:
+                log.error(f"Error closing position {position.mint}: {e!r}")
+
+    async def _buy_worker(self):
+        while True:
+            position = await self._buys.get()
+            try:
+                await self._buy_one(position)
+            except _FATAL:
+                raise
+            except BaseException as e:
+                log.error(f"Critical error buying {position.mint}: {e!r}")
+                if position.state is PositionState.PENDING_BUY:
+                    self.failed_buys.inc()
+                    await self._close(position)
+            finally:
+                self._buys.task_done()
+
+    async def _buy_one(self, position: Position):
+        if self.clock() - position.created_at > self.buy_timeout:
+            self.stale.inc()
+            await self._close(position)
+            return
+        if not await self.buy(position.mint):
+            log.error(f"Failed to buy {position.mint}")
+            self.failed_buys.inc()
+            await self._close(position)
+            return
+        position.opened_at = self.clock()
+        self.opened.inc()
+        self._transition(position, PositionState.HELD)
+        self._schedule(position, position.opened_at + self.hold)
+
+    async def _sell_worker(self):
+        while True:
+            position = await self._sells.get()
+            try:
+                await self._sell_one(position)
+            except _FATAL:
+                raise
+            except BaseException as e:
+                log.error(f"Critical error selling {position.mint}: {e!r}")
+                position.selling = False
+                if position.percentage < 100:
+                    # Partial sells are not retried; see _sell_part
+                    position.percentage = 100
+                elif position.state is not PositionState.CLOSED:
+                    await self._retry_sell(position)
+            finally:
+                self._sells.task_done()
+
+    async def _sell_one(self, position: Position):
+        percentage = position.percentage
+        if percentage < 100:
+            await self._sell_part(position, percentage)
+            return
+        position.attempts += 1
+        try:
+            sold = await self.sell(position.mint, 100)
+        except _FATAL:
+            raise
+        except BaseException as e:
+            log.error(f"Sale attempt {position.attempts} failed with error: {e!r}")
+            sold = False
+        position.selling = False
+        if sold:
+            self.sold.inc()
+            await self._close(position)
+            return
+        await self._retry_sell(position)
+
+    async def _retry_sell(self, position: Position):
+        now = self.clock()
+        if position.attempts >= self.sell_attempts or now - position.opened_at > self.max_age:
+            log.error(f"Failed to sell {position.mint} after {position.attempts} attempts, abandoning")
+            self.abandoned.inc()
+            await self._close(position)
+            return
+        self.sell_retries.inc()
+        self._schedule(position, now + retry_delay(position.attempts))
+
+    async def _sell_part(self, position: Position, percentage: int):
+        # A failed partial sell is not retried here; the caller of ``exit`` decides
+        try:
+            sold = await self.sell(position.mint, percentage)
+        except _FATAL:
+            raise
+        except BaseException as e:
+            log.error(f"Partial sale of {position.mint} failed with error: {e!r}")
+            sold = False
+        position.selling = False
+        position.percentage = 100
+        if sold:
+            self.partial_sells.inc()
+
+    async def _timer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup = loop.create_future()
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else deadline - self.clock()
+            if timeout is None or timeout > 0:
+                await asyncio.wait((self._wakeup,), timeout=timeout)
+            self.expire(self.clock())
+
+    async def settle(self):
+        """Wait until every queued buy and sell has been executed."""
+        await self._buys.join()
+        await self._sells.join()
+
+    async def run(self, timers: bool = True):
+        workers = [asyncio.create_task(self._buy_worker()) for _ in range(self.buy_concurrency)]
+        workers += [asyncio.create_task(self._sell_worker()) for _ in range(self.sell_concurrency)]
+        if timers:
+            workers.append(asyncio.create_task(self._timer()))
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self._wakeup = None
+
+    def stats(self) -> dict:
+        stats = {state.value: int(gauge.value) for state, gauge in self.counts.items()}
+        stats.update(
+            closed=self.closed.value,
+            opened=self.opened.value,
+            rejected=self.rejected.value,
+            stale_buys=self.stale.value,
+            failed_buys=self.failed_buys.value,
+            sold=self.sold.value,
+            early_exits=self.early_exits.value,
+            partial_sells=self.partial_sells.value,
+            sell_retries=self.sell_retries.value,
+            abandoned=self.abandoned.value,
+            deadlines=len(self._deadlines),
+        )
+        return stats
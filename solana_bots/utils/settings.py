@@ -0,0 +1,153 @@
+import json
+import os
+from dataclasses import dataclass, field, fields
+from functools import cached_property
+from typing import Dict, List, Mapping, Optional
+
+from solders.keypair import Keypair  # type: ignore
+
+
+def _split(value) -> List[str]:
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+
+_PARSERS = {
+    str: str,
+    Optional[str]: str,
+    int: int,
+    Optional[int]: int,
+    List[str]: _split,
+}
+
+
+def _env(name: str, default=None, factory=None, secret: bool = False):
+    if factory is not None:
+        return field(default_factory=factory, repr=not secret, metadata={"env": name})
+    return field(default=default, repr=not secret, metadata={"env": name})
+
+
+@dataclass
+class Settings:
+    """Bot configuration, read once from the environment.
+
+    ``load`` layers three sources, later ones winning: the JSON object in
+    ``SETTINGS_FILE`` (keys are the environment variable names), a
+    ``.env`` file and the process environment. Keypairs are only parsed
+    when first used, so loading settings needs no secrets.
+    """
+
+    rpc_url: Optional[str] = _env("RPC_HTTPS_URL")
+    # Comma-separated logsSubscribe websockets, deduplicated by the fan-in
+    wss_urls: List[str] = _env("WSS_HTTPS_URL", factory=list)
+    key_pair: Optional[str] = _env("KEY_PAIR", secret=True)
+    # Extra base58 keypairs to trade from alongside KEY_PAIR
+    extra_key_pairs: List[str] = _env("EXTRA_KEY_PAIRS", factory=list, secret=True)
+    # RPC/sender endpoints every order is raced across; defaults to rpc_url
+    send_rpc_urls: List[str] = _env("SEND_RPC_URLS", factory=list)
+    # Record accepted websocket frames here for replay; ".zst" files are compressed
+    record_path: Optional[str] = _env("RECORD_PATH")
+    # Directory for the launch/trade event store; disabled when unset
+    event_store_dir: Optional[str] = _env("EVENT_STORE_DIR")
+    # debug, info, warning or error
+    log_level: str = _env("LOG_LEVEL", "info")
+    # Serve Prometheus metrics on 127.0.0.1:metrics_port/metrics; disabled when unset
+    metrics_port: Optional[int] = _env("METRICS_PORT")
+    # Bounds on the compute unit price the fee oracle may bid
+    min_unit_price: int = _env("MIN_UNIT_PRICE", 1000)
+    max_unit_price: int = _env("MAX_UNIT_PRICE", 2_000_000)
+    # How new positions pick a wallet: least_loaded, round_robin or balance_aware
+    wallet_policy: str = _env("WALLET_POLICY", "least_loaded")
+    # Trader processes fed by a separate ingestion process; 0 runs everything in one process
+    trader_processes: int = _env("TRADER_PROCESSES", 0)
+    # Pre-trade rules (utils/rules.py); each is off while unset.
+    # Creators whose launches are always bought, or never (the file holds one pubkey per line)
+    creator_whitelist: List[str] = _env("CREATOR_WHITELIST", factory=list)
+    creator_blacklist: List[str] = _env("CREATOR_BLACKLIST", factory=list)
+    creator_blacklist_file: Optional[str] = _env("CREATOR_BLACKLIST_FILE")
+    # Skip creators with more launches than this in the last creator_window seconds
+    max_creator_launches: Optional[int] = _env("MAX_CREATOR_LAUNCHES")
+    creator_window: int = _env("CREATOR_WINDOW", 3600)
+    # Bounds on the creator's first buy, in lamports
+    min_dev_buy: Optional[int] = _env("MIN_DEV_BUY")
+    max_dev_buy: Optional[int] = _env("MAX_DEV_BUY")
+    # Skip launches whose name or symbol matches this regex
+    name_deny: Optional[str] = _env("NAME_DENY")
+    # Rules still unevaluated after this many microseconds are skipped
+    rule_budget_us: int = _env("RULE_BUDGET_US", 200)
+    # Exits (utils/exits.py), in percent of cost. Take-profit tiers are
+    # gain:percentage pairs, e.g. "100:50,300:100" sells half at +100% and the rest at +300%
+    take_profit: List[str] = _env("TAKE_PROFIT", factory=list)
+    stop_loss: Optional[int] = _env("STOP_LOSS")
+    # Sell once the value falls this far from its peak, after a trailing_activation gain
+    trailing_stop: Optional[int] = _env("TRAILING_STOP")
+    trailing_activation: int = _env("TRAILING_ACTIVATION", 0)
+    # Time stop: seconds a position is held before it is sold whatever the price
+    max_hold: int = _env("MAX_HOLD", 30)
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, object]) -> "Settings":
+        """Settings from environment-style names; unset and empty values keep their defaults."""
+        kwargs = {}
+        for f in fields(cls):
+            value = values.get(f.metadata["env"])
+            if value is None or value == "":
+                continue
+            try:
+                kwargs[f.name] = _PARSERS[f.type](value)
+            except ValueError as e:
+                raise ValueError(f"Invalid {f.metadata['env']}: {e}") from None
+        return cls(**kwargs)
+
+    @classmethod
+    def load(
+        cls,
+        environ: Optional[Mapping[str, str]] = None,
+        env_file: Optional[str] = ".env",
+        path: Optional[str] = None,
+    ) -> "Settings":
+        environ = os.environ if environ is None else environ
+        values: Dict[str, object] = {}
+        path = path or environ.get("SETTINGS_FILE")
+        if path:
+            with open(path) as f:
+                values.update(json.load(f))
+        if env_file and os.path.exists(env_file):
+            from dotenv import dotenv_values
+
+            values.update(dotenv_values(env_file))
+        values.update(environ)
+        return cls.from_mapping(values)
+
+    @property
+    def exits_enabled(self) -> bool:
+        return bool(self.take_profit or self.stop_loss is not None or self.trailing_stop is not None)
+
+    @cached_property
+    def payer_keypair(self) -> Keypair:
+        if not self.key_pair:
+            raise ValueError("KEY_PAIR must be set in .env file")
+        return Keypair.from_base58_string(self.key_pair)
+
+    @cached_property
+    def payer_keypairs(self) -> List[Keypair]:
+        return [self.payer_keypair] + [Keypair.from_base58_string(key) for key in self.extra_key_pairs]
+
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """The process-wide settings, loaded on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings.load()
+    return _settings
+
+
+def configure(settings: Settings) -> Settings:
+    """Replace the process-wide settings, e.g. for a dry run."""
+    global _settings
+    _settings = settings
+    return settings
@@ -0,0 +1,279 @@
+"""Local stand-ins for Solana RPC endpoints, used by benchmarks and dry runs."""
+import asyncio
+import base64
+import json
+import math
+import os
+import random
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import websockets
+from aiohttp import web
+from solders.pubkey import Pubkey  # type: ignore
+
+from . import curve_math
+from .constants import INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES, PUMP_FUN_PROGRAM
+from .events import encode_create_event, encode_trade_event
+
+
+def lognormal(median: float, sigma: float = 0.5) -> Callable[[], float]:
+    """Latency sampler with a long right tail, like RPC round trips."""
+    mu = math.log(median)
+    return lambda: random.lognormvariate(mu, sigma)
+
+
+def pump_mint() -> Pubkey:
+    """A random mint ending in "pump", like the ones launches grind for."""
+    while True:
+        candidate = str(Pubkey(os.urandom(32)))[:-4] + "pump"
+        try:
+            key = Pubkey.from_string(candidate)
+        except ValueError:
+            continue
+        if str(key) == candidate:
+            return key
+
+
+def launch_frame(slot: int, index: int = 0, dev_buy: int = 10**9) -> str:
+    """A ``logsNotification`` for a pump.fun create with a ``dev_buy``
+    lamport first buy, shaped like live traffic."""
+    mint, bonding_curve, user = pump_mint(), Pubkey(os.urandom(32)), Pubkey(os.urandom(32))
+    create = encode_create_event(f"Token {index}", f"TK{index}", f"https://example.invalid/{index}", mint, bonding_curve, user)
+    tokens = curve_math.tokens_for_sol(dev_buy, INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES)
+    virtual_sol, virtual_token = curve_math.apply_buy(tokens, INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES)
+    trade = encode_trade_event(mint, dev_buy, tokens, True, user, 1_700_000_000 + slot, virtual_sol, virtual_token)
+    program = str(PUMP_FUN_PROGRAM)
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "method": "logsNotification",
+        "params": {
+            "result": {
+                "context": {"slot": slot},
+                "value": {"signature": base64.b32encode(os.urandom(40)).decode(), "err": None, "logs": [
+                    f"Program {program} invoke [1]",
+                    "Program log: Instruction: Create",
+                    "Program log: Instruction: InitializeMint2",
+                    "Program log: IX: Create Metadata Accounts v3",
+                    "Program data: " + base64.b64encode(create).decode(),
+                    "Program log: Instruction: Buy",
+                    "Program data: " + base64.b64encode(trade).decode(),
+                    f"Program {program} success",
+                ]},
+            },
+            "subscription": 1,
+        },
+    })
+
+
+class WebsocketStandIn:
+    """A local ``logsSubscribe`` websocket that replays recorded frames.
+
+    Frames are sent at ``rate`` per second (as fast as possible when None),
+    each held back by ``delay`` plus up to ``jitter`` seconds. With
+    ``disconnect_after`` set the server drops the connection after that many
+    frames; replay resumes where it stopped on the next connection.
+    Connections that open with any other subscription (account or
+    signature updates) get subscription ids but no notifications.
+    """
+
+    def __init__(
+        self,
+        frames: List[str],
+        rate: Optional[float] = 1000.0,
+        delay: float = 0.0,
+        jitter: float = 0.0,
+        disconnect_after: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.frames = frames
+        self.rate = rate
+        self.delay = delay
+        self.jitter = jitter
+        self.disconnect_after = disconnect_after
+        self.host = host
+        self.port = port
+        self.cursor = 0
+        self.connections = 0
+        self.server = None
+        self.finished = asyncio.Event()
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        self.server = await websockets.serve(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _handle(self, websocket, path=None):
+        self.connections += 1
+        subscribe = json.loads(await websocket.recv())
+        if subscribe.get("method") != "logsSubscribe":
+            await self._acknowledge(websocket, subscribe)
+            return
+        await websocket.send(json.dumps({"jsonrpc": "2.0", "result": self.connections, "id": subscribe.get("id")}))
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        sent = 0
+        while self.cursor < len(self.frames):
+            if self.disconnect_after is not None and sent >= self.disconnect_after:
+                await websocket.close()
+                return
+            if self.rate:
+                due = start + sent / self.rate + self.delay + random.uniform(0, self.jitter)
+                wait = due - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            elif sent % 256 == 0:
+                await asyncio.sleep(0)
+            await websocket.send(self.frames[self.cursor])
+            self.cursor += 1
+            sent += 1
+        self.finished.set()
+        await websocket.wait_closed()
+
+    async def _acknowledge(self, websocket, request: dict):
+        subscription = 0
+        try:
+            while True:
+                subscription += 1
+                await websocket.send(json.dumps({"jsonrpc": "2.0", "result": subscription, "id": request.get("id")}))
+                request = json.loads(await websocket.recv())
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+class JsonRpcStandIn:
+    """A local JSON-RPC HTTP endpoint answering from ``handlers``.
+
+    Each handler maps a method name to a callable taking the request params
+    and returning the ``result``; a handler that raises produces a JSON-RPC
+    error with the exception's message. Single and batched requests are
+    both accepted; every POST waits ``latency`` (seconds, or a sampler such
+    as ``lognormal``) plus up to ``jitter`` seconds before answering.
+    ``posts`` and ``requests`` count round trips and individual calls per
+    method.
+
+    Failures are injected at random: ``http_error_rate`` of POSTs get a 503
+    and ``error_rate`` of calls a JSON-RPC error instead of their result,
+    limited to ``fail_methods`` when given. ``injected`` counts both.
+    """
+
+    def __init__(
+        self,
+        handlers: Optional[Dict[str, Callable[[list], object]]] = None,
+        latency: Union[float, Callable[[], float]] = 0.0,
+        jitter: float = 0.0,
+        slot: int = 1,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        error_rate: float = 0.0,
+        http_error_rate: float = 0.0,
+        fail_methods: Optional[Iterable[str]] = None,
+    ):
+        self.handlers = {**self.default_handlers(), **(handlers or {})}
+        self.latency = latency
+        self.jitter = jitter
+        self.slot = slot
+        self.host = host
+        self.port = port
+        self.error_rate = error_rate
+        self.http_error_rate = http_error_rate
+        self.fail_methods = set(fail_methods) if fail_methods is not None else None
+        self.posts = 0
+        self.requests: Dict[str, int] = {}
+        self.injected = {"http": 0, "rpc": 0}
+        self.runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def context(self, value) -> dict:
+        return {"context": {"slot": self.slot}, "value": value}
+
+    def default_handlers(self) -> Dict[str, Callable[[list], object]]:
+        return {
+            "getHealth": lambda params: "ok",
+            "getSlot": lambda params: self.slot,
+            "getBalance": lambda params: self.context(1_000_000_000),
+            "getLatestBlockhash": lambda params: self.context(
+                {"blockhash": "4NCYB3kRT8sCNodPNuCZo8VUh4xqpBQxsxed2wd9xaD4", "lastValidBlockHeight": self.slot + 150}
+            ),
+            "getAccountInfo": lambda params: self.context(None),
+            "getMultipleAccounts": lambda params: self.context([None] * len(params[0])),
+            "getSignatureStatuses": lambda params: self.context(
+                [{"slot": self.slot, "confirmations": None, "err": None, "status": {"Ok": None},
+                  "confirmationStatus": "confirmed"} for _ in params[0]]
+            ),
+        }
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        self.port = self.runner.addresses[0][1]
+        return self
+
+    async def close(self):
+        if self.runner:
+            await self.runner.cleanup()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _answer(self, request: dict) -> dict:
+        method = request.get("method")
+        self.requests[method] = self.requests.get(method, 0) + 1
+        handler = self.handlers.get(method)
+        if handler is None:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": "Method not found"}}
+        if (
+            self.error_rate
+            and (self.fail_methods is None or method in self.fail_methods)
+            and random.random() < self.error_rate
+        ):
+            self.injected["rpc"] += 1
+            # As a real node reports it; solders requires the data field
+            error = {"code": -32005, "message": "Node is unhealthy", "data": {"numSlotsBehind": None}}
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": error}
+        try:
+            result = handler(request.get("params") or [])
+        except Exception as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32002, "message": str(e)}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.posts += 1
+        body = await request.json()
+        delay = self.latency() if callable(self.latency) else self.latency
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.http_error_rate and random.random() < self.http_error_rate:
+            self.injected["http"] += 1
+            return web.Response(status=503, text="Service Unavailable")
+        if isinstance(body, list):
+            return web.json_response([self._answer(item) for item in body])
+        return web.json_response(self._answer(body))
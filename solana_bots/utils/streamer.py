@@ -1,66 +1,92 @@
 from solana.rpc.async_api import AsyncClient
 import asyncio
 import websockets
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict, Optional
 from .constants import request
 from .trader import TokenTrader
 import json
-from termcolor import cprint
-from solders.pubkey import Pubkey #type: ignore
-import base64
-import os
+from .logsink import log
+import time
 from .base_class import BaseClass
 from .coin import Coin
+from .events import CreateEvent, TradeEvent, decode_create_log, decode_trade_log, scan_trade_events
+from .prefilter import FramePrefilter, extract_logs, extract_slot, scan_slot
+from .pipeline import FrameQueue, OverflowPolicy
+from .metrics import DISPATCHED, PARSED, SOLD, registry, tracer
+from .fanin import Backoff, FanIn
+from .rpc import get_transport
+from .recorder import FrameRecorder
+from .rules import RuleEngine
+from .scheduler import Position, PositionScheduler
+from .settings import get_settings
+from solders.keypair import Keypair #type: ignore
+
+if TYPE_CHECKING:
+    # NumPy-backed; only imported by callers that enable them
+    from .event_store import EventStore
+    from .exits import ExitEngine
+
+# Default time stop: how long a position is held before selling
+HOLD_SECONDS = 30
+
+
+async def supervise(tasks: List[asyncio.Task]) -> asyncio.Task:
+    """Wait until one of ``tasks`` finishes and return it, re-raising its
+    error. Background tasks live as long as the bot, and one that dies must
+    stop it loudly rather than leave it ingesting with nothing buying or
+    selling."""
+    done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    for task in done:
+        if not task.cancelled() and task.exception() is not None:
+            log.error(f"Task {task.get_name()} died: {task.exception()!r}")
+            raise task.exception()
+    return done.pop()
+
+
+def start_tasks(coros) -> List[asyncio.Task]:
+    return [asyncio.create_task(coro, name=coro.__qualname__) for coro in coros]
+
+
+class FrameIngest:
+    """Reads launch frames from the websocket fan-in, decodes them and hands
+    every launch to ``dispatch``.
+
+    ``Streamer`` trades launches in this process; ``ShardRouter`` (see
+    utils/multiproc.py) forwards them to trader processes instead. With
+    ``rules`` set, only launches the ``RuleEngine`` accepts go further.
+    """
+
+    def __init__(
+        self,
+        prefilter: Optional[FramePrefilter] = None,
+        queue_size: int = 1024,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        workers: int = 2,
+        recorder: Optional[FrameRecorder] = None,
+        events: Optional["EventStore"] = None,
+        rules: Optional[RuleEngine] = None,
+    ):
+        self.prefilter = prefilter or FramePrefilter()
+        self.frames = FrameQueue(queue_size, overflow)
+        self.workers = workers
+        self.recorder = recorder
+        self.events = events
+        self.rules = rules
+        self.fanin: Optional[FanIn] = None
+
+    def ingest_stats(self) -> dict:
+        stats = self.frames.stats()
+        if self.fanin:
+            stats["endpoints"] = self.fanin.summary()
+        return stats
+
+    def parse_log_data(self, log_data: str) -> Optional[CreateEvent]:
+        event = decode_create_log(log_data)
+        # Only return if mint contains "pump"
+        if event is not None and "pump" in str(event.mint).lower():
+            return event
+        return None
 
-        
-class Streamer(BaseClass):
-    def __init__(self, rpc_url: str):
-        self.rpc_url = rpc_url
-        self.coin = Coin(rpc_url)
-        self.token_trader = TokenTrader(rpc_url, self.coin)
-        self.active_trades: Dict[str, asyncio.Task] = {}
-        super().__init__(rpc_url, max_concurrent=2)
-        self.monitoring_task = asyncio.create_task(self.monitor_trades())
-        
-    async def monitor_trades(self):
-        while True:
-            try:
-                current_time = asyncio.get_event_loop().time()
-                for mint, task in list(self.active_trades.items()):
-                    if not task.done() and (current_time - task.get_coro().cr_frame.f_locals.get('start_time', current_time)) > 300:
-                        cprint(f"Trade {mint} has been active for more than 300 seconds, cancelling...", "red")
-                        task.cancel()
-                        del self.active_trades[mint]
-            except Exception as e:
-                cprint(f"Error monitoring trades: {e}", "red")
-            await asyncio.sleep(60) 
-                
-    
-    def parse_log_data(self, log_data: str) -> tuple[str, str, str]:
-        try:
-            decoded = base64.b64decode(log_data.replace("Program data: ", ""))
-            
-            length = len(decoded)
-            
-            if length >= 180:
-                # Extract addresses from the end of the decoded data
-                user_bytes = decoded[length-32:length]
-                bc_bytes = decoded[length-64:length-32]
-                mint_bytes = decoded[length-96:length-64]
-                
-            # Convert to Solana public keys
-                user = str(Pubkey(user_bytes))
-                bc_pk = str(Pubkey(bc_bytes))
-                mint = str(Pubkey(mint_bytes))
-          
-            # Only return if mint contains "pump"
-                if "pump" in mint.lower():
-                    return mint, bc_pk, user
-                
-        except Exception as e:
-            print(f"Error parsing log data: {e}")
-        return None, None, None
-        
     def is_valid_stream(self, logs: List):
         has_init = False
         for msg in logs:
@@ -68,87 +94,235 @@ class Streamer(BaseClass):
                 has_init = True
                 break
         return has_init
-                
-    async def handle_token_trade(self, mint: str):
-        """Handle complete trade cycle for a token"""
-        if mint in self.active_trades:
-            cprint(f"Trade already active for {mint}", "red")
+
+    def record_trades(self, message):
+        trades = scan_trade_events(message)
+        if trades:
+            slot = scan_slot(message if isinstance(message, str) else message.decode())
+            for trade in trades:
+                self.events.append_trade(trade, slot)
+
+    def process_frame(self, message, received_at: float):
+        if self.events is not None:
+            self.record_trades(message)
+        parsed = self.prefilter(message)
+        if parsed is None:
             return
-        
-        try:
-            self.active_trades[mint] = asyncio.current_task()
-            async with self.semaphore:
-                
-                buy_succes = await self.token_trader.buy(mint)
-                if not buy_succes:
-                    cprint(f"Failed to buy {mint}", "red")
-                    return
-                
-                await asyncio.sleep(30)
-                
-                # Aggressive sell retry logic
-                for attempt in range(10):
-                    try:
-                        sale_response = await self.token_trader.sell(mint)
-                        if sale_response:
-                            cprint(f"Successfully sold {mint} on attempt {attempt + 1}", "magenta")
-                            break
-                        
-                        await asyncio.sleep(5)
-                            
-                    except Exception as e:
-                        cprint(f"Sale attempt {attempt + 1} failed with error: {e}", "red")
-                        if attempt == 9:
-                            cprint(f"Failed to sell {mint} after 10 attempts", "red")
-                        elif attempt < 9:
-                            backoff = min(2 * (2 ** attempt), 10)
-                            await asyncio.sleep(backoff)
-        except Exception as e:
-            cprint(f"Critical error trading {mint}: {e}", "red")
-        finally:
-            if mint in self.active_trades:
-                del self.active_trades[mint]
-       
-    async def stream_transactions(self):
-        wss_url = os.getenv("WSS_HTTPS_URL")
-        if not wss_url:
-            raise ValueError("WSS_HTTPS_URL must be set in .env file")
-        
+        logs = extract_logs(parsed)
+
+        if not logs or not self.is_valid_stream(logs):
+            return
+
+        launches = []
+        dev_trade = None
+        for line in logs:
+            if "Program data:" in line:
+                event = self.parse_log_data(line)
+                if event:
+                    launches.append(event)
+                elif dev_trade is None:
+                    dev_trade = decode_trade_log(line)
+
+        slot = extract_slot(parsed)
+        for event in launches:
+            mint = str(event.mint)
+            tracer.begin(mint, received_at)
+            tracer.mark(mint, PARSED)
+            self.dispatch(event, received_at, slot, dev_trade)
+
+    def dispatch(self, event: CreateEvent, received_at: float, slot: int = 0, dev_trade: Optional[TradeEvent] = None) -> bool:
+        """Record the launch and return whether it should be traded."""
+        log.info(f"Mint: {event.mint}, BC: {event.bonding_curve}, User: {event.user}", "blue")
+        if self.events is not None:
+            self.events.append_launch(event, slot)
+        if self.rules is not None:
+            rejected_by = self.rules.evaluate(event, dev_trade)
+            if rejected_by is not None:
+                log.debug(f"Skipping {event.mint}: {rejected_by}")
+                tracer.end(str(event.mint))
+                return False
+        return True
+
+    async def process_frames(self):
+        while True:
+            received_at, message = await self.frames.get()
+            try:
+                self.process_frame(message, received_at)
+            except Exception as e:
+                log.error(f"Error processing message: {e}")
+
+    async def read_frames(self, wss_url: str, label: str):
+        stats = self.fanin.stats[label]
+        backoff = Backoff()
         while True:
             try:
                 async with websockets.connect(wss_url) as websocket:
-                    cprint("WebSocket connected", "green")
-                    cprint("👀 Monitoring for new tokens...", "green")
-                    
+                    log.info(f"WebSocket connected: {label}", "green")
+                    log.info("👀 Monitoring for new tokens...", "green")
+
                     await websocket.send(json.dumps(request))
+                    stats.connected = True
 
                     async for message in websocket:
-                        try:
-                            if self.semaphore.locked():
-                                continue
-                            parsed = json.loads(message)
-                            logs = parsed.get("params", {}).get("result", {}).get("value", {}).get("logs", [])
-                            
-                            if not logs or not self.is_valid_stream(logs):
-                                continue
-                            
-                            for log in logs:
-                                if "Program data:" in log:
-                                    mint, bc_pk, user = self.parse_log_data(log)
-                                    cprint(f"Mint: {mint}, BC: {bc_pk}, User: {user}", "blue")
-                                    if mint:
-                                       asyncio.create_task(self.handle_token_trade(mint))
-                                    
-                        except json.JSONDecodeError:
-                            cprint("Error decoding websocket message", "red")
-                        except Exception as e:
-                            cprint(f"Error processing message: {e}", "red")
-                            
+                        received_at = time.monotonic()
+                        if backoff.attempt:
+                            backoff.reset()
+                        if self.fanin.accept(label, message, received_at):
+                            if self.recorder is not None:
+                                self.recorder.write(message, received_at)
+                            await self.frames.put(message, received_at)
+
             except websockets.exceptions.ConnectionClosed:
-                cprint("Connection closed, attempting to reconnect...", "red")
-                await asyncio.sleep(5)
+                log.error(f"Connection to {label} closed, attempting to reconnect...")
+            except Exception as e:
+                log.error(f"Error on {label}: {e}")
+            stats.connected = False
+            stats.reconnects.inc()
+            await asyncio.sleep(backoff.next_delay())
+
+    def background(self, wss_urls: List[str]) -> list:
+        """Coroutines that run alongside the frame readers."""
+        return [log.run()]
+
+    async def stream_transactions(self, wss_urls: Optional[List[str]] = None):
+        wss_urls = wss_urls or get_settings().wss_urls
+        if not wss_urls:
+            raise ValueError("WSS_HTTPS_URL must be set in .env file")
+
+        self.fanin = FanIn(wss_urls)
+        tasks = start_tasks(self.process_frames() for _ in range(self.workers))
+        tasks += start_tasks(self.background(wss_urls))
+        tasks += start_tasks(self.read_frames(url, label) for url, label in self.fanin.endpoints)
+        try:
+            # Every task runs until cancelled, so any that finishes is a failure
+            finished = await supervise(tasks)
+            raise RuntimeError(f"Task {finished.get_name()} stopped")
+        finally:
+            for task in tasks:
+                task.cancel()
+            if self.recorder is not None:
+                self.recorder.flush()
+
+
+class Streamer(FrameIngest, BaseClass):
+    def __init__(
+        self,
+        rpc_url: str,
+        prefilter: Optional[FramePrefilter] = None,
+        queue_size: int = 1024,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        workers: int = 2,
+        recorder: Optional[FrameRecorder] = None,
+        events: Optional["EventStore"] = None,
+        keypairs: Optional[List[Keypair]] = None,
+        rules: Optional[RuleEngine] = None,
+        exits: Optional["ExitEngine"] = None,
+    ):
+        FrameIngest.__init__(self, prefilter, queue_size, overflow, workers, recorder, events, rules)
+        self.rpc_url = rpc_url
+        self.skipped_busy = registry.counter("dispatch.skipped_busy")
+        self.coin = Coin(rpc_url)
+        self.token_trader = TokenTrader(rpc_url, self.coin, keypairs=keypairs)
+        # Wallets trade independently, so order concurrency scales with them
+        wallets = len(self.token_trader.wallets)
+        self.scheduler = PositionScheduler(
+            self.buy, self.sell, self.position_closed, hold=get_settings().max_hold,
+            buy_concurrency=2 * wallets, sell_concurrency=4 * wallets,
+        )
+        # Price exits run off the curve updates of held positions; the time stop is the hold
+        self.exits = exits
+        if exits is not None:
+            exits.on_exit = self.scheduler.exit
+            self.coin.curves.listeners.append(exits.update)
+        BaseClass.__init__(self, rpc_url)
+
+    async def monitor_trades(self):
+        while True:
+            try:
+                await self.token_trader.wallets.refresh()
+                log.info(f"Wallets: {self.token_trader.wallets.stats()}", "blue")
+                log.info(f"Positions: {self.scheduler.stats()}", "blue")
+                log.info(f"Frames: {self.prefilter.stats()}", "blue")
+                log.info(f"Ingest: {self.ingest_stats()}", "blue")
+                log.info(f"Blockhash: {self.token_trader.blockhashes.stats()}", "blue")
+                log.info(f"RPC: {get_transport(self.rpc_url).stats()}", "blue")
+                log.info(f"Submit: {self.token_trader.submitter.stats()}", "blue")
+                log.info(f"Fees: {self.token_trader.fees.stats()}", "blue")
+                if self.events is not None:
+                    log.info(f"Events: {self.events.stats()}", "blue")
+                if self.rules is not None:
+                    log.info(f"Rules: {self.rules.stats()}", "blue")
+                if self.exits is not None:
+                    log.info(f"Exits: {self.exits.stats()}", "blue")
             except Exception as e:
-                cprint(f"Error: {e}", "red")
-                await asyncio.sleep(5)
-            
+                log.error(f"Error monitoring trades: {e}")
+            await asyncio.sleep(60)
+
+
+    def ingest_stats(self) -> dict:
+        stats = super().ingest_stats()
+        stats["skipped_busy"] = self.skipped_busy.value
+        return stats
+
+    async def buy(self, mint: str) -> bool:
+        await self.coin.track_curve(mint)
+        bought = await self.token_trader.buy(mint)
+        if bought and self.exits is not None:
+            held = self.holding(mint)
+            accounts = self.coin.get_accounts(mint)
+            if held is not None and accounts is not None:
+                state = self.coin.curves.entries.get(accounts.bonding_curve)
+                self.exits.open(mint, accounts.bonding_curve, held.balance or 0, held.cost, state)
+        return bought
+
+    async def sell(self, mint: str, percentage: int = 100) -> bool:
+        sold = await self.token_trader.sell(mint, percentage)
+        if percentage < 100:
+            if self.exits is not None:
+                held = self.holding(mint)
+                if sold and held is not None:
+                    self.exits.sold(mint, held.balance or 0, held.cost)
+                else:
+                    self.exits.failed(mint)
+            return sold
+        if sold:
+            tracer.mark(mint, SOLD)
+            log.info(f"Successfully sold {mint}", "magenta")
+        return sold
+
+    def holding(self, mint: str):
+        """Our token position in ``mint``, in whichever wallet holds it."""
+        wallet = self.token_trader.wallets.wallet_for(mint)
+        return wallet.positions.positions.get(mint) if wallet is not None else None
+
+    async def position_closed(self, position: Position):
+        if self.exits is not None:
+            self.exits.close(position.mint)
+        await self.coin.release_curve(position.mint)
+        self.token_trader.wallets.release(position.mint)
+        tracer.end(position.mint)
+
+    def dispatch(self, event: CreateEvent, received_at: float, slot: int = 0, dev_trade: Optional[TradeEvent] = None):
+        if super().dispatch(event, received_at, slot, dev_trade):
+            self.open_position(event, received_at, slot, dev_trade)
+
+    def open_position(self, event: CreateEvent, received_at: float, slot: int = 0, dev_trade: Optional[TradeEvent] = None):
+        mint = str(event.mint)
+        if not self.scheduler.accepting():
+            self.skipped_busy.inc()
+            tracer.end(mint)
+            return
+        self.coin.register_launch(event, slot, dev_trade)
+        self.frames.record_dispatch(received_at)
+        tracer.mark(mint, DISPATCHED)
+        self.scheduler.open(mint)
 
+    def background(self, wss_urls: List[str]) -> list:
+        return super().background(wss_urls) + [
+            self.coin.subscriptions.run(wss_urls[0]),
+            self.token_trader.blockhashes.run(),
+            self.token_trader.confirmations.run(),
+            self.token_trader.fees.run(),
+            self.scheduler.run(),
+            self.monitor_trades(),
+        ] + ([self.exits.run()] if self.exits is not None else [])
@@ -0,0 +1,179 @@
+import asyncio
+import base64
+import time
+from typing import List, Optional, Set, Tuple
+
+from solana.rpc.core import RPCException
+from solders.signature import Signature  # type: ignore
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from .confirmation import ConfirmationEngine
+from .fanin import endpoint_label
+from .metrics import SENT, registry, tracer
+from .rpc import get_transport
+
+# A blockhash stays valid for 150 blocks, roughly 60 s at 400 ms slots
+BLOCKHASH_LIFETIME = 60.0
+
+
+class EndpointScore:
+    """How one send endpoint has performed across submissions."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.label = endpoint_label(url)
+        self.sends = registry.counter(f"submit.{self.label}.sends")
+        self.errors = registry.counter(f"submit.{self.label}.errors")
+        self.first = registry.counter(f"submit.{self.label}.first_accepted")
+        self.landed = registry.counter(f"submit.{self.label}.landed_first")
+        self.latency = registry.histogram(f"submit.{self.label}.accept_latency")
+        self.submissions = 0
+
+    @property
+    def win_rate(self) -> float:
+        return self.landed.value / self.submissions if self.submissions else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "sends": self.sends.value,
+            "errors": self.errors.value,
+            "first_accepted": self.first.value,
+            "landed_first": self.landed.value,
+            "win_rate": self.win_rate,
+            "accept_p50": self.latency.percentile(50),
+        }
+
+
+class _Submission:
+    __slots__ = ("signature", "started", "first", "accepted", "errors")
+
+    def __init__(self, signature: Signature):
+        self.signature = signature
+        self.started = time.monotonic()
+        self.first: Optional[EndpointScore] = None
+        self.accepted = 0
+        self.errors: List[str] = []
+
+
+class Submitter:
+    """Races one signed transaction across several send endpoints.
+
+    Every ``interval`` seconds the transaction is broadcast to all endpoints
+    at once (fastest-ranked first) until the confirmation engine resolves
+    it, ``timeout`` passes, or its blockhash expires. Preflight is only
+    requested on the first round; rebroadcasts are fire-and-forget.
+
+    The endpoint that accepted a confirmed transaction first is credited
+    with landing it; ``ranking`` orders endpoints by that win rate.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        confirmations: ConfirmationEngine,
+        interval: float = 0.4,
+        expires_in: float = BLOCKHASH_LIFETIME,
+    ):
+        if not urls:
+            raise ValueError("Submitter needs at least one endpoint")
+        self.confirmations = confirmations
+        self.interval = interval
+        self.expires_in = expires_in
+        self.endpoints = [EndpointScore(url) for url in dict.fromkeys(urls)]
+        self.rounds = registry.counter("submit.rounds")
+        self.confirmed = registry.counter("submit.confirmed")
+        self.expired = registry.counter("submit.expired")
+        # Strong references to rebroadcasts nobody awaits
+        self._inflight: Set[asyncio.Task] = set()
+
+    def ranking(self) -> List[EndpointScore]:
+        return sorted(self.endpoints, key=lambda e: (-e.win_rate, e.latency.percentile(50)))
+
+    async def _send(self, endpoint: EndpointScore, submission: _Submission, params: list, trace: Optional[str], timed: bool):
+        endpoint.sends.inc()
+        try:
+            response = await get_transport(endpoint.url).call("sendTransaction", params)
+        except Exception as e:
+            response = {"error": {"message": str(e)}}
+        if "error" in response:
+            endpoint.errors.inc()
+            submission.errors.append(f"{endpoint.label}: {response['error'].get('message')}")
+            return
+        submission.accepted += 1
+        if timed:
+            endpoint.latency.record(time.monotonic() - submission.started)
+        if submission.first is None:
+            submission.first = endpoint
+            endpoint.first.inc()
+            tracer.mark(trace, SENT)
+
+    def _broadcast(self, submission: _Submission, payload: str, preflight: bool, first: bool, trace: Optional[str]) -> List[asyncio.Task]:
+        self.rounds.inc()
+        params = [payload, {"encoding": "base64", "skipPreflight": not preflight, "maxRetries": 0}]
+        sends = []
+        for endpoint in self.ranking():
+            send = asyncio.ensure_future(self._send(endpoint, submission, params, trace, first))
+            self._inflight.add(send)
+            send.add_done_callback(self._inflight.discard)
+            sends.append(send)
+        return sends
+
+    async def submit(
+        self,
+        txn: VersionedTransaction,
+        operation: str = "buy",
+        timeout: Optional[float] = None,
+        skip_preflight: bool = True,
+        trace: Optional[str] = None,
+    ) -> Tuple[Signature, Optional[bool]]:
+        """Broadcast ``txn`` until it resolves. Returns its signature and
+        True if confirmed, False if it failed, None if it timed out or expired.
+
+        Raises if every endpoint rejected the first round, e.g. with
+        "Blockhash not found", so callers can react as they did to a
+        failed ``send_transaction``.
+        """
+        signature = txn.signatures[0]
+        submission = _Submission(signature)
+        payload = base64.b64encode(bytes(txn)).decode()
+        limit = self.expires_in if timeout is None else min(timeout, self.expires_in)
+        for endpoint in self.endpoints:
+            endpoint.submissions += 1
+        result = asyncio.ensure_future(self.confirmations.wait(signature, operation, timeout=limit, trace=trace))
+
+        sends = self._broadcast(submission, payload, not skip_preflight, True, trace)
+        await asyncio.wait(sends + [result], return_when=asyncio.FIRST_COMPLETED)
+        if submission.first is None and not result.done():
+            # Wait out the first round before rebroadcasting, so we can raise if nobody accepted it
+            await asyncio.wait(sends)
+            if submission.first is None and not result.done():
+                self.confirmations.discard(signature)
+                raise RPCException("; ".join(submission.errors) or "no endpoint accepted the transaction")
+
+        deadline = submission.started + limit
+        while not result.done():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Expired: the confirmation wait times out on its own shortly
+                break
+            await asyncio.wait((result,), timeout=min(self.interval, remaining))
+            if not result.done() and time.monotonic() < deadline:
+                self._broadcast(submission, payload, False, False, trace)
+        await result
+
+        confirmed = result.result()
+        if confirmed:
+            self.confirmed.inc()
+            if submission.first is not None:
+                submission.first.landed.inc()
+        elif confirmed is None:
+            self.expired.inc()
+        return signature, confirmed
+
+    def stats(self) -> dict:
+        return {
+            "rounds": self.rounds.value,
+            "confirmed": self.confirmed.value,
+            "expired": self.expired.value,
+            "endpoints": {e.label: e.summary() for e in self.ranking()},
+        }
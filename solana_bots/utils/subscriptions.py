@@ -0,0 +1,147 @@
+import asyncio
+import json
+from typing import Callable, Dict, Optional
+
+import websockets
+
+from .fanin import Backoff
+from .logsink import log
+
+
+class Subscription:
+    __slots__ = ("method", "params", "callback", "on_subscribed", "oneshot", "id")
+
+    def __init__(
+        self,
+        method: str,
+        params: list,
+        callback: Callable[[dict], None],
+        on_subscribed: Optional[Callable[[], None]] = None,
+        oneshot: bool = False,
+    ):
+        self.method = method
+        self.params = params
+        self.callback = callback
+        self.on_subscribed = on_subscribed
+        self.oneshot = oneshot
+        self.id: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        return self.id is not None
+
+    @property
+    def unsubscribe_method(self) -> str:
+        return self.method.replace("Subscribe", "Unsubscribe")
+
+
+class SubscriptionClient:
+    """Multiplexes pubsub subscriptions over one websocket connection.
+
+    Subscriptions registered while disconnected are sent on connect, and all
+    of them are re-sent after a reconnect. ``oneshot`` subscriptions (such as
+    ``signatureSubscribe``) are dropped after their first notification. A
+    message that fails to parse or a callback that raises is logged and
+    skipped; it never drops the shared connection.
+    """
+
+    def __init__(self):
+        self.subscriptions: set = set()
+        self._active: Dict[int, Subscription] = {}
+        self._pending: Dict[int, Subscription] = {}
+        self._next_id = 1
+        self._websocket = None
+
+    @property
+    def connected(self) -> bool:
+        return self._websocket is not None
+
+    def subscribe(
+        self,
+        method: str,
+        params: list,
+        callback: Callable[[dict], None],
+        on_subscribed: Optional[Callable[[], None]] = None,
+        oneshot: bool = False,
+    ) -> Subscription:
+        subscription = Subscription(method, params, callback, on_subscribed, oneshot)
+        self.subscriptions.add(subscription)
+        if self._websocket is not None:
+            asyncio.create_task(self._subscribe(self._websocket, subscription))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.discard(subscription)
+        if subscription.id is None:
+            return
+        self._active.pop(subscription.id, None)
+        if self._websocket is not None:
+            asyncio.create_task(self._send(self._websocket, subscription.unsubscribe_method, [subscription.id]))
+        subscription.id = None
+
+    def _request_id(self) -> int:
+        request_id = self._next_id
+        self._next_id += 1
+        return request_id
+
+    async def _send(self, websocket, method: str, params: list, request_id: int = None):
+        if request_id is None:
+            request_id = self._request_id()
+        await websocket.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+
+    async def _subscribe(self, websocket, subscription: Subscription):
+        request_id = self._request_id()
+        self._pending[request_id] = subscription
+        await self._send(websocket, subscription.method, subscription.params, request_id)
+
+    def _on_message(self, message: dict):
+        params = message.get("params")
+        if params is not None:
+            subscription = self._active.get(params.get("subscription"))
+            if subscription is None:
+                return
+            if subscription.oneshot:
+                self._active.pop(subscription.id, None)
+                self.subscriptions.discard(subscription)
+                subscription.id = None
+            subscription.callback(params["result"])
+            return
+        subscription = self._pending.pop(message.get("id"), None)
+        if subscription is None or "result" not in message:
+            return
+        if subscription not in self.subscriptions:
+            asyncio.create_task(self._send(self._websocket, subscription.unsubscribe_method, [message["result"]]))
+            return
+        subscription.id = message["result"]
+        self._active[subscription.id] = subscription
+        if subscription.on_subscribed is not None:
+            subscription.on_subscribed()
+
+    def _disconnected(self):
+        self._websocket = None
+        self._active.clear()
+        self._pending.clear()
+        for subscription in self.subscriptions:
+            subscription.id = None
+
+    async def run(self, wss_url: str):
+        backoff = Backoff()
+        while True:
+            try:
+                async with websockets.connect(wss_url) as websocket:
+                    self._websocket = websocket
+                    backoff.reset()
+                    for subscription in list(self.subscriptions):
+                        await self._subscribe(websocket, subscription)
+                    async for message in websocket:
+                        try:
+                            self._on_message(json.loads(message))
+                        except Exception as e:
+                            log.error(f"Error handling subscription message: {e}")
+            except websockets.exceptions.ConnectionClosed:
+                log.error("Subscription websocket closed, reconnecting...")
+            except Exception as e:
+                log.error(f"Subscription websocket error: {e}")
+            finally:
+                self._disconnected()
+            await asyncio.sleep(backoff.next_delay())
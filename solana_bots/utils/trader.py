@@ -1,286 +1,226 @@
 from solana.rpc.async_api import AsyncClient
 import asyncio
-from typing import List, Dict
-from termcolor import cprint
+from typing import List, Dict, Optional
+from .logsink import log
+from .metrics import BLOCKHASH, COIN_DATA, tracer
 from .base_class import BaseClass
 from .coin import Coin
-from .constants import SYSTEM_PROGRAM, FEE_RECIPIENT, GLOBAL, TOKEN_PROGRAM, RENT, EVENT_AUTHORITY, PUMP_FUN_PROGRAM,ASSOC_TOKEN_ACC_PROG
+from . import curve_math
+from .blockhash import BLOCKHASH_NOT_FOUND, BlockhashProvider
+from .confirmation import ConfirmationEngine
+from .fees import HIGH, NORMAL, FeeOracle
+from .instructions import BUY, SELL, SELL_AND_CLOSE, InstructionFactory
+from .positions import TOKEN_DECIMALS
+from .rpc import get_transport
+from .submitter import Submitter
+from .wallets import POLICIES, WalletPool
 from solders.keypair import Keypair #type: ignore
-import struct
-from solana.transaction import Signature
-from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price  # type: ignore
-from solana.rpc.types import TokenAccountOpts, TxOpts
-from .config import payer_keypair, UNIT_BUDGET, UNIT_PRICE
-import struct
-from solana.rpc.commitment import Processed, Confirmed
-from solana.transaction import AccountMeta
-from spl.token.instructions import (
-    CloseAccountParams,
-    close_account,
-    create_associated_token_account,
-    get_associated_token_address,
-)
-from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price  # type: ignore
-from solders.instruction import Instruction  # type: ignore
-from solders.message import MessageV0  # type: ignore
-from solders.transaction import VersionedTransaction  # type: ignore
+from solders.transaction import VersionedTransaction #type: ignore
+from .config import UNIT_BUDGET, UNIT_PRICE
+from .settings import get_settings
+from .constants import LAMPORTS_PER_SOL
 from solders.pubkey import Pubkey #type: ignore
-import json
 
 
 
 class TokenTrader(BaseClass):
-    def __init__(self, rpc_url: str, coin_class: Coin):
+    def __init__(
+        self,
+        rpc_url: str,
+        coin_class: Coin,
+        send_urls: Optional[List[str]] = None,
+        keypairs: Optional[List[Keypair]] = None,
+    ):
         super().__init__(rpc_url)
+        settings = get_settings()
         self.active_trades: Dict[str, asyncio.Task] = {}
         self.coin = coin_class
-        self.payer_keypair = payer_keypair
+        self.blockhashes = BlockhashProvider(self.client)
+        self.confirmations = ConfirmationEngine(self.client, coin_class.subscriptions)
+        self.submitter = Submitter(send_urls or settings.send_rpc_urls or [rpc_url], self.confirmations)
+        self.instructions = InstructionFactory()
+        self.fees = FeeOracle(
+            get_transport(rpc_url), UNIT_BUDGET, UNIT_PRICE, settings.min_unit_price, settings.max_unit_price
+        )
+        self.wallets = WalletPool(
+            self.client, keypairs or settings.payer_keypairs, coin_class.accounts, POLICIES[settings.wallet_policy]
+        )
         
     async def get_token_balance(self, mint_str: str) -> float | None:
         try:
-            mint = Pubkey.from_string(mint_str)
-            response = await self.client.get_token_accounts_by_owner_json_parsed(
-                payer_keypair.pubkey(),
-                TokenAccountOpts(mint=mint),
-                commitment=Processed
-            )
-            cprint(response.value, "green")
-            accounts = response.value
-            if accounts:
-                token_amount = accounts[0].account.data.parsed['info']['tokenAmount']['uiAmount']
-                return float(token_amount)
-
-            return None
+            wallet = self.wallets.wallet_for(mint_str)
+            if wallet is None:
+                return None
+            balance = await wallet.positions.get_balance(mint_str)
+            if balance is None:
+                return None
+            return balance / 10 ** TOKEN_DECIMALS
         except Exception as e:
-            cprint(f"Error fetching token balance: {e}", "red")
+            log.error(f"Error fetching token balance: {e}")
             return None
           
-    async def confirm_txn(self, txn_sig: Signature, max_retries: int = 7, retry_interval: int = 2, operation: str = "buy") -> bool:
-        retries = 1
+    async def submit_txn(
+        self,
+        txn: VersionedTransaction,
+        max_retries: int = 7,
+        retry_interval: int = 2,
+        operation: str = "buy",
+        skip_preflight: bool = True,
+        trace: Optional[str] = None,
+    ) -> Optional[bool]:
         color = "green" if operation == "buy" else "magenta"
-        cprint(f"Confirming transaction for {operation} operation...", color)
-        while retries < max_retries:
-            try:
-                txn_res = await self.client.get_transaction(txn_sig, encoding="json", commitment=Confirmed, max_supported_transaction_version=0)
-                txn_json = json.loads(txn_res.value.transaction.meta.to_json())
-                cprint(txn_json, color)
-                if txn_json['err'] is None:
-                    cprint(f"Transaction confirmed... try count on {operation}: {retries}", color)
-                    return True
-                
-                cprint("Error: Transaction not confirmed. Retrying on {operation}...", color)
-                if txn_json['err']:
-                    cprint("Transaction failed on {operation}.", color)
-                    return False
-            except Exception as e:
-                cprint(f"Awaiting confirmation on txn {txn_sig}... try count on {operation}: {retries}", "magenta")
-                retries += 1 
-                await asyncio.sleep(retry_interval)
-        
-        cprint("Max retries reached. Transaction confirmation failed. on {operation}", color)
-        return None
+        log.debug(f"Broadcasting and confirming transaction for {operation} operation...", color)
+        txn_sig, confirmed = await self.submitter.submit(
+            txn, operation, timeout=max_retries * retry_interval, skip_preflight=skip_preflight, trace=trace
+        )
+        log.info(f"Transaction Signature: {txn_sig}", color)
+        if confirmed:
+            log.info(f"Transaction confirmed on {operation}", color)
+        elif confirmed is False:
+            log.error(f"Transaction failed on {operation}.")
+        else:
+            log.warning(f"Transaction confirmation timed out on {operation}")
+        return confirmed
       
-    async def buy(self, mint_str: str, sol_in: float = 0.001, slippage: int = 5) -> bool:
+    async def buy(self, mint_str: str, sol_in: float = 0.001, slippage: int = 5, urgency: str = HIGH) -> bool:
+        wallet = None
+        confirmed = False
         try:
-            cprint(f"Starting buy transaction for mint: {mint_str}", "green")
+            log.info(f"Starting buy transaction for mint: {mint_str}", "green")
             if not mint_str:
-                cprint("Mint is required", "red")
+                log.error("Mint is required")
                 return False
             coin_data = await self.coin.get_coin_data(mint_str)
+            tracer.mark(mint_str, COIN_DATA)
             
             if not coin_data:
-                cprint("Failed to retrieve coin data.", "red")
+                log.error("Failed to retrieve coin data.")
                 return False
 
             if coin_data.complete:
-                cprint("Warning: This token has bonded and is only tradable on Raydium.", "red")
+                log.error("Warning: This token has bonded and is only tradable on Raydium.")
                 return False
 
-            MINT = coin_data.mint
-            BONDING_CURVE = coin_data.bonding_curve
-            ASSOCIATED_BONDING_CURVE = coin_data.associated_bonding_curve
-            USER = self.payer_keypair.pubkey()
-
-            cprint("Fetching or creating associated token account...", "green")
-            try:
-                token_accounts = await self.client.get_token_accounts_by_owner(USER, TokenAccountOpts(MINT))
-                ASSOCIATED_USER = token_accounts.value[0].pubkey
-                token_account_instruction = None
-                cprint(f"Token account found: {ASSOCIATED_USER}", "green")
-            except:
-                ASSOCIATED_USER = get_associated_token_address(USER, MINT)
-                token_account_instruction = create_associated_token_account(USER, USER, MINT)
-                cprint(f"Creating token account : {ASSOCIATED_USER}", "green")
-
-            cprint("Calculating transaction amounts...", "green")
-            sol_dec = 1e9
-            token_dec = 1e6
-            virtual_sol_reserves = coin_data.virtual_sol_reserves / sol_dec
-            virtual_token_reserves = coin_data.virtual_token_reserves / token_dec
-            amount = self.coin.sol_for_tokens(sol_in, virtual_sol_reserves, virtual_token_reserves)
-            amount = int(amount * token_dec)
-            
-            slippage_adjustment = 1 + (slippage / 100)
-            max_sol_cost = int((sol_in * slippage_adjustment) * sol_dec)
-            cprint(f"Amount: {amount}, Max Sol Cost: {max_sol_cost}", "green")
+            accounts = self.coin.get_accounts(mint_str)
 
-            cprint("Creating swap instructions...", "green")
-            keys = [
-                AccountMeta(pubkey=GLOBAL, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=FEE_RECIPIENT, is_signer=False, is_writable=True),
-                AccountMeta(pubkey=MINT, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=BONDING_CURVE, is_signer=False, is_writable=True),
-                AccountMeta(pubkey=ASSOCIATED_BONDING_CURVE, is_signer=False, is_writable=True),
-                AccountMeta(pubkey=ASSOCIATED_USER, is_signer=False, is_writable=True),
-                AccountMeta(pubkey=USER, is_signer=True, is_writable=True),
-                AccountMeta(pubkey=SYSTEM_PROGRAM, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=TOKEN_PROGRAM, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=RENT, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=EVENT_AUTHORITY, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=PUMP_FUN_PROGRAM, is_signer=False, is_writable=False)
-            ]
-
-            data = bytearray()
-            data.extend(bytes.fromhex("66063d1201daebea"))
-            data.extend(struct.pack('<Q', amount))
-            data.extend(struct.pack('<Q', max_sol_cost))
-            swap_instruction = Instruction(PUMP_FUN_PROGRAM, bytes(data), keys)
-
-            instructions = [
-                set_compute_unit_limit(UNIT_BUDGET),
-                set_compute_unit_price(UNIT_PRICE),
-            ]
-            if token_account_instruction:
-                instructions.append(token_account_instruction)
-            instructions.append(swap_instruction)
-
-            cprint("Compiling transaction message...", "green")
-            blockhash = await self.client.get_latest_blockhash()
-            
-            compiled_message = MessageV0.try_compile(
-                self.payer_keypair.pubkey(),
-                instructions,
-                [],
-               blockhash.value.blockhash,
+            log.debug("Calculating transaction amounts...", "green")
+            lamports = int(sol_in * LAMPORTS_PER_SOL)
+            amount = curve_math.tokens_for_sol(
+                lamports, coin_data.virtual_sol_reserves, coin_data.virtual_token_reserves, coin_data.real_token_reserves
             )
+            if amount <= 0:
+                log.error("Buy size too small for the current curve.")
+                return False
+            cost = curve_math.buy_cost(amount, coin_data.virtual_sol_reserves, coin_data.virtual_token_reserves)
+            max_sol_cost = curve_math.max_cost(cost, slippage * 100)
+            log.debug(f"Amount: {amount}, Max Sol Cost: {max_sol_cost}", "green")
 
-            cprint("Sending transaction...", "green")
-            txn_sig = await self.client.send_transaction(
-                txn=VersionedTransaction(compiled_message, [self.payer_keypair]),
-                opts=TxOpts(skip_preflight=True)
-            )
-            txn_sig = txn_sig.value
-            
-            confirmed = await self.confirm_txn(txn_sig, operation="buy")
+            wallet = self.wallets.assign(mint_str, max_sol_cost)
+            if wallet is None:
+                log.error("No wallet has enough SOL for this buy.")
+                return False
+            USER = wallet.pubkey
+
+            log.debug("Creating swap instructions...", "green")
+            template = self.instructions.buy_template(accounts, USER)
+
+            log.debug("Compiling transaction message...", "green")
+            blockhash = await self.blockhashes.get()
+            tracer.mark(mint_str, BLOCKHASH)
+            unit_limit, unit_price = self.fees.quote(BUY, urgency)
+            txn = template.transaction(amount, max_sol_cost, blockhash, wallet.keypair, unit_limit, unit_price)
+
+            log.debug(f"Sending transaction (CU limit {unit_limit}, price {unit_price})...", "green")
+            confirmed = await self.submit_txn(txn, operation="buy", trace=mint_str)
+            self.instructions.prepare(accounts, USER)
+            if confirmed:
+                wallet.positions.apply_buy(mint_str, amount, cost, self.confirmations.slot(txn.signatures[0]))
+                self.fees.learn(BUY, txn.signatures[0])
             
-            cprint(f"Transaction confirmed: {confirmed}", "green")
+            log.info(f"Transaction confirmed: {confirmed}", "green")
             return confirmed
 
         except Exception as e:
-            cprint(f"Error occurred during transaction: {e}", "red")
+            if BLOCKHASH_NOT_FOUND in str(e):
+                self.blockhashes.force_refresh()
+            log.error(f"Error occurred during transaction: {e}")
             return False
+        finally:
+            if wallet is not None:
+                self.wallets.settle(mint_str, max_sol_cost, cost if confirmed else None)
 
-    async def sell(self, mint_str: str, percentage: int = 100, slippage: int = 5, max_retries: int = 7) -> bool:
+    async def sell(
+        self, mint_str: str, percentage: int = 100, slippage: int = 5, max_retries: int = 7, urgency: str = NORMAL
+    ) -> bool:
         try:
-            cprint(f"Starting sell transaction for mint: {mint_str}", "green")
+            log.info(f"Starting sell transaction for mint: {mint_str}", "green")
 
             if not (1 <= percentage <= 100):
-                cprint("Percentage must be between 1 and 100.", "red")
+                log.error("Percentage must be between 1 and 100.")
                 return False
 
             coin_data = await self.coin.get_coin_data(mint_str)
             
             if not coin_data:
-                cprint("Failed to retrieve coin data.", "red")
+                log.error("Failed to retrieve coin data.")
                 return False
 
             if coin_data.complete:
-                cprint("Warning: This token has bonded and is only tradable on Raydium.", "red")
+                log.error("Warning: This token has bonded and is only tradable on Raydium.")
                 return False
 
-            MINT = coin_data.mint
-            BONDING_CURVE = coin_data.bonding_curve
-            ASSOCIATED_BONDING_CURVE = coin_data.associated_bonding_curve
-            USER = self.payer_keypair.pubkey()
-            ASSOCIATED_USER = get_associated_token_address(USER, MINT)
+            wallet = self.wallets.wallet_for(mint_str)
+            if wallet is None:
+                log.error(f"No wallet holds {mint_str}.")
+                return False
+            accounts = self.coin.get_accounts(mint_str)
+            USER = wallet.pubkey
 
-            cprint("Retrieving token balance...", "green")
-            token_balance = await self.get_token_balance(mint_str)
-            if token_balance == 0 or token_balance is None:
-                cprint("Token balance is zero. Nothing to sell.", "red")
+            log.debug("Retrieving token balance...", "green")
+            balance = await wallet.positions.get_balance(mint_str)
+            if balance == 0 or balance is None:
+                log.error("Token balance is zero. Nothing to sell.")
+                return False
+            token_balance = balance / 10 ** TOKEN_DECIMALS
+            log.debug(f"Token Balance: {token_balance}", "green")
+            amount = balance if percentage == 100 else balance * percentage // 100
+            if amount <= 0:
+                log.error(f"{percentage}% of the balance rounds to zero tokens.")
                 return False
-            cprint(f"Token Balance: {token_balance}", "green")
-            
-            cprint("Calculating transaction amounts...", "green")
-            sol_dec = 1e9
-            token_dec = 1e6
-            amount = int(token_balance * token_dec)
-            
-            virtual_sol_reserves = coin_data.virtual_sol_reserves / sol_dec
-            virtual_token_reserves = coin_data.virtual_token_reserves / token_dec
-            sol_out = self.coin.tokens_for_sol(token_balance, virtual_sol_reserves, virtual_token_reserves)
             
-            slippage_adjustment = 1 - (slippage / 100)
-            min_sol_output = int((sol_out * slippage_adjustment) * sol_dec)
-            cprint(f"Amount: {amount}, Minimum Sol Out: {min_sol_output}", "green")
-
-            cprint("Creating swap instructions...", "green")
-            keys = [
-                AccountMeta(pubkey=GLOBAL, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=FEE_RECIPIENT, is_signer=False, is_writable=True),
-                AccountMeta(pubkey=MINT, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=BONDING_CURVE, is_signer=False, is_writable=True),
-                AccountMeta(pubkey=ASSOCIATED_BONDING_CURVE, is_signer=False, is_writable=True),
-                AccountMeta(pubkey=ASSOCIATED_USER, is_signer=False, is_writable=True),
-                AccountMeta(pubkey=USER, is_signer=True, is_writable=True),
-                AccountMeta(pubkey=SYSTEM_PROGRAM, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=ASSOC_TOKEN_ACC_PROG, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=TOKEN_PROGRAM, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=EVENT_AUTHORITY, is_signer=False, is_writable=False),
-                AccountMeta(pubkey=PUMP_FUN_PROGRAM, is_signer=False, is_writable=False)
-            ]
-
-            data = bytearray()
-            data.extend(bytes.fromhex("33e685a4017f83ad"))
-            data.extend(struct.pack('<Q', amount))
-            data.extend(struct.pack('<Q', min_sol_output))
-            swap_instruction = Instruction(PUMP_FUN_PROGRAM, bytes(data), keys)
-
-            instructions = [
-                set_compute_unit_limit(UNIT_BUDGET),
-                set_compute_unit_price(UNIT_PRICE),
-                swap_instruction,
-            ]
+            log.debug("Calculating transaction amounts...", "green")
+            sol_out = curve_math.sell_proceeds(amount, coin_data.virtual_sol_reserves, coin_data.virtual_token_reserves)
+            min_sol_output = curve_math.min_output(sol_out, slippage * 100)
+            log.debug(f"Amount: {amount}, Minimum Sol Out: {min_sol_output}", "green")
 
+            log.debug("Creating swap instructions...", "green")
             if percentage == 100:
-                cprint("Preparing to close token account after swap...", "green")
-                close_account_instruction = close_account(CloseAccountParams(TOKEN_PROGRAM, ASSOCIATED_USER, USER, USER))
-                instructions.append(close_account_instruction)
-            blockhash = await self.client.get_latest_blockhash()
-            cprint("Compiling transaction message...", "green")
-            compiled_message = MessageV0.try_compile(
-                self.payer_keypair.pubkey(),
-                instructions,
-                [],
-                blockhash.value.blockhash,
-            )
-
-            cprint("Sending transaction...", "green")
-            txn_sig = await self.client.send_transaction(
-                txn=VersionedTransaction(compiled_message, [self.payer_keypair]),
-                opts=TxOpts(skip_preflight=False)
-            )
-            txn_sig = txn_sig.value
-            cprint(f"Transaction Signature: {txn_sig}", "green")
-
-            cprint("Confirming transaction...", "green")
-            confirmed = await self.confirm_txn(txn_sig, max_retries=max_retries, operation="sell" )
+                log.debug("Preparing to close token account after swap...", "green")
+            template = self.instructions.sell_template(accounts, USER, close=percentage == 100)
+            blockhash = await self.blockhashes.get()
+            log.debug("Compiling transaction message...", "green")
+            kind = SELL_AND_CLOSE if percentage == 100 else SELL
+            unit_limit, unit_price = self.fees.quote(kind, urgency)
+            txn = template.transaction(amount, min_sol_output, blockhash, wallet.keypair, unit_limit, unit_price)
+
+            log.debug(f"Sending transaction (CU limit {unit_limit}, price {unit_price})...", "green")
+            confirmed = await self.submit_txn(txn, max_retries=max_retries, operation="sell", skip_preflight=False)
+            if confirmed:
+                self.fees.learn(kind, txn.signatures[0])
+                # The least the sell could have returned; the next refresh reads the real balance
+                self.wallets.credit(mint_str, min_sol_output)
+                if percentage == 100:
+                    wallet.positions.close(mint_str)
+                else:
+                    wallet.positions.apply_sell(mint_str, amount, self.confirmations.slot(txn.signatures[0]))
             
-            cprint(f"Transaction confirmed: {confirmed}", "green")
+            log.info(f"Transaction confirmed: {confirmed}", "green")
             return confirmed
 
         except Exception as e:
-            cprint(f"Error occurred during transaction: {e}", "red")
+            if BLOCKHASH_NOT_FOUND in str(e):
+                self.blockhashes.force_refresh()
+            log.error(f"Error occurred during transaction: {e}")
             return False
 
    
@@ -0,0 +1,177 @@
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Processed
+from solders.keypair import Keypair  # type: ignore
+
+from .accounts import AccountRegistry
+from .metrics import registry
+from .positions import MAX_ACCOUNTS_PER_CALL, PositionBook
+
+# Lamports kept back in every wallet for fees and ATA rent
+DEFAULT_RESERVE = 10_000_000
+
+
+class Wallet:
+    """One payer: its keypair, its token positions and the SOL it has free."""
+
+    def __init__(self, keypair: Keypair, client: AsyncClient, accounts: AccountRegistry):
+        self.keypair = keypair
+        self.pubkey = keypair.pubkey()
+        self.positions = PositionBook(client, self.pubkey, accounts)
+        self.mints: Set[str] = set()
+        # None until the first refresh
+        self.balance: Optional[int] = None
+        # Lamports promised to buys that have not settled yet
+        self.reserved = 0
+
+    @property
+    def load(self) -> int:
+        return len(self.mints)
+
+    @property
+    def available(self) -> Optional[int]:
+        return None if self.balance is None else self.balance - self.reserved
+
+    def summary(self) -> dict:
+        return {"open": self.load, "balance": self.balance, "reserved": self.reserved}
+
+
+# A policy picks one wallet from the candidates that can fund the order;
+# ``turn`` counts assignments so far.
+Policy = Callable[[List[Wallet], int], Wallet]
+
+
+def least_loaded(wallets: List[Wallet], turn: int) -> Wallet:
+    return min(wallets, key=lambda w: (w.load, -(w.available or 0)))
+
+
+def round_robin(wallets: List[Wallet], turn: int) -> Wallet:
+    return wallets[turn % len(wallets)]
+
+
+def balance_aware(wallets: List[Wallet], turn: int) -> Wallet:
+    return max(wallets, key=lambda w: (w.available or 0, -w.load))
+
+
+POLICIES: Dict[str, Policy] = {
+    "least_loaded": least_loaded,
+    "round_robin": round_robin,
+    "balance_aware": balance_aware,
+}
+
+
+class WalletPool:
+    """Spreads positions over several payer wallets.
+
+    ``assign`` picks a wallet for a new position with ``policy`` among the
+    wallets whose free balance covers the order plus ``reserve`` (wallets
+    not yet refreshed always qualify), and the position stays with that
+    wallet until ``release``. Every wallet keeps its own ``PositionBook``,
+    so sells are signed by whichever wallet holds the tokens. A position
+    released while its wallet still holds tokens, such as an abandoned
+    sell, keeps its wallet and is reported as ``stranded`` until a refresh
+    finds the tokens gone.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        keypairs: Iterable[Keypair],
+        accounts: AccountRegistry,
+        policy: Policy = least_loaded,
+        reserve: int = DEFAULT_RESERVE,
+    ):
+        self.client = client
+        self.wallets = [Wallet(keypair, client, accounts) for keypair in keypairs]
+        if not self.wallets:
+            raise ValueError("WalletPool needs at least one keypair")
+        self.policy = policy
+        self.reserve = reserve
+        self.owners: Dict[str, Wallet] = {}
+        self.stranded: Set[str] = set()
+        self._turn = 0
+        self.assigned = registry.counter("wallets.assigned")
+        self.unfunded = registry.counter("wallets.unfunded")
+
+    def __len__(self):
+        return len(self.wallets)
+
+    def wallet_for(self, mint_str: str) -> Optional[Wallet]:
+        return self.owners.get(mint_str)
+
+    def assign(self, mint_str: str, lamports: int) -> Optional[Wallet]:
+        """The wallet that will buy ``mint_str``, with ``lamports`` reserved
+        on it, or None if no wallet can fund it."""
+        wallet = self.owners.get(mint_str)
+        if wallet is None:
+            candidates = [
+                w for w in self.wallets if w.available is None or w.available - lamports >= self.reserve
+            ]
+            if not candidates:
+                self.unfunded.inc()
+                return None
+            wallet = self.policy(candidates, self._turn)
+            self._turn += 1
+            self.owners[mint_str] = wallet
+            wallet.mints.add(mint_str)
+            self.assigned.inc()
+        wallet.reserved += lamports
+        return wallet
+
+    def settle(self, mint_str: str, reserved: int, spent: Optional[int]):
+        """Drop the reservation from ``assign``. ``spent`` is what the buy
+        cost if it confirmed; a buy that did not leaves no position."""
+        wallet = self.owners.get(mint_str)
+        if wallet is None:
+            return
+        wallet.reserved -= reserved
+        if spent is None:
+            if mint_str not in wallet.positions:
+                self.release(mint_str)
+        elif wallet.balance is not None:
+            wallet.balance -= spent
+
+    def credit(self, mint_str: str, lamports: int):
+        wallet = self.owners.get(mint_str)
+        if wallet is not None and wallet.balance is not None:
+            wallet.balance += lamports
+
+    def release(self, mint_str: str):
+        wallet = self.owners.get(mint_str)
+        if wallet is None:
+            return
+        # An unknown balance may still be tokens
+        if mint_str in wallet.positions and wallet.positions.balance(mint_str) != 0:
+            self.stranded.add(mint_str)
+            return
+        self._forget(mint_str)
+
+    def _forget(self, mint_str: str):
+        self.stranded.discard(mint_str)
+        wallet = self.owners.pop(mint_str, None)
+        if wallet is not None:
+            wallet.mints.discard(mint_str)
+            wallet.positions.close(mint_str)
+
+    async def refresh(self):
+        """Reload SOL balances and token positions of every wallet."""
+        for start in range(0, len(self.wallets), MAX_ACCOUNTS_PER_CALL):
+            batch = self.wallets[start:start + MAX_ACCOUNTS_PER_CALL]
+            response = await self.client.get_multiple_accounts([w.pubkey for w in batch], commitment=Processed)
+            for wallet, account in zip(batch, response.value):
+                wallet.balance = account.lamports if account is not None else 0
+        for wallet in self.wallets:
+            if wallet.positions:
+                await wallet.positions.refresh()
+        for mint_str in list(self.stranded):
+            if self.owners[mint_str].positions.balance(mint_str) == 0:
+                self._forget(mint_str)
+
+    def stats(self) -> dict:
+        return {
+            "assigned": self.assigned.value,
+            "unfunded": self.unfunded.value,
+            "stranded": {mint: str(self.owners[mint].pubkey)[:8] for mint in self.stranded},
+            "wallets": {str(w.pubkey)[:8]: w.summary() for w in self.wallets},
+        }
@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+
+from solders.hash import Hash  # type: ignore
+
+from solana_bots.utils.blockhash import BlockhashProvider
+
+STALE, FRESH = Hash.new_unique(), Hash.new_unique()
+
+
+class Client:
+    """``get_latest_blockhash`` calls wait until the test answers them, in any order."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_latest_blockhash(self, commitment=None):
+        answer = asyncio.get_running_loop().create_future()
+        self.calls.append(answer)
+        return await answer
+
+    def answer(self, index: int, blockhash: Hash, slot: int):
+        self.calls[index].set_result(SimpleNamespace(
+            context=SimpleNamespace(slot=slot),
+            value=SimpleNamespace(blockhash=blockhash, last_valid_block_height=slot + 150),
+        ))
+
+
+async def _tick():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_refreshes_share_one_request():
+    async def run():
+        client = Client()
+        provider = BlockhashProvider(client)
+        waiters = [asyncio.ensure_future(provider.get()) for _ in range(3)]
+        await _tick()
+        assert len(client.calls) == 1
+        client.answer(0, FRESH, 10)
+        assert await asyncio.gather(*waiters) == [FRESH] * 3
+        # Cached until it is older than max_age
+        assert await provider.get() == FRESH
+        assert len(client.calls) == 1
+        provider.fetched_at -= provider.max_age + 1
+        waiter = asyncio.ensure_future(provider.get())
+        await _tick()
+        client.answer(1, FRESH, 11)
+        assert await waiter == FRESH
+        assert provider.slot == 11
+
+    asyncio.run(run())
+
+
+def test_older_slots_do_not_replace_the_cached_hash():
+    async def run():
+        client = Client()
+        provider = BlockhashProvider(client)
+        first = asyncio.ensure_future(provider.refresh())
+        await _tick()
+        client.answer(0, FRESH, 10)
+        await first
+        second = asyncio.ensure_future(provider.refresh())
+        await _tick()
+        client.answer(1, STALE, 9)
+        assert await second == FRESH
+
+    asyncio.run(run())
+
+
+def test_force_refresh_drops_fetches_already_in_flight():
+    async def run():
+        client = Client()
+        provider = BlockhashProvider(client)
+        before = asyncio.ensure_future(provider.refresh())
+        await _tick()
+        provider.force_refresh()
+        after = asyncio.ensure_future(provider.get())
+        await _tick()
+        assert len(client.calls) == 2
+        # The fetch issued before the force lands last, at a higher slot, with the rejected hash
+        client.answer(1, FRESH, 10)
+        assert await after == FRESH
+        client.answer(0, STALE, 12)
+        assert await before == FRESH
+        assert (provider.blockhash, provider.slot) == (FRESH, 10)
+
+    asyncio.run(run())
+
+
+def test_forced_out_fetches_wait_for_the_new_one():
+    async def run():
+        client = Client()
+        provider = BlockhashProvider(client)
+        before = asyncio.ensure_future(provider.refresh())
+        await _tick()
+        provider.force_refresh()
+        client.answer(0, STALE, 12)
+        await _tick()
+        assert not before.done() and len(client.calls) == 2
+        client.answer(1, FRESH, 10)
+        assert await before == FRESH
+        assert provider.blockhash == FRESH
+
+    asyncio.run(run())
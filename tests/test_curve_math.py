@@ -0,0 +1,126 @@
+import random
+
+import numpy as np
+import pytest
+
+from solana_bots.utils import curve_math
+from solana_bots.utils.constants import (
+    FEE_BASIS_POINTS,
+    INITIAL_REAL_TOKEN_RESERVES,
+    INITIAL_VIRTUAL_SOL_RESERVES,
+    INITIAL_VIRTUAL_TOKEN_RESERVES,
+)
+
+U64_MAX = (1 << 64) - 1
+U128_MAX = (1 << 128) - 1
+
+
+def _u64(value: int) -> int:
+    assert 0 <= value <= U64_MAX, value
+    return value
+
+
+def _u128(value: int) -> int:
+    assert 0 <= value <= U128_MAX, value
+    return value
+
+
+def onchain_buy(amount, virtual_sol, virtual_token, fee_bps=FEE_BASIS_POINTS):
+    """The program's buy: checked u128 products truncated back to u64."""
+    sol_cost = _u64(_u128(amount * virtual_sol) // _u128(virtual_token - amount) + 1)
+    return _u64(sol_cost + _u64(_u128(sol_cost * fee_bps) // 10_000))
+
+
+def onchain_sell(amount, virtual_sol, virtual_token, fee_bps=FEE_BASIS_POINTS):
+    sol_output = _u64(_u128(amount * virtual_sol) // _u128(virtual_token + amount))
+    return _u64(sol_output - _u64(_u128(sol_output * fee_bps) // 10_000))
+
+
+def random_curve(rng: random.Random):
+    """Reserves somewhere along the curve's life, from launch to near completion."""
+    bought = rng.randrange(0, INITIAL_REAL_TOKEN_RESERVES - 1_000_000)
+    if not bought:
+        return INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES, INITIAL_REAL_TOKEN_RESERVES
+    virtual_sol, virtual_token = curve_math.apply_buy(
+        bought, INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES
+    )
+    return virtual_sol, virtual_token, INITIAL_REAL_TOKEN_RESERVES - bought
+
+
+@pytest.fixture(scope="module")
+def trades():
+    """Random buys on random curves: (sol_in, vsr, vtr, amount, cost, vsr', vtr', proceeds)."""
+    rng = random.Random(7)
+    samples = []
+    while len(samples) < 2_000:
+        virtual_sol, virtual_token, _ = random_curve(rng)
+        sol_in = rng.randrange(1, 50 * 10 ** 9)
+        amount = curve_math.tokens_for_sol(sol_in, virtual_sol, virtual_token)
+        if amount <= 0:
+            continue
+        cost = curve_math.buy_cost(amount, virtual_sol, virtual_token)
+        new_sol, new_token = curve_math.apply_buy(amount, virtual_sol, virtual_token)
+        proceeds = curve_math.sell_proceeds(amount, new_sol, new_token)
+        samples.append((sol_in, virtual_sol, virtual_token, amount, cost, new_sol, new_token, proceeds))
+    return samples
+
+
+def test_buy_matches_program(trades):
+    for _, virtual_sol, virtual_token, amount, cost, *_ in trades:
+        assert cost == onchain_buy(amount, virtual_sol, virtual_token)
+
+
+def test_sell_matches_program(trades):
+    for *_, amount, _, new_sol, new_token, proceeds in trades:
+        assert proceeds == onchain_sell(amount, new_sol, new_token)
+
+
+def test_tokens_for_sol_is_largest_affordable_amount(trades):
+    for sol_in, virtual_sol, virtual_token, amount, cost, *_ in trades:
+        assert cost <= sol_in
+        assert curve_math.buy_cost(amount + 1, virtual_sol, virtual_token) > sol_in
+
+
+def test_round_trip_never_profits(trades):
+    for _, virtual_sol, virtual_token, _, cost, new_sol, new_token, proceeds in trades:
+        # Buying never lowers the constant product, and selling back never pays more
+        assert new_sol * new_token >= virtual_sol * virtual_token
+        assert proceeds <= cost
+
+
+def test_tokens_for_sol_caps_at_real_reserves():
+    amount = curve_math.tokens_for_sol(
+        10 ** 12, INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES, real_token=1_000
+    )
+    assert amount == 1_000
+
+
+def test_buy_cost_rejects_amounts_past_the_reserves():
+    with pytest.raises(ValueError):
+        curve_math.buy_cost(INITIAL_VIRTUAL_TOKEN_RESERVES, INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES)
+
+
+def test_batch_equals_scalar(trades):
+    sol_in, virtual_sol, virtual_token, amount, cost, new_sol, new_token, proceeds = (
+        np.array(column) for column in zip(*trades)
+    )
+    assert (curve_math.tokens_for_sol_batch(sol_in, virtual_sol, virtual_token) == amount).all()
+    assert (curve_math.buy_cost_batch(amount, virtual_sol, virtual_token) == cost).all()
+    assert (curve_math.sell_proceeds_batch(amount, new_sol, new_token) == proceeds).all()
+
+
+def test_batch_marks_unfillable_sizes(trades):
+    _, virtual_sol, virtual_token, *_ = (np.array(column) for column in zip(*trades))
+    assert (curve_math.buy_cost_batch(virtual_token, virtual_sol, virtual_token) == curve_math.UNFILLABLE).all()
+    assert (curve_math.buy_cost_batch(0, virtual_sol, virtual_token) == 0).all()
+
+
+def test_quote_grid_matches_scalar():
+    rng = random.Random(11)
+    reserves = [random_curve(rng) for _ in range(16)]
+    sizes = [int(x) for x in np.geomspace(10 ** 6, 10 ** 11, 8)]
+    virtual_sol, virtual_token, real_token = (np.array(column) for column in zip(*reserves))
+    tokens, costs = curve_math.quote_grid(sizes, virtual_sol, virtual_token, real_token)
+    for i, (vs, vt, rt) in enumerate(reserves):
+        assert tokens[i].tolist() == [curve_math.tokens_for_sol(size, vs, vt, rt) for size in sizes]
+        assert costs[i].tolist() == [curve_math.buy_cost(int(a), vs, vt) for a in tokens[i]]
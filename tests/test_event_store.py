@@ -0,0 +1,111 @@
+import os
+import time
+
+from solders.pubkey import Pubkey  # type: ignore
+
+from solana_bots.utils.event_store import LAUNCHES, TRADES, EventStore, load_segments, segment_paths
+from solana_bots.utils.events import CreateEvent, TradeEvent
+
+
+def _pubkey() -> Pubkey:
+    return Pubkey(os.urandom(32))
+
+
+def _launch(creator: Pubkey) -> CreateEvent:
+    return CreateEvent("Frog", "FROG", "", _pubkey(), _pubkey(), creator)
+
+
+def _trade(mint: Pubkey, sol_amount: int, is_buy: bool = True) -> TradeEvent:
+    return TradeEvent(mint, sol_amount, 10**6, is_buy, _pubkey(), 0, 0, 0)
+
+
+def test_segments_roll_over_at_capacity(tmp_path):
+    store = EventStore(str(tmp_path), capacity=4)
+    creator = _pubkey()
+    now = time.time()
+    events = [_launch(creator) for _ in range(10)]
+    for i, event in enumerate(events):
+        store.append_launch(event, slot=i, timestamp=now + i)
+    store.close()
+    assert [os.path.basename(path) for path in segment_paths(str(tmp_path), LAUNCHES)] == [
+        "launches-000001.npy", "launches-000002.npy", "launches-000003.npy",
+    ]
+    rows = load_segments(str(tmp_path), LAUNCHES)
+    assert rows["slot"].tolist() == list(range(10))
+    assert [Pubkey(bytes(mint)) for mint in rows["mint"]] == [event.mint for event in events]
+    assert len(load_segments(str(tmp_path), TRADES)) == 0
+
+
+def test_old_segments_are_removed(tmp_path):
+    store = EventStore(str(tmp_path), capacity=4, max_segments=2)
+    now = time.time()
+    for i in range(10):
+        store.append_launch(_launch(_pubkey()), slot=i, timestamp=now + i)
+    store.close()
+    assert len(segment_paths(str(tmp_path), LAUNCHES)) == 2
+    assert load_segments(str(tmp_path), LAUNCHES)["slot"].tolist() == list(range(4, 10))
+
+
+def test_reopening_reindexes_and_appends(tmp_path):
+    creator, mint = _pubkey(), _pubkey()
+    now = time.time()
+    store = EventStore(str(tmp_path), capacity=4)
+    for i in range(6):
+        store.append_launch(_launch(creator), slot=i, timestamp=now - 10 + i)
+    store.append_trade(_trade(mint, 100), slot=7, timestamp=now)
+    store.append_trade(_trade(mint, 50, is_buy=False), slot=8, timestamp=now)
+    store.close()
+
+    store = EventStore(str(tmp_path), capacity=4)
+    assert store.creator_launches(creator, window=60.0, now=now) == 6
+    assert store.curve_volume(mint, slots=10) == 150
+    assert store.curve_trades(mint, slots=10) == (1, 1)
+    # The half-full segment is written on from where it stopped
+    for i in range(6, 9):
+        store.append_launch(_launch(creator), slot=i, timestamp=now + i)
+    store.close()
+    assert load_segments(str(tmp_path), LAUNCHES)["slot"].tolist() == list(range(9))
+    assert len(segment_paths(str(tmp_path), LAUNCHES)) == 3
+
+
+def test_reopening_skips_rows_past_the_index_window(tmp_path):
+    creator = _pubkey()
+    now = time.time()
+    store = EventStore(str(tmp_path), index_window=60.0)
+    store.append_launch(_launch(creator), timestamp=now - 120)
+    store.append_launch(_launch(creator), timestamp=now - 5)
+    store.close()
+    store = EventStore(str(tmp_path), index_window=60.0)
+    assert store.creator_launches(creator, window=3600.0, now=now) == 1
+    store.close()
+
+
+def test_creator_launches_window(tmp_path):
+    store = EventStore(str(tmp_path))
+    creator = _pubkey()
+    # Out of order, as fan-in can deliver them
+    for timestamp in (1000.0, 900.0, 1050.0, 950.0):
+        store.append_launch(_launch(creator), timestamp=timestamp)
+    assert [at for at, _ in store.creators[creator]] == [900.0, 950.0, 1000.0, 1050.0]
+    assert store.creator_launches(creator, window=60.0, now=1055.0) == 2
+    assert store.creator_launches(creator, window=200.0, now=1055.0) == 4
+    assert store.creator_launches(_pubkey(), window=200.0, now=1055.0) == 0
+    store.prune(now=1001.0 + store.index_window)
+    assert store.creator_launches(creator, window=10**9, now=1055.0) == 1
+    store.close()
+
+
+def test_curve_windows_count_slots(tmp_path):
+    store = EventStore(str(tmp_path))
+    mint = _pubkey()
+    for slot, amount, is_buy in [(10, 1, True), (11, 2, False), (12, 4, True), (15, 8, True)]:
+        store.append_trade(_trade(mint, amount, is_buy), slot=slot)
+    assert store.curve_volume(mint, slots=1) == 8
+    assert store.curve_volume(mint, slots=5) == 14
+    # Measured back from the current slot, which may be past the last trade
+    assert store.curve_volume(mint, slots=5, current_slot=19) == 8
+    assert store.curve_volume(mint, slots=5, current_slot=20) == 0
+    assert store.curve_trades(mint, slots=5) == (2, 1)
+    assert store.curve_trades(mint, slots=6) == (3, 1)
+    assert store.curve_volume(_pubkey(), slots=5) == 0
+    store.close()
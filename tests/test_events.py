@@ -0,0 +1,81 @@
+import base64
+import json
+import os
+
+from solders.pubkey import Pubkey  # type: ignore
+
+from solana_bots.utils.events import (
+    CreateEvent,
+    TradeEvent,
+    decode_create_event,
+    decode_create_log,
+    decode_event_log,
+    decode_trade_event,
+    decode_trade_log,
+    encode_create_event,
+    encode_trade_event,
+    scan_trade_events,
+)
+
+
+def _pubkey() -> Pubkey:
+    return Pubkey(os.urandom(32))
+
+
+def _log(payload: bytes) -> str:
+    return "Program data: " + base64.b64encode(payload).decode()
+
+
+def test_create_event_round_trip():
+    mint, bonding_curve, user = _pubkey(), _pubkey(), _pubkey()
+    event = decode_create_event(encode_create_event("Moon Cat", "MCAT", "https://x.invalid/1", mint, bonding_curve, user))
+    assert (event.name, event.symbol, event.uri) == ("Moon Cat", "MCAT", "https://x.invalid/1")
+    assert (event.mint, event.bonding_curve, event.user) == (mint, bonding_curve, user)
+
+
+def test_create_event_keeps_utf8_names():
+    event = decode_create_event(encode_create_event("月 🐸", "🐸", "", _pubkey(), _pubkey(), _pubkey()))
+    assert (event.name, event.symbol, event.uri) == ("月 🐸", "🐸", "")
+
+
+def test_trade_event_round_trip():
+    mint, user = _pubkey(), _pubkey()
+    event = decode_trade_event(encode_trade_event(mint, 10**9, 35 * 10**12, False, user, 1_700_000_000, 31 * 10**9, 1_040 * 10**12))
+    assert (event.mint, event.user, event.is_buy) == (mint, user, False)
+    assert (event.sol_amount, event.token_amount, event.timestamp) == (10**9, 35 * 10**12, 1_700_000_000)
+    assert (event.virtual_sol_reserves, event.virtual_token_reserves) == (31 * 10**9, 1_040 * 10**12)
+
+
+def test_decoders_reject_the_other_discriminator():
+    create = encode_create_event("a", "b", "c", _pubkey(), _pubkey(), _pubkey())
+    trade = encode_trade_event(_pubkey(), 1, 1, True, _pubkey(), 0, 1, 1)
+    assert decode_trade_event(create) is None
+    assert decode_create_event(trade) is None
+    assert decode_trade_log(_log(create)) is None
+    assert decode_create_log(_log(trade)) is None
+
+
+def test_log_decoders_accept_lines_and_bare_payloads():
+    create = encode_create_event("a", "b", "c", _pubkey(), _pubkey(), _pubkey())
+    assert isinstance(decode_event_log(_log(create)), CreateEvent)
+    assert isinstance(decode_create_log(base64.b64encode(create).decode()), CreateEvent)
+    trade = encode_trade_event(_pubkey(), 1, 1, True, _pubkey(), 0, 1, 1)
+    assert isinstance(decode_event_log(_log(trade)), TradeEvent)
+    assert decode_event_log("Program log: Instruction: Buy") is None
+
+
+def test_truncated_payloads_decode_to_none():
+    create = encode_create_event("a", "b", "c", _pubkey(), _pubkey(), _pubkey())
+    trade = encode_trade_event(_pubkey(), 1, 1, True, _pubkey(), 0, 1, 1)
+    assert decode_create_log(_log(create[:20])) is None
+    assert decode_trade_log(_log(trade[:40])) is None
+    assert decode_create_log("Program data: " + base64.b64encode(create).decode()[:-3]) is None
+
+
+def test_scan_trade_events_reads_every_trade_in_a_raw_frame():
+    trades = [encode_trade_event(_pubkey(), i, i, True, _pubkey(), i, 1, 1) for i in range(1, 4)]
+    create = encode_create_event("a", "b", "c", _pubkey(), _pubkey(), _pubkey())
+    frame = json.dumps({"params": {"result": {"value": {"logs": [_log(create)] + [_log(t) for t in trades]}}}})
+    events = scan_trade_events(frame)
+    assert [event.sol_amount for event in events] == [1, 2, 3]
+    assert [event.sol_amount for event in scan_trade_events(frame.encode())] == [1, 2, 3]
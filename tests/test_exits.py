@@ -0,0 +1,139 @@
+import os
+
+import pytest
+from solders.pubkey import Pubkey  # type: ignore
+
+from solana_bots.utils import curve_math
+from solana_bots.utils.curve_cache import CurveState
+from solana_bots.utils.exits import (
+    STOP_LOSS, TAKE_PROFIT, TRAILING_STOP, ExitEngine, ExitPolicy, parse_take_profit,
+)
+
+TOKENS = 10**9
+VIRTUAL_SOL = 30 * 10**9
+VIRTUAL_TOKEN = 10**15
+# What TOKENS fetch at the opening reserves; with reserves this deep the
+# value scales almost linearly with virtual SOL
+COST = curve_math.sell_proceeds(TOKENS, VIRTUAL_SOL, VIRTUAL_TOKEN)
+
+
+def _pubkey() -> Pubkey:
+    return Pubkey(os.urandom(32))
+
+
+def _state(price: float) -> CurveState:
+    """Reserves at which TOKENS are worth about ``price`` times COST."""
+    return CurveState(VIRTUAL_TOKEN, int(VIRTUAL_SOL * price), 0, 0, 0, False)
+
+
+def _engine(policy: ExitPolicy, accept: bool = True, capacity: int = 64):
+    exits = []
+
+    def on_exit(mint, percentage):
+        exits.append((mint, percentage))
+        return accept
+
+    return ExitEngine(policy, on_exit, capacity=capacity), exits
+
+
+def _check_rows(engine: ExitEngine):
+    assert len(engine.mints) == len(engine.rows) == len(engine._curve_of)
+    for mint, row in engine.rows.items():
+        assert engine.mints[row] == mint
+    curves = {}
+    for row, bonding_curve in enumerate(engine._curve_of):
+        curves.setdefault(bonding_curve, []).append(row)
+    assert {curve: sorted(rows) for curve, rows in engine.curves.items()} == curves
+
+
+def test_parse_take_profit():
+    assert parse_take_profit(["300:100", "100:50", "50"]) == ((50, 100), (100, 50), (300, 100))
+    with pytest.raises(ValueError):
+        parse_take_profit(["100:0"])
+
+
+def test_close_moves_the_last_row_into_place():
+    engine, _ = _engine(ExitPolicy(), capacity=2)
+    shared, single = _pubkey(), _pubkey()
+    for i, curve in enumerate([shared, single, shared, single, shared]):
+        engine.open(f"m{i}", curve, TOKENS + i, COST + i)
+    _check_rows(engine)
+    for mint in ("m1", "m4", "m0", "missing"):
+        engine.close(mint)
+        _check_rows(engine)
+    assert sorted(engine.mints) == ["m2", "m3"]
+    for mint in engine.mints:
+        row = engine.rows[mint]
+        i = int(mint[1:])
+        assert (engine.tokens[row], engine.cost[row]) == (TOKENS + i, COST + i)
+    # Curve updates still reach the moved rows
+    engine.update(single, _state(2.0))
+    assert engine.virtual_sol[engine.rows["m3"]] == 2 * VIRTUAL_SOL
+    assert engine.virtual_sol[engine.rows["m2"]] == 0
+
+
+def test_take_profit_ladder():
+    engine, exits = _engine(ExitPolicy(take_profit=((100, 50), (300, 100))))
+    curve = _pubkey()
+    engine.open("a", curve, TOKENS, COST, _state(1.0))
+    assert engine.step() == []
+    engine.update(curve, _state(2.1))
+    assert engine.step() == [("a", 50, TAKE_PROFIT)]
+    # The sell is in flight
+    assert engine.step() == []
+    engine.sold("a", TOKENS // 2, COST // 2)
+    assert engine.step() == []
+    engine.update(curve, _state(4.5))
+    assert engine.step() == [("a", 100, TAKE_PROFIT)]
+    assert exits == [("a", 50), ("a", 100)]
+    assert "a" not in engine.rows
+
+
+def test_failed_sell_rearms_its_tier():
+    engine, exits = _engine(ExitPolicy(take_profit=((100, 50),)))
+    engine.open("a", _pubkey(), TOKENS, COST, _state(2.1))
+    assert engine.step() == [("a", 50, TAKE_PROFIT)]
+    engine.failed("a")
+    assert engine.step() == [("a", 50, TAKE_PROFIT)]
+    engine.sold("a", 0, 0)
+    assert not len(engine)
+
+
+def test_stop_loss():
+    engine, _ = _engine(ExitPolicy(stop_loss=50))
+    curve = _pubkey()
+    engine.open("a", curve, TOKENS, COST, _state(0.6))
+    assert engine.step() == []
+    engine.update(curve, _state(0.45))
+    assert engine.step() == [("a", 100, STOP_LOSS)]
+    assert not len(engine)
+
+
+def test_trailing_stop_arms_after_the_activation_gain():
+    engine, _ = _engine(ExitPolicy(trailing_stop=20, trailing_activation=50))
+    curve = _pubkey()
+    engine.open("a", curve, TOKENS, COST, _state(1.4))
+    engine.update(curve, _state(1.0))
+    # Down 29% from its peak, but the peak never reached +50%
+    assert engine.step() == []
+    engine.update(curve, _state(2.0))
+    assert engine.step() == []
+    engine.update(curve, _state(1.7))
+    assert engine.step() == []
+    engine.update(curve, _state(1.5))
+    assert engine.step() == [("a", 100, TRAILING_STOP)]
+
+
+def test_refused_exits_wait_for_the_scheduler():
+    engine, exits = _engine(ExitPolicy(stop_loss=50), accept=False)
+    engine.open("a", _pubkey(), TOKENS, COST, _state(0.4))
+    assert engine.step() == []
+    assert engine.step() == []
+    assert exits == [("a", 100)]
+    assert engine.busy[engine.rows["a"]]
+
+
+def test_rows_without_reserves_are_not_priced():
+    engine, _ = _engine(ExitPolicy(stop_loss=50))
+    engine.open("a", _pubkey(), TOKENS, COST)
+    assert engine.evaluate() == []
@@ -0,0 +1,25 @@
+from solana_bots.utils.fanin import SeenSet
+
+
+def test_first_arrival_wins():
+    seen = SeenSet()
+    assert seen.first_seen("sig", 1.0, "a") is None
+    assert seen.first_seen("sig", 1.2, "b") == (1.0, "a")
+    assert len(seen) == 1
+
+
+def test_keys_expire_after_ttl():
+    seen = SeenSet(ttl=10.0)
+    seen.first_seen("old", 0.0, "a")
+    seen.first_seen("new", 11.0, "a")
+    assert len(seen) == 1
+    assert seen.first_seen("old", 11.5, "b") is None
+
+
+def test_size_is_bounded_oldest_first():
+    seen = SeenSet(maxsize=3, ttl=1e9)
+    for i in range(5):
+        seen.first_seen(i, float(i), "a")
+    assert len(seen) == 3
+    assert seen.first_seen(4, 9.0, "b") == (4.0, "a")
+    assert seen.first_seen(0, 9.0, "b") is None
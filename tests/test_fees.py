@@ -0,0 +1,80 @@
+import asyncio
+
+from solders.signature import Signature  # type: ignore
+
+from solana_bots.utils.fees import HIGH, LOW, NORMAL, URGENT, FeeOracle
+from solana_bots.utils.rpc import RpcTransport
+from solana_bots.utils.standins import JsonRpcStandIn
+
+
+def _oracle(transport=None, **options) -> FeeOracle:
+    return FeeOracle(transport, default_limit=100_000, default_price=1_000, **options)
+
+
+def test_window_keeps_the_newest_slots():
+    oracle = _oracle(window_slots=10)
+    oracle.record_fees((slot, slot) for slot in range(100, 105))
+    oracle.record_fees([(112, 7), (104, 50)])
+    # Slots at or below newest - window_slots fall out; a slot seen again takes its latest fee
+    assert oracle.fees == {103: 103, 104: 50, 112: 7}
+    assert oracle.percentile(0) == 7 and oracle.percentile(100) == 103
+
+
+def test_price_follows_the_tier_percentile():
+    oracle = _oracle()
+    assert oracle.price(NORMAL) == 1_000
+    oracle.record_fees((slot, slot * 10) for slot in range(1, 101))
+    assert [oracle.price(tier) for tier in (LOW, NORMAL, HIGH, URGENT)] == [260, 510, 760, 960]
+    assert oracle.prices[URGENT].value == 960
+
+
+def test_price_is_clamped():
+    oracle = _oracle(min_price=300, max_price=800)
+    oracle.record_fees((slot, slot * 10) for slot in range(1, 101))
+    assert [oracle.price(tier) for tier in (LOW, NORMAL, HIGH, URGENT)] == [300, 510, 760, 800]
+    # The default price is not clamped: it is what the bot bid before sampling fees
+    assert _oracle(min_price=5_000).price(NORMAL) == 1_000
+
+
+def test_limit_learns_from_usage():
+    oracle = _oracle(min_samples=3, headroom=1.5)
+    for units in (20_000, 30_000):
+        oracle.record_usage("buy", units)
+    assert oracle.limit("buy") == 100_000
+    oracle.record_usage("buy", 25_000)
+    assert oracle.limit("buy") == 45_000
+    assert oracle.quote("buy") == (45_000, 1_000)
+    # Never above the default, and other kinds keep it
+    oracle.record_usage("buy", 90_000)
+    assert oracle.limit("buy") == 100_000
+    assert oracle.limit("sell") == 100_000
+
+
+def test_usage_keeps_recent_samples():
+    oracle = _oracle(min_samples=1, usage_samples=2, headroom=1.0)
+    for units in (90_000, 10_000, 20_000):
+        oracle.record_usage("sell", units)
+    assert oracle.limit("sell") == 20_000
+
+
+def test_sample_and_learn_over_rpc():
+    signature = Signature.default()
+
+    async def run():
+        handlers = {
+            "getRecentPrioritizationFees": lambda params: [
+                {"slot": slot, "prioritizationFee": slot * 2} for slot in range(10, 20)
+            ],
+            "getTransaction": lambda params: {"meta": {"err": None, "computeUnitsConsumed": 42_000}},
+        }
+        async with JsonRpcStandIn(handlers) as standin:
+            transport = RpcTransport(standin.url)
+            oracle = _oracle(transport, min_samples=1, headroom=1.0)
+            await oracle.sample()
+            assert len(oracle.fees) == 10 and oracle.price(URGENT) == 38
+            oracle.learn("buy", signature)
+            await asyncio.gather(*oracle._learning)
+            assert oracle.limit("buy") == 42_000
+            await transport.close()
+
+    asyncio.run(run())
@@ -0,0 +1,43 @@
+from collections import Counter
+
+from solana_bots.utils.multiproc import HashRing
+
+KEYS = [f"mint{i}".encode() for i in range(5_000)]
+
+
+def test_empty_ring_has_no_owner():
+    assert HashRing().node_for(b"mint") is None
+
+
+def test_assignment_is_deterministic():
+    assert [HashRing(range(4)).node_for(key) for key in KEYS[:100]] == [
+        HashRing([3, 1, 2, 0]).node_for(key) for key in KEYS[:100]
+    ]
+
+
+def test_keys_spread_over_every_node():
+    ring = HashRing(range(4))
+    counts = Counter(ring.node_for(key) for key in KEYS)
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > len(KEYS) / 4 / 2
+
+
+def test_removing_a_node_only_moves_its_keys():
+    ring = HashRing(range(4))
+    before = {key: ring.node_for(key) for key in KEYS}
+    ring.remove(2)
+    assert len(ring) == 3
+    for key, owner in before.items():
+        if owner != 2:
+            assert ring.node_for(key) == owner
+        else:
+            assert ring.node_for(key) in (0, 1, 3)
+
+
+def test_adding_a_node_back_restores_the_assignment():
+    ring = HashRing(range(4))
+    before = [ring.node_for(key) for key in KEYS]
+    ring.remove(1)
+    ring.add(1)
+    ring.add(1)
+    assert [ring.node_for(key) for key in KEYS] == before
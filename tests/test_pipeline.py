@@ -0,0 +1,68 @@
+import asyncio
+import itertools
+
+import pytest
+
+from solana_bots.utils.pipeline import FrameQueue, OverflowPolicy
+
+# Queue metrics are registry-wide by name, so every queue gets its own
+_names = (f"test_queue_{i}" for i in itertools.count())
+
+
+def _queue(maxsize: int, policy: OverflowPolicy) -> FrameQueue:
+    return FrameQueue(maxsize, policy, name=next(_names))
+
+
+def _drain(queue: FrameQueue) -> list:
+    async def drain():
+        return [(await queue.get())[1] for _ in range(queue.qsize())]
+
+    return asyncio.run(drain())
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        _queue(0, OverflowPolicy.DROP_OLDEST)
+
+
+def test_drop_oldest_evicts_the_head():
+    queue = _queue(2, OverflowPolicy.DROP_OLDEST)
+    assert all(queue.put_nowait(frame) for frame in "abc")
+    assert _drain(queue) == ["b", "c"]
+    stats = queue.stats()
+    assert (stats["enqueued"], stats["dropped_oldest"], stats["dropped_newest"], stats["max_depth"]) == (3, 1, 0, 2)
+
+
+def test_drop_newest_refuses_the_new_frame():
+    queue = _queue(2, OverflowPolicy.DROP_NEWEST)
+    assert [queue.put_nowait(frame) for frame in "abc"] == [True, True, False]
+    assert _drain(queue) == ["a", "b"]
+    assert queue.stats()["dropped_newest"] == 1
+
+
+def test_block_raises_without_waiting():
+    queue = _queue(1, OverflowPolicy.BLOCK)
+    queue.put_nowait("a")
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait("b")
+
+
+def test_block_waits_for_room():
+    async def run():
+        queue = _queue(1, OverflowPolicy.BLOCK)
+        await queue.put("a")
+        blocked = asyncio.ensure_future(queue.put("b"))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+        assert (await queue.get())[1] == "a"
+        assert await asyncio.wait_for(blocked, 1.0)
+        assert (await queue.get())[1] == "b"
+        assert queue.stats()["dropped_oldest"] == queue.stats()["dropped_newest"] == 0
+
+    asyncio.run(run())
+
+
+def test_items_keep_their_receive_time():
+    queue = _queue(4, OverflowPolicy.DROP_OLDEST)
+    queue.put_nowait("a", received_at=12.5)
+    assert asyncio.run(queue.get()) == (12.5, "a")
@@ -0,0 +1,46 @@
+import json
+
+from solana_bots.utils.prefilter import FramePrefilter, extract_logs, extract_slot, scan_slot
+
+
+def _frame(logs, slot=42) -> str:
+    return json.dumps({"params": {"result": {"context": {"slot": slot}, "value": {"logs": logs}}}})
+
+
+def test_frames_without_a_marker_are_not_parsed():
+    calls = []
+    prefilter = FramePrefilter(loads=lambda frame: calls.append(frame) or {})
+    assert prefilter(_frame(["Program log: Instruction: Buy"])) is None
+    assert calls == []
+    assert prefilter.stats() == {"seen": 1, "rejected": 1, "parsed": 0, "errors": 0}
+
+
+def test_frames_with_a_marker_are_parsed():
+    prefilter = FramePrefilter()
+    logs = ["Program log: Instruction: InitializeMint2"]
+    parsed = prefilter(_frame(logs))
+    assert extract_logs(parsed) == logs
+    assert extract_slot(parsed) == 42
+    assert prefilter.parsed == 1
+
+
+def test_byte_frames_match_byte_markers():
+    prefilter = FramePrefilter(markers=["Create Metadata Accounts v3"])
+    assert prefilter(_frame(["Program log: IX: Create Metadata Accounts v3"]).encode()) is not None
+    assert prefilter(_frame(["Program log: Instruction: Sell"]).encode()) is None
+
+
+def test_malformed_frames_count_as_errors():
+    prefilter = FramePrefilter()
+    assert prefilter('{"logs": ["InitializeMint2"') is None
+    assert prefilter.stats() == {"seen": 1, "rejected": 0, "parsed": 0, "errors": 1}
+
+
+def test_extract_defaults_on_other_messages():
+    assert extract_logs({"result": 7}) == []
+    assert extract_slot({"result": 7}) == 0
+
+
+def test_scan_slot_reads_the_raw_frame():
+    assert scan_slot(_frame([], slot=301234567)) == 301234567
+    assert scan_slot('{"result": 7}') == 0
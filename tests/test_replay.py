@@ -0,0 +1,58 @@
+import asyncio
+import random
+
+import pytest
+
+from benchmarks.corpus import _pump_pubkey, create_frame, trade_frame
+from solana_bots.utils import curve_math
+from solana_bots.utils.constants import INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES
+from solana_bots.utils.recorder import FrameRecorder, iter_frames
+from solana_bots.utils.replay import replay
+
+
+def _record(path, session, compress: bool = False):
+    with FrameRecorder(str(path), compress=compress) as recorder:
+        for at, frame in session:
+            recorder.write(frame, at)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_recording_round_trip(tmp_path, compress):
+    if compress:
+        pytest.importorskip("zstandard")
+    path = tmp_path / "session.bin"
+    session = [(float(i), f"frame {i}") for i in range(3)]
+    _record(path, session[:2], compress)
+    # Re-opening appends
+    _record(path, session[2:], compress)
+    frames = list(iter_frames(str(path)))
+    assert [frame for _, frame in frames] == [frame for _, frame in session]
+    first = frames[0][0]
+    assert [at - first for at, _ in frames] == pytest.approx([0.0, 1.0, 2.0], abs=1e-3)
+    with pytest.raises(ValueError):
+        FrameRecorder(str(path), compress=not compress)
+
+
+def test_replay_backtests_the_hold_without_wallets(tmp_path, monkeypatch):
+    monkeypatch.delenv("KEY_PAIR", raising=False)
+    rng = random.Random(1)
+    pumped, flat = _pump_pubkey(), _pump_pubkey()
+    tokens = curve_math.tokens_for_sol(10 * 10**9, INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES)
+    virtual_sol, virtual_token = curve_math.apply_buy(tokens, INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_VIRTUAL_TOKEN_RESERVES)
+    session = [
+        (0.0, create_frame(0, 0, pumped)),
+        (0.5, create_frame(0, 1, flat)),
+        # Someone buys 10 SOL of the first launch, and a mint we never bought trades
+        (1.0, trade_frame(0, rng, pumped, virtual_sol, virtual_token)),
+        (2.0, trade_frame(0, rng)),
+    ]
+    path = tmp_path / "session.bin"
+    _record(path, session)
+
+    results = asyncio.run(replay(str(path), hold=5.0))
+    assert results["frames"] == len(session)
+    assert results["trades_observed"] == 1
+    assert results["positions"]["opened"] == results["positions"]["sold"] == 2
+    pnl = results["pnl"]
+    assert (pnl["trades"], pnl["failed_buys"], pnl["wins"]) == (2, 0, 1)
+    assert pnl["best_sol"] > 0 > pnl["worst_sol"]
@@ -0,0 +1,134 @@
+import asyncio
+
+import aiohttp
+import pytest
+from solana.rpc.core import RPCException
+
+from solana_bots.utils.rpc import MAX_BATCH, RpcTransport
+from solana_bots.utils.standins import JsonRpcStandIn
+
+
+class BatchRecorder(JsonRpcStandIn):
+    """Records the size of every POST: None for a single request, else the batch length."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.bodies = []
+
+    async def _handle(self, request):
+        body = await request.json()
+        self.bodies.append(len(body) if isinstance(body, list) else None)
+        return await super()._handle(request)
+
+
+def _run(scenario, max_batch=MAX_BATCH, method_limits=None, **options):
+    """Run ``scenario(transport, standin)`` against a fresh stand-in built with ``options``."""
+    async def run():
+        async with BatchRecorder(**options) as standin:
+            transport = RpcTransport(standin.url, method_limits=method_limits or {}, max_batch=max_batch)
+            try:
+                await scenario(transport, standin)
+            finally:
+                await transport.close()
+
+    asyncio.run(run())
+
+
+def _balance(i: int) -> list:
+    return [f"account{i}"]
+
+
+def test_reads_in_one_tick_share_a_batch():
+    async def scenario(transport, standin):
+        calls = [transport.call("getSlot"), transport.call("getHealth")]
+        calls += [transport.call("getBalance", _balance(i)) for i in range(3)]
+        responses = await asyncio.gather(*calls)
+        assert [response["result"] for response in responses[:2]] == [standin.slot, "ok"]
+        assert standin.bodies == [5]
+        assert len({response["id"] for response in responses}) == 5
+        # The batch POST was held until it finished
+        assert not transport._posts
+
+    _run(scenario)
+
+
+def test_batches_split_at_max_batch():
+    async def scenario(transport, standin):
+        await asyncio.gather(*(transport.call("getBalance", _balance(i)) for i in range(7)))
+        assert sorted(standin.bodies, key=lambda size: size or 1) == [None, 3, 3]
+
+    _run(scenario, max_batch=3)
+
+
+def test_identical_reads_in_flight_are_sent_once():
+    async def scenario(transport, standin):
+        first, second = await asyncio.gather(transport.call("getSlot"), transport.call("getSlot"))
+        assert first == second
+        assert standin.requests == {"getSlot": 1}
+        assert transport.deduplicated.value >= 1
+        # Once answered, the same read goes out again
+        await transport.call("getSlot")
+        assert standin.requests == {"getSlot": 2}
+
+    _run(scenario)
+
+
+def test_transactions_are_posted_alone_and_at_once():
+    async def scenario(transport, standin):
+        await asyncio.gather(
+            transport.call("getSlot"),
+            transport.call("sendTransaction", ["tx1"]),
+            transport.call("sendTransaction", ["tx1"]),
+            transport.call("getHealth"),
+        )
+        # Sends are never deduplicated or batched
+        assert sorted(standin.bodies, key=lambda size: size or 0) == [None, None, 2]
+        assert standin.requests["sendTransaction"] == 2
+
+    _run(scenario, handlers={"sendTransaction": lambda params: "signature"})
+
+
+def test_method_limits_cap_calls_in_flight():
+    async def scenario(transport, standin):
+        await asyncio.gather(*(transport.call("getBalance", _balance(i)) for i in range(5)))
+        assert standin.bodies == [2, 2, None]
+
+    _run(scenario, method_limits={"getBalance": 2}, latency=0.01)
+
+
+def test_a_failed_post_fails_every_call_in_it():
+    async def scenario(transport, standin):
+        results = await asyncio.gather(
+            *(transport.call("getBalance", _balance(i)) for i in range(3)), return_exceptions=True,
+        )
+        assert standin.bodies == [3]
+        assert all(isinstance(result, aiohttp.ClientResponseError) for result in results)
+        assert transport.errors.value >= 1
+
+    _run(scenario, http_error_rate=1.0)
+
+
+def test_rpc_errors_stay_with_their_call():
+    async def scenario(transport, standin):
+        ok, error = await asyncio.gather(transport.call("getSlot"), transport.call("getNothing"))
+        assert ok["result"] == standin.slot
+        assert error["error"]["code"] == -32601
+
+    _run(scenario)
+
+
+def test_request_keeps_the_callers_id():
+    async def scenario(transport, standin):
+        response = await transport.request('{"jsonrpc": "2.0", "id": 99, "method": "getHealth"}')
+        assert response == '{"jsonrpc": "2.0", "id": 99, "result": "ok"}'
+
+    _run(scenario)
+
+
+def test_responses_missing_from_a_batch_raise():
+    async def scenario(transport, standin):
+        standin._answer = lambda request: {"jsonrpc": "2.0", "id": -1, "result": None}
+        with pytest.raises(RPCException, match="no response for getSlot"):
+            await transport.call("getSlot")
+
+    _run(scenario)
@@ -0,0 +1,134 @@
+import os
+
+import pytest
+from solders.pubkey import Pubkey  # type: ignore
+
+from solana_bots.utils.events import CreateEvent, TradeEvent
+from solana_bots.utils.rules import (
+    ACCEPT, REJECT, BloomFilter, CreatorList, CreatorRate, DevBuy, NamePattern, Rule, RuleEngine,
+    build_rules, creator_set,
+)
+from solana_bots.utils.settings import Settings
+
+
+def _pubkey() -> Pubkey:
+    return Pubkey(os.urandom(32))
+
+
+def _launch(creator: Pubkey, name: str = "Frog", dev_buy: int = 10**9):
+    event = CreateEvent(name, name[:4].upper(), "", _pubkey(), _pubkey(), creator)
+    dev_trade = TradeEvent(event.mint, dev_buy, 10**12, True, creator, 0, 0, 0) if dev_buy else None
+    return event, dev_trade
+
+
+class Calls(Rule):
+    """Records the order it runs in and returns a fixed verdict."""
+
+    def __init__(self, name: str, cost: int, calls: list, verdict=None):
+        self.name = name
+        self.cost = cost
+        self.calls = calls
+        self.verdict = verdict
+
+    def __call__(self, event, dev_trade, now):
+        self.calls.append(self.name)
+        return self.verdict
+
+
+def test_rules_must_implement_a_check():
+    class Unfinished(Rule):
+        name = "unfinished"
+
+    with pytest.raises(TypeError):
+        Unfinished()
+
+
+def test_rules_run_cheapest_first_until_a_verdict():
+    calls = []
+    engine = RuleEngine([Calls("c", 3, calls), Calls("a", 1, calls), Calls("b", 2, calls, REJECT)], budget=1.0)
+    event, dev_trade = _launch(_pubkey())
+    assert engine.evaluate(event, dev_trade, now=1.0) == "b"
+    assert calls == ["a", "b"]
+
+    calls.clear()
+    engine = RuleEngine([Calls("b", 2, calls), Calls("a", 1, calls, ACCEPT)], budget=1.0)
+    assert engine.evaluate(event, dev_trade, now=1.0) is None
+    assert calls == ["a"]
+
+
+def test_a_spent_budget_accepts_the_launch():
+    calls = []
+    engine = RuleEngine([Calls("a", 1, calls), Calls("b", 2, calls, REJECT)], budget=-1.0)
+    before = engine.over_budget.value
+    event, dev_trade = _launch(_pubkey())
+    assert engine.evaluate(event, dev_trade, now=1.0) is None
+    assert calls == ["a"]
+    assert engine.over_budget.value == before + 1
+
+
+def test_creator_rate_counts_launches_other_rules_decided():
+    creator = _pubkey()
+    rate = CreatorRate(max_launches=2, window=60.0)
+    engine = RuleEngine([DevBuy(min_lamports=10**8), rate], budget=1.0)
+    # Two launches the dev buy rule rejects before the rate limit runs
+    for now in (1.0, 2.0):
+        assert engine.evaluate(*_launch(creator, dev_buy=0), now=now) == "dev_buy"
+    assert engine.evaluate(*_launch(creator), now=3.0) == "creator_rate"
+    # Older launches fall out of the window
+    assert engine.evaluate(*_launch(creator), now=62.5) is None
+
+
+def test_reading_the_rate_does_not_count_a_launch():
+    creator = _pubkey()
+    rate = CreatorRate(max_launches=1, window=60.0)
+    event, dev_trade = _launch(creator)
+    rate.record(event, 1.0)
+    assert rate(event, dev_trade, 1.0) is None
+    assert rate(event, dev_trade, 1.0) is None
+    rate.record(event, 2.0)
+    assert rate(event, dev_trade, 2.0) is REJECT
+
+
+def test_dev_buy_and_name_pattern():
+    creator = _pubkey()
+    dev_buy = DevBuy(min_lamports=10**8, max_lamports=10**10)
+    assert dev_buy(*_launch(creator, dev_buy=0), 0.0) is REJECT
+    assert dev_buy(*_launch(creator, dev_buy=10**9), 0.0) is None
+    assert dev_buy(*_launch(creator, dev_buy=10**11), 0.0) is REJECT
+    names = NamePattern(r"rug|scam")
+    assert names(*_launch(creator, name="Doge RUG"), 0.0) is REJECT
+    assert names(*_launch(creator, name="Frog"), 0.0) is None
+
+
+def test_creator_lists():
+    listed, other = _pubkey(), _pubkey()
+    whitelist = CreatorList({listed}, allow=True)
+    blacklist = CreatorList({listed})
+    assert whitelist(*_launch(listed), 0.0) is ACCEPT
+    assert blacklist(*_launch(listed), 0.0) is REJECT
+    assert whitelist(*_launch(other), 0.0) is None
+    assert blacklist(*_launch(other), 0.0) is None
+
+
+def test_bloom_filter_has_no_false_negatives():
+    keys = [_pubkey() for _ in range(2_000)]
+    bloom = BloomFilter(len(keys))
+    for key in keys:
+        bloom.add(key)
+    assert len(bloom) == len(keys)
+    assert all(key in bloom for key in keys)
+    assert sum(_pubkey() in bloom for _ in range(2_000)) < 10
+
+
+def test_creator_set_switches_to_a_bloom_filter():
+    creators = [str(_pubkey()) for _ in range(10)]
+    assert isinstance(creator_set(creators), set)
+    bloom = creator_set(creators, threshold=5)
+    assert isinstance(bloom, BloomFilter)
+    assert all(Pubkey.from_string(creator) in bloom for creator in creators)
+
+
+def test_build_rules():
+    assert build_rules(Settings()) is None
+    engine = build_rules(Settings(creator_blacklist=[str(_pubkey())], max_creator_launches=3, name_deny="rug"))
+    assert [rule.name for rule in engine.rules] == ["creator_blacklist", "creator_rate", "name_pattern"]
@@ -0,0 +1,181 @@
+import asyncio
+
+from solana_bots.utils.scheduler import PositionScheduler, PositionState
+
+
+class Panic(BaseException):
+    """Like pyo3's PanicException, which is not an Exception."""
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Orders:
+    """Scripted buy/sell callbacks: each call pops the next outcome, True by default."""
+
+    def __init__(self, buys=(), sells=()):
+        self.buys = list(buys)
+        self.sells = list(sells)
+        self.sold = []
+
+    @staticmethod
+    async def _next(outcomes):
+        outcome = outcomes.pop(0) if outcomes else True
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    async def buy(self, mint):
+        return await self._next(self.buys)
+
+    async def sell(self, mint, percentage):
+        self.sold.append((mint, percentage))
+        return await self._next(self.sells)
+
+
+def _run(orders: Orders, scenario, **options):
+    """Run ``scenario(scheduler, clock)`` against a scheduler without its timer
+    task and return the change in its counters."""
+    async def run():
+        clock = Clock()
+        closed = []
+
+        async def on_close(position):
+            closed.append(position.mint)
+
+        scheduler = PositionScheduler(orders.buy, orders.sell, on_close, hold=10.0, clock=clock, **options)
+        before = scheduler.stats()
+        runner = asyncio.ensure_future(scheduler.run(timers=False))
+        try:
+            await scenario(scheduler, clock)
+            await scheduler.settle()
+        finally:
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+        after = scheduler.stats()
+        delta = {key: after[key] - before[key] for key in after}
+        delta["closed_mints"] = closed
+        return delta
+
+    return asyncio.run(run())
+
+
+def test_position_goes_through_every_state():
+    orders = Orders()
+
+    async def scenario(scheduler, clock):
+        assert scheduler.open("a")
+        assert scheduler.positions["a"].state is PositionState.PENDING_BUY
+        await scheduler.settle()
+        position = scheduler.positions["a"]
+        assert position.state is PositionState.HELD
+        clock.now = 9.0
+        assert scheduler.expire(clock.now) == 0
+        clock.now = 10.0
+        assert scheduler.expire(clock.now) == 1
+        assert position.state is PositionState.EXITING
+
+    delta = _run(orders, scenario)
+    assert orders.sold == [("a", 100)]
+    assert (delta["opened"], delta["sold"], delta["closed"]) == (1, 1, 1)
+    assert delta["closed_mints"] == ["a"]
+
+
+def test_duplicate_and_over_capacity_opens_are_rejected():
+    async def scenario(scheduler, clock):
+        assert scheduler.open("a")
+        assert not scheduler.open("a")
+        assert not scheduler.open("b")
+
+    delta = _run(Orders(), scenario, max_open=1)
+    assert delta["rejected"] == 2
+
+
+def test_failed_and_stale_buys_close_the_position():
+    async def scenario(scheduler, clock):
+        scheduler.open("a")
+        await scheduler.settle()
+        scheduler.open("b")
+        clock.now = 5.0
+        await scheduler.settle()
+        assert not scheduler.positions
+
+    delta = _run(Orders(buys=[False]), scenario, buy_timeout=2.0)
+    assert (delta["failed_buys"], delta["stale_buys"], delta["opened"]) == (1, 1, 0)
+    assert delta["closed_mints"] == ["a", "b"]
+
+
+def test_buy_worker_survives_a_panic():
+    async def scenario(scheduler, clock):
+        scheduler.open("a")
+        await scheduler.settle()
+        assert "a" not in scheduler.positions
+        # Same single worker, next order
+        scheduler.open("b")
+        await scheduler.settle()
+        assert scheduler.positions["b"].state is PositionState.HELD
+
+    delta = _run(Orders(buys=[Panic("parse failed")]), scenario, buy_concurrency=1)
+    assert (delta["failed_buys"], delta["opened"]) == (1, 1)
+
+
+def test_sell_worker_retries_after_a_panic():
+    orders = Orders(sells=[Panic("parse failed")])
+
+    async def scenario(scheduler, clock):
+        scheduler.open("a")
+        await scheduler.settle()
+        clock.now = 10.0
+        scheduler.expire(clock.now)
+        await scheduler.settle()
+        position = scheduler.positions["a"]
+        assert position.state is PositionState.EXITING and not position.selling
+        # Retried after the backoff
+        clock.now = 12.0
+        assert scheduler.expire(clock.now) == 1
+
+    delta = _run(orders, scenario, sell_concurrency=1)
+    assert orders.sold == [("a", 100), ("a", 100)]
+    assert (delta["sell_retries"], delta["sold"], delta["closed"]) == (1, 1, 1)
+
+
+def test_sells_are_abandoned_after_the_last_attempt():
+    orders = Orders(sells=[False, False])
+
+    async def scenario(scheduler, clock):
+        scheduler.open("a")
+        await scheduler.settle()
+        for clock.now in (10.0, 12.0):
+            scheduler.expire(clock.now)
+            await scheduler.settle()
+
+    delta = _run(orders, scenario, sell_attempts=2)
+    assert (delta["sell_retries"], delta["abandoned"], delta["sold"]) == (1, 1, 0)
+    assert delta["closed_mints"] == ["a"]
+
+
+def test_early_exits():
+    orders = Orders()
+
+    async def scenario(scheduler, clock):
+        scheduler.open("a")
+        await scheduler.settle()
+        assert scheduler.exit("a", 50)
+        assert not scheduler.exit("a", 50)  # a sell is already queued
+        await scheduler.settle()
+        position = scheduler.positions["a"]
+        assert position.state is PositionState.HELD and not position.selling
+        assert scheduler.exit("a")
+        assert position.state is PositionState.EXITING
+        await scheduler.settle()
+        assert not scheduler.positions
+        assert not scheduler.exit("missing")
+
+    delta = _run(orders, scenario)
+    assert orders.sold == [("a", 50), ("a", 100)]
+    assert (delta["early_exits"], delta["partial_sells"], delta["sold"]) == (2, 1, 1)
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from solders.keypair import Keypair  # type: ignore
+
+from solana_bots.utils import config, settings as settings_module
+from solana_bots.utils.settings import Settings, configure, get_settings
+
+
+def test_values_are_parsed_by_field_type():
+    settings = Settings.from_mapping({
+        "RPC_HTTPS_URL": "http://rpc.invalid",
+        "METRICS_PORT": "9100",
+        "MAX_HOLD": 45,
+        "SEND_RPC_URLS": " http://a.invalid, ,http://b.invalid ",
+        "CREATOR_WHITELIST": ["x", " ", "y"],
+        "STOP_LOSS": "",
+        "NOT_A_SETTING": "ignored",
+    })
+    assert settings.rpc_url == "http://rpc.invalid"
+    assert (settings.metrics_port, settings.max_hold) == (9100, 45)
+    assert settings.send_rpc_urls == ["http://a.invalid", "http://b.invalid"]
+    assert settings.creator_whitelist == ["x", "y"]
+    # Empty values keep the default
+    assert settings.stop_loss is None
+    assert settings.log_level == "info"
+
+
+def test_invalid_values_name_the_variable():
+    with pytest.raises(ValueError, match="Invalid MAX_HOLD"):
+        Settings.from_mapping({"MAX_HOLD": "soon"})
+
+
+def test_later_sources_win(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"LOG_LEVEL": "debug", "MAX_HOLD": 10, "WALLET_POLICY": "round_robin"}))
+    env_file = tmp_path / ".env"
+    env_file.write_text("MAX_HOLD=20\nMETRICS_PORT=9000\n")
+    settings = Settings.load(
+        environ={"SETTINGS_FILE": str(path), "METRICS_PORT": "9100"}, env_file=str(env_file),
+    )
+    assert settings.log_level == "debug"
+    assert settings.wallet_policy == "round_robin"
+    assert settings.max_hold == 20
+    assert settings.metrics_port == 9100
+    assert Settings.load(environ={}, env_file=str(tmp_path / "missing.env")) == Settings()
+
+
+def test_keypairs_are_parsed_on_first_use():
+    payer, extra = Keypair(), Keypair()
+    with pytest.raises(ValueError, match="KEY_PAIR must be set"):
+        Settings().payer_keypairs
+    settings = Settings(key_pair=str(payer), extra_key_pairs=[str(extra)])
+    assert str(payer) not in repr(settings) and str(extra) not in repr(settings)
+    assert [keypair.pubkey() for keypair in settings.payer_keypairs] == [payer.pubkey(), extra.pubkey()]
+
+
+def test_exits_enabled():
+    assert not Settings().exits_enabled
+    assert Settings(stop_loss=0).exits_enabled
+    assert Settings(take_profit=["100:50"]).exits_enabled
+
+
+def test_config_reads_settings_lazily(monkeypatch):
+    monkeypatch.setattr(settings_module, "_settings", None)
+    monkeypatch.setattr(Settings, "load", classmethod(lambda cls: cls(rpc_url="http://loaded.invalid")))
+    assert config.UNIT_BUDGET == 100_000
+    assert settings_module._settings is None
+    assert config.RPC == "http://loaded.invalid"
+    assert get_settings() is settings_module._settings
+    configure(Settings(rpc_url="http://configured.invalid", trader_processes=2))
+    assert (config.RPC, config.TRADER_PROCESSES) == ("http://configured.invalid", 2)
+    with pytest.raises(AttributeError):
+        config.NOT_A_SETTING
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from solana_bots.utils.streamer import start_tasks, supervise
+
+
+class Panic(BaseException):
+    """Like pyo3's PanicException, which is not an Exception."""
+
+
+async def _forever():
+    await asyncio.Event().wait()
+
+
+async def _dies():
+    await asyncio.sleep(0)
+    raise Panic("parse failed")
+
+
+async def _returns():
+    await asyncio.sleep(0)
+    return 1
+
+
+def test_supervise_reraises_a_dead_task():
+    async def run():
+        tasks = start_tasks([_forever(), _dies()])
+        try:
+            with pytest.raises(Panic):
+                await supervise(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        assert tasks[1].get_name() == "_dies"
+
+    asyncio.run(run())
+
+
+def test_supervise_returns_the_first_task_to_finish():
+    async def run():
+        tasks = start_tasks([_forever(), _returns()])
+        try:
+            assert await supervise(tasks) is tasks[1]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    asyncio.run(run())
@@ -0,0 +1,156 @@
+import asyncio
+import base64
+
+import pytest
+from solana.rpc.core import RPCException
+from solders.hash import Hash  # type: ignore
+from solders.keypair import Keypair  # type: ignore
+from solders.message import MessageV0  # type: ignore
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction  # type: ignore
+
+from solana_bots.utils.confirmation import ConfirmationEngine
+from solana_bots.utils.rpc import close_transports, shared_client
+from solana_bots.utils.standins import JsonRpcStandIn
+from solana_bots.utils.submitter import Submitter
+from solana_bots.utils.subscriptions import SubscriptionClient
+
+
+class Txn:
+    signatures = ["sig"]
+
+    def __bytes__(self):
+        return b"txn"
+
+
+class SlowConfirmations:
+    """Resolves ``late`` seconds after the submit deadline, like a
+    confirmation wait that started a little after the submission."""
+
+    def __init__(self, late: float):
+        self.late = late
+
+    async def wait(self, signature, operation, timeout, trace=None):
+        await asyncio.sleep(timeout + self.late)
+        return None
+
+    def discard(self, signature):
+        pass
+
+
+def test_no_rebroadcasts_after_the_deadline():
+    async def run():
+        submitter = Submitter(["http://127.0.0.1:1"], SlowConfirmations(late=0.2), interval=0.05)
+        rounds = []
+
+        async def send(endpoint, submission, params, trace, timed):
+            if submission.first is None:
+                submission.first = endpoint
+
+        def broadcast(*args):
+            rounds.append(asyncio.get_running_loop().time())
+            return Submitter._broadcast(submitter, *args)
+
+        submitter._send = send
+        submitter._broadcast = broadcast
+        signature, confirmed = await submitter.submit(Txn(), timeout=0.2)
+        assert (signature, confirmed) == ("sig", None)
+        # One round per interval until the deadline, none while waiting out the confirmation
+        assert len(rounds) <= 0.2 / 0.05 + 1
+        assert rounds[-1] - rounds[0] < 0.2 + 0.05
+
+    asyncio.run(run())
+
+
+def _transaction(lamports: int = 1) -> VersionedTransaction:
+    payer = Keypair()
+    ix = transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=Keypair().pubkey(), lamports=lamports))
+    return VersionedTransaction(MessageV0.try_compile(payer.pubkey(), [ix], [], Hash.default()), [payer])
+
+
+def _race(scenario, profiles, lands: bool = True):
+    """Run ``scenario(submitter, standins, landed)`` with one send stand-in
+    per ``(latency, rejects)`` profile. With ``lands``, a signature any
+    endpoint accepted reads as confirmed on the status stand-in."""
+    async def run():
+        landed = set()
+
+        def sender(rejects):
+            def send(params):
+                if rejects:
+                    raise RuntimeError("Node is behind")
+                signature = str(VersionedTransaction.from_bytes(base64.b64decode(params[0])).signatures[0])
+                landed.add(signature)
+                return signature
+            return send
+
+        def status(signature):
+            if not lands or signature not in landed:
+                return None
+            return {"slot": 5, "confirmations": None, "err": None, "status": {"Ok": None}, "confirmationStatus": "confirmed"}
+
+        standins = [
+            await JsonRpcStandIn({"sendTransaction": sender(rejects)}, latency=latency).start()
+            for latency, rejects in profiles
+        ]
+        statuses = await JsonRpcStandIn({
+            "getSignatureStatuses": lambda params: statuses.context([status(s) for s in params[0]]),
+        }).start()
+        confirmations = ConfirmationEngine(
+            shared_client(statuses.url), SubscriptionClient(), poll_after=0.0, poll_interval=0.02
+        )
+        poller = asyncio.ensure_future(confirmations.run())
+        submitter = Submitter([standin.url for standin in standins], confirmations, interval=0.05)
+        try:
+            await scenario(submitter, standins, landed)
+        finally:
+            poller.cancel()
+            await close_transports()
+            for standin in standins + [statuses]:
+                await standin.close()
+
+    asyncio.run(run())
+
+
+def test_the_first_endpoint_to_accept_is_credited():
+    async def scenario(submitter, standins, landed):
+        fast, slow, failing = submitter.endpoints
+        before = {endpoint.url: endpoint.summary() for endpoint in submitter.endpoints}
+        txn = _transaction()
+        signature, confirmed = await submitter.submit(txn, timeout=2.0)
+        assert (signature, confirmed) == (txn.signatures[0], True)
+        assert submitter.confirmations.slot(signature) == 5
+
+        def delta(endpoint, key):
+            return endpoint.summary()[key] - before[endpoint.url][key]
+
+        assert (delta(fast, "first_accepted"), delta(fast, "landed_first")) == (1, 1)
+        assert delta(slow, "landed_first") == delta(failing, "landed_first") == 0
+        assert delta(failing, "errors") >= 1
+        assert submitter.ranking()[0] is fast
+
+    _race(scenario, [(0.0, False), (0.15, False), (0.0, True)])
+
+
+def test_raises_when_every_endpoint_rejects_the_first_round():
+    async def scenario(submitter, standins, landed):
+        with pytest.raises(RPCException, match="Node is behind"):
+            await submitter.submit(_transaction(), timeout=2.0)
+        assert not landed
+        assert not len(submitter.confirmations)
+        assert all(standin.requests == {"sendTransaction": 1} for standin in standins)
+
+    _race(scenario, [(0.0, True), (0.02, True)])
+
+
+def test_rebroadcasts_until_the_timeout():
+    async def scenario(submitter, standins, landed):
+        expired = submitter.expired.value
+        _, confirmed = await submitter.submit(_transaction(), timeout=0.3)
+        assert confirmed is None
+        assert submitter.expired.value == expired + 1
+        sends = standins[0].requests["sendTransaction"]
+        assert 3 <= sends <= 0.3 / 0.05 + 1
+
+    # Accepted but never confirmed
+    _race(scenario, [(0.0, False)], lands=False)
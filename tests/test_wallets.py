@@ -0,0 +1,96 @@
+import asyncio
+import os
+import struct
+from types import SimpleNamespace
+
+from solders.keypair import Keypair  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+
+from solana_bots.utils.accounts import AccountRegistry
+from solana_bots.utils.wallets import WalletPool
+
+
+class Client:
+    """getMultipleAccounts over in-memory SOL and token balances."""
+
+    def __init__(self, slot: int = 100):
+        self.slot = slot
+        self.tokens = {}
+
+    async def get_multiple_accounts(self, keys, commitment=None, encoding=None):
+        accounts = []
+        for key in keys:
+            if key in self.tokens:
+                data = bytes(64) + struct.pack("<Q", self.tokens[key]) + bytes(97)
+                accounts.append(SimpleNamespace(data=data, lamports=2_039_280))
+            else:
+                accounts.append(SimpleNamespace(data=b"", lamports=10**10))
+        return SimpleNamespace(context=SimpleNamespace(slot=self.slot), value=accounts)
+
+
+def _pool(wallets: int = 2):
+    client = Client()
+    return client, WalletPool(client, [Keypair() for _ in range(wallets)], AccountRegistry())
+
+
+def _buy(pool: WalletPool, lamports: int = 10**8, tokens: int = 10**12, slot: int = 50):
+    mint = str(Pubkey(os.urandom(32)))
+    wallet = pool.assign(mint, lamports)
+    wallet.positions.apply_buy(mint, tokens, lamports, slot=slot)
+    pool.settle(mint, lamports, lamports)
+    return mint, wallet
+
+
+def test_positions_spread_over_wallets():
+    _, pool = _pool()
+    owners = {_buy(pool)[1].pubkey for _ in range(4)}
+    assert len(owners) == 2
+
+
+def test_failed_buy_releases_the_wallet():
+    _, pool = _pool()
+    mint = str(Pubkey(os.urandom(32)))
+    wallet = pool.assign(mint, 10**8)
+    pool.settle(mint, 10**8, None)
+    assert pool.wallet_for(mint) is None
+    assert wallet.load == 0 and wallet.reserved == 0
+
+
+def test_sold_position_is_released():
+    _, pool = _pool()
+    mint, wallet = _buy(pool)
+    wallet.positions.close(mint)
+    pool.release(mint)
+    assert pool.wallet_for(mint) is None
+    assert wallet.load == 0 and not pool.stranded
+
+
+def test_position_with_tokens_left_is_stranded_not_dropped():
+    client, pool = _pool()
+    mint, wallet = _buy(pool)
+    pool.release(mint)
+    # Still sellable by its wallet, and reported
+    assert pool.wallet_for(mint) is wallet
+    assert wallet.load == 1
+    assert pool.stats()["stranded"] == {mint: str(wallet.pubkey)[:8]}
+
+    # A refresh that still sees the tokens keeps it
+    ata = wallet.positions.positions[mint].ata
+    client.tokens[ata] = 10**12
+    asyncio.run(pool.refresh())
+    assert mint in pool.stranded
+
+    # Once the tokens are gone it is released
+    client.tokens[ata] = 0
+    client.slot += 1
+    asyncio.run(pool.refresh())
+    assert not pool.stranded and pool.wallet_for(mint) is None
+    assert mint not in wallet.positions
+
+
+def test_refresh_from_a_lagging_node_keeps_the_fill():
+    client, pool = _pool(1)
+    mint, wallet = _buy(pool, slot=150)
+    client.tokens[wallet.positions.positions[mint].ata] = 0
+    asyncio.run(pool.refresh())
+    assert wallet.positions.balance(mint) == 10**12